@@ -0,0 +1,47 @@
+"""
+    Cost of interceptor chains on raw_call: none (fast path), then 1, 3 and 10 pass-through interceptors
+
+    Calls are answered by ReplayTransport (no network), so only Node own work is timed.
+
+    python -m benchmarks.bench_interceptors [calls]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from boli_orbital_api import Node, RecordingTransport, ReplayTransport
+from boli_orbital_api.interceptors import Interceptor
+from benchmarks.fake_node import FakeNodeProcess
+
+
+def bench(node: Node, calls: int) -> float:
+    """Seconds per getblockcount"""
+    for _ in range(100):
+        node.getblockcount()
+    start = time.perf_counter()
+    for _ in range(calls):
+        node.getblockcount()
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls: int = 50000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'bench.rec')
+        with FakeNodeProcess() as fake:
+            with Node(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port) as node:
+                node.transport = RecordingTransport(node.transport, path)
+                node.getblockcount()
+
+        results = {}
+        for size in (0, 1, 3, 10):
+            with Node(transport=ReplayTransport(path), interceptors=[Interceptor() for _ in range(size)]) as node:
+                results[f'{size} interceptors'] = bench(node, calls)
+
+    baseline = results['0 interceptors']
+    for name, seconds in results.items():
+        print(f"{name:<16}: {seconds * 1e6:8.2f} us/call  {(seconds - baseline) * 1e6:+7.2f} us")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
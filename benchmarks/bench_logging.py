@@ -0,0 +1,79 @@
+"""
+    Logging overhead of raw_call at each level, synchronous handler against queue logging and sampling
+
+    Calls are answered by ReplayTransport (no network), records are written to os.devnull.
+    "sendrawtransaction 20 KB" carries a 20 KB hex param, the cost an eager f-string used to pay on every call.
+
+    python -m benchmarks.bench_logging [calls]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from boli_orbital_api import Node, RecordingTransport, ReplayTransport
+from boli_orbital_api.logger import start_queue_logging, stop_queue_logging
+from benchmarks.fake_node import FakeNodeProcess
+
+_SIGNED_HEX = '0100000001' + 'ab' * 10240
+
+
+def bench(call, calls: int) -> float:
+    """Seconds per call"""
+    for _ in range(100):
+        call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls
+
+
+def main(calls: int = 20000):
+    package = logging.getLogger('boli_orbital_api')
+    devnull = open(os.devnull, 'w')
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(funcName)s - %(message)s"))
+    saved = package.handlers, package.propagate, package.level
+    package.handlers, package.propagate = [handler], False
+
+    setups = {
+        'WARNING': (logging.WARNING, None),
+        'DEBUG sync handler': (logging.DEBUG, None),
+        'DEBUG queue': (logging.DEBUG, 1.0),
+        'DEBUG queue 1% sample': (logging.DEBUG, 0.01),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'bench.rec')
+        with FakeNodeProcess() as fake:
+            with Node(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port) as node:
+                node.transport = RecordingTransport(node.transport, path)
+                node.getblockcount()
+
+        with Node(transport=ReplayTransport(path)) as node:
+            cases = {
+                'getblockcount': node.getblockcount,
+                'sendrawtransaction 20 KB': lambda: node.raw_call('sendrawtransaction', [_SIGNED_HEX]),
+            }
+            print(f"{'level':<24}" + ''.join(f"{name:>28}" for name in cases))
+
+            eager = bench(lambda: f"raw_call: method:sendrawtransaction params:{[_SIGNED_HEX]}", calls)
+            print(f"{'eager f-string only':<24}{'':>28}{eager * 1e6:>22.2f} us/op")
+
+            for name, (level, sample_rate) in setups.items():
+                package.setLevel(level)
+                if sample_rate is not None:
+                    start_queue_logging(sample_rate=sample_rate, max_queue=calls * 2)
+                row = [bench(call, calls) for call in cases.values()]
+                stop_queue_logging()
+                print(f"{name:<24}" + ''.join(f"{seconds * 1e6:>22.2f} us/op" for seconds in row))
+
+    package.handlers, package.propagate = saved[0], saved[1]
+    package.setLevel(saved[2])
+    devnull.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
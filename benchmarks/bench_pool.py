@@ -0,0 +1,51 @@
+"""
+    Calls/sec with a new connection per call (module level requests.post, old behaviour)
+    against the pooled keep-alive session owned by Node.
+
+    python -m benchmarks.bench_pool [calls]
+"""
+import sys
+import time
+
+import requests
+from orjson import dumps
+
+from boli_orbital_api import Node
+from benchmarks.fake_node import FakeNode
+
+
+def bench_post_per_call(url: str, calls: int) -> float:
+    data = {"jsonrpc": "2.0", "id": "Orbital_bench", "method": "getblockcount", "params": []}
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.post(
+            url=url,
+            headers={'content-type': 'text/plain;'},
+            data=dumps(data),
+            auth=('user', 'password')
+        ).json()
+    return calls / (time.perf_counter() - start)
+
+
+def bench_pooled_node(node: Node, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        node.getblockcount()
+    return calls / (time.perf_counter() - start)
+
+
+def main(calls: int = 2000):
+    with FakeNode() as fake:
+        url = f'http://{fake.host}:{fake.port}/'
+        before = bench_post_per_call(url, calls)
+
+        with Node(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port) as node:
+            after = bench_pooled_node(node, calls)
+
+    print(f"requests.post per call : {before:10.1f} calls/sec")
+    print(f"Node pooled session    : {after:10.1f} calls/sec")
+    print(f"speedup                : {after / before:10.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
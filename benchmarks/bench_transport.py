@@ -0,0 +1,68 @@
+"""
+    Per-call overhead of transports: RequestsTransport against SocketTransport, plus pipelining
+
+    Fake node runs in a child process, so client time is not shared with server threads.
+    ReplayTransport (no network at all) gives the floor of Node own costs.
+
+    python -m benchmarks.bench_transport [calls]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from orjson import dumps
+
+from boli_orbital_api import Node, RecordingTransport, ReplayTransport, SocketTransport
+from benchmarks.fake_node import FakeNodeProcess
+
+
+def bench_node(node: Node, calls: int) -> float:
+    """Seconds per getblockcount"""
+    for _ in range(50):
+        node.getblockcount()
+    start = time.perf_counter()
+    for _ in range(calls):
+        node.getblockcount()
+    return (time.perf_counter() - start) / calls
+
+
+def bench_pipelined(transport: SocketTransport, calls: int, depth: int = 50) -> float:
+    """Seconds per getblockcount, depth requests written at once"""
+    bodies = [
+        dumps({"jsonrpc": "2.0", "id": n, "method": "getblockcount", "params": []})
+        for n in range(depth)
+    ]
+    start = time.perf_counter()
+    for _ in range(calls // depth):
+        transport.request_many(bodies)
+    return (time.perf_counter() - start) / (calls // depth * depth)
+
+
+def main(calls: int = 5000):
+    results = {}
+    with FakeNodeProcess() as fake:
+        options = dict(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port)
+
+        with Node(**options, transport='requests') as node:
+            results['requests'] = bench_node(node, calls)
+
+        with Node(**options, transport='socket') as node:
+            results['socket'] = bench_node(node, calls)
+            results['socket pipelined x50'] = bench_pipelined(node.transport, calls)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'bench.rec')
+            with Node(**options, transport='socket') as node:
+                node.transport = RecordingTransport(node.transport, path)
+                node.getblockcount()
+            with Node(transport=ReplayTransport(path)) as node:
+                results['replay (no network)'] = bench_node(node, calls)
+
+    baseline = results['requests']
+    for name, seconds in results.items():
+        print(f"{name:<22}: {1 / seconds:10.1f} calls/sec {seconds * 1e6:8.1f} us/call  {baseline / seconds:5.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,423 @@
+"""
+    Local bolivarcoind stand-in used by benchmarks
+
+    Speaks JSON-RPC over HTTP/1.1 with keep-alive, like bolivarcoind does,
+    so client side costs (handshakes, pooling, parsing) can be measured
+    without a real node.
+
+    Answers are deterministic and shaped like bolivarcoind ones (getblock, getrawtransaction,
+    masternodelist, gobject list, listtransactions, listsinceblock, raw transaction calls...), sizes are configurable:
+
+        with FakeNode(latency=0.002, block_txs=500, masternodes=3000) as fake:
+            node = Node(server_ip=fake.host, rpc_port=fake.port)
+
+        with FakeNodeProcess(block_txs=500) as fake:  # Server in a child process
+            ...
+"""
+import hashlib
+import multiprocessing
+from functools import lru_cache
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from orjson import dumps, loads
+
+__all__ = ['FakeNode', 'FakeNodeProcess', 'bolivarcoind_results', 'fake_hash', 'TIP_HEIGHT']
+
+TIP_HEIGHT = 1050203
+
+DEFAULT_RESULTS: dict[str, Any] = {
+    'getblockcount': TIP_HEIGHT,
+    'getblockhash': '0000000000006b05f874022e3992423b538d23b2314c33ff388b0a04f575843e',
+    'getdifficulty': 36237.78062774216,
+}
+
+
+def fake_hash(*parts) -> str:
+    """Deterministic hash of parts: block and transaction hashes of answers, ("block", height)..."""
+    return hashlib.sha256(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def _address(n: int) -> str:
+    return 'b' + fake_hash('address', n)[:33]
+
+
+def _raw_tx(txid: str, height: int) -> dict:
+    """Verbose transaction, 1 input and 2 outputs"""
+    return {
+        "hex": '0100000001' + txid * 6,
+        "txid": txid,
+        "size": 226,
+        "version": 1,
+        "locktime": 0,
+        "vin": [{
+            "txid": fake_hash('prevout', txid),
+            "vout": 1,
+            "scriptSig": {"asm": txid + ' ' + txid, "hex": txid * 3},
+            "sequence": 4294967295,
+        }],
+        "vout": [
+            {
+                "value": 12.5 + n,
+                "valueSat": 1250000000 + n,
+                "n": n,
+                "scriptPubKey": {
+                    "asm": f"OP_DUP OP_HASH160 {txid[:40]} OP_EQUALVERIFY OP_CHECKSIG",
+                    "hex": f"76a914{txid[:40]}88ac",
+                    "reqSigs": 1,
+                    "type": "pubkeyhash",
+                    "addresses": [_address(height * 2 + n)],
+                },
+            }
+            for n in range(2)
+        ],
+        "blockhash": fake_hash('block', height),
+        "height": height,
+        "confirmations": TIP_HEIGHT - height + 1,
+        "time": 1500000000 + height * 120,
+        "blocktime": 1500000000 + height * 120,
+    }
+
+
+def bolivarcoind_results(
+        block_txs: int = 100,
+        masternodes: int = 1000,
+        wallet_txs: int = 1000,
+        gobjects: int = 50,
+) -> dict[str, Any | Callable]:
+    """ Results of common bolivarcoind methods, method -> result or callable(params)
+
+        block_txs: transactions per block (getblock size)
+        masternodes: entries of masternodelist
+        wallet_txs: max entries of listtransactions
+        gobjects: entries of gobject list
+
+        Big answers are memoized, so server time does not hide client costs
+    """
+    heights = {fake_hash('block', height): height for height in range(TIP_HEIGHT - 2000, TIP_HEIGHT + 1)}
+
+    def getblockhash(params):
+        return fake_hash('block', params[0] if params else 0)
+
+    def getblock(params):
+        return _getblock(params[0] if params else '', len(params) < 2 or bool(params[1]))
+
+    @lru_cache(maxsize=256)
+    def _getblock(blockhash: str, verbose: bool):
+        height = heights.get(blockhash, TIP_HEIGHT)
+        txids = [fake_hash('tx', height, n) for n in range(block_txs)]
+        if not verbose:
+            return ''.join(txids) * 8  # Serialized block, about 512 bytes per transaction
+        return {
+            "hash": fake_hash('block', height),
+            "confirmations": TIP_HEIGHT - height + 1,
+            "size": 250 * block_txs,
+            "height": height,
+            "version": 536870912,
+            "merkleroot": fake_hash('merkle', height),
+            "tx": txids,
+            "time": 1500000000 + height * 120,
+            "mediantime": 1500000000 + height * 120 - 600,
+            "nonce": height,
+            "bits": "1b0404cb",
+            "difficulty": 36237.78062774216,
+            "chainwork": "0000000000000000000000000000000000000000000000001d8c1e5a1bd2e6f1",
+            "previousblockhash": fake_hash('block', height - 1),
+            "nextblockhash": fake_hash('block', height + 1),
+        }
+
+    def getrawtransaction(params):
+        if len(params) > 1 and params[1]:
+            return _raw_tx(params[0], TIP_HEIGHT - 100)
+        return _raw_tx(params[0], TIP_HEIGHT - 100)['hex']
+
+    def getblockheader(params):
+        header = dict(_getblock(params[0] if params else '', True))
+        del header["tx"], header["size"]
+        return header
+
+    def _wallet_tx(n: int) -> dict:
+        """Wallet transaction n, mined n blocks below tip"""
+        return {
+            "account": "",
+            "address": _address(n),
+            "category": "receive" if n % 3 else "send",
+            "amount": 1.5 + n % 7,
+            "vout": n % 2,
+            "confirmations": n + 1,
+            "instantlock": False,
+            "blockhash": fake_hash('block', TIP_HEIGHT - n),
+            "blockindex": n % block_txs,
+            "blocktime": 1500000000 + (TIP_HEIGHT - n) * 120,
+            "txid": fake_hash('wallet', n),
+            "walletconflicts": [],
+            "time": 1500000000 + (TIP_HEIGHT - n) * 120,
+            "timereceived": 1500000000 + (TIP_HEIGHT - n) * 120,
+            "bip125-replaceable": "no",
+        }
+
+    def listtransactions(params):
+        count = params[1] if len(params) > 1 else 10
+        skip = params[2] if len(params) > 2 else 0
+        return [_wallet_tx(n) for n in reversed(range(skip, min(skip + count, wallet_txs)))]
+
+    def listsinceblock(params):
+        since = heights.get(params[0], -1) if params and params[0] else -1
+        target = params[1] if len(params) > 1 else 1
+        return {
+            "transactions": [_wallet_tx(n) for n in reversed(range(min(TIP_HEIGHT - since, wallet_txs)))],
+            "lastblock": fake_hash('block', TIP_HEIGHT + 1 - target),
+        }
+
+    def masternodelist(params):
+        return _masternodelist(params[0] if params else 'status')
+
+    @lru_cache(maxsize=16)
+    def _masternodelist(mode: str):
+        entries = {}
+        for n in range(masternodes):
+            outpoint = f"{fake_hash('mn', n)}-{n % 2}"
+            if mode == 'full':
+                entries[outpoint] = (
+                    f"           ENABLED 70208 {_address(n)} {1600000000 + n} {86400 + n} "
+                    f"{1600000000 + n} {TIP_HEIGHT - n % 500} 10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256}:3563"
+                )
+            else:
+                entries[outpoint] = 'ENABLED'
+        return entries
+
+    def masternode(params):
+        command = params[0] if params else ''
+        if command == 'count':
+            return {"total": masternodes, "ps_compatible": masternodes, "enabled": masternodes, "qualify": masternodes}
+        if command == 'status':
+            return {"outpoint": f"{fake_hash('mn', 0)}-0", "service": "10.0.0.0:3563", "status": "Masternode successfully started"}
+        if command == 'winner':
+            return {"height": TIP_HEIGHT + 1, "IP:port": "10.0.0.1:3563", "payee": _address(1)}
+        return {}
+
+    def gobject(params):
+        command = params[0] if params else ''
+        if command == 'count':
+            return {"objects_total": gobjects, "proposals": gobjects, "triggers": 0, "other": 0}
+        if command != 'list':
+            return {}
+        return _gobject_list()
+
+    @lru_cache(maxsize=1)
+    def _gobject_list():
+        return {
+            fake_hash('gobject', n): {
+                "DataHex": fake_hash('data', n) * 4,
+                "DataString": (
+                    f'[["proposal",{{"end_epoch":{1700000000 + n},"name":"proposal-{n}",'
+                    f'"payment_address":"{_address(n)}","payment_amount":{1000 + n},'
+                    f'"start_epoch":{1690000000 + n},"type":1,"url":"https://bolis.info/p/{n}"}}]]'
+                ),
+                "Hash": fake_hash('gobject', n),
+                "CollateralHash": fake_hash('collateral', n),
+                "ObjectType": 1,
+                "CreationTime": 1690000000 + n,
+                "AbsoluteYesCount": n % 50,
+                "YesCount": n % 60,
+                "NoCount": n % 10,
+                "AbstainCount": 0,
+                "fBlockchainValidity": True,
+                "IsValidReason": "",
+                "fCachedValid": True,
+                "fCachedFunding": n % 2 == 0,
+                "fCachedDelete": False,
+                "fCachedEndorsed": False,
+            }
+            for n in range(gobjects)
+        }
+
+    def fundrawtransaction(params):
+        return {"hex": params[0] + fake_hash('change', params[0])[:64], "changepos": 1, "fee": 0.0000226}
+
+    def decoderawtransaction(params):
+        return _raw_tx(fake_hash('decoded', params[0]), TIP_HEIGHT)
+
+    return {
+        **DEFAULT_RESULTS,
+        'getbestblockhash': fake_hash('block', TIP_HEIGHT),
+        'getblockhash': getblockhash,
+        'getblock': getblock,
+        'getblockheader': getblockheader,
+        'getrawtransaction': getrawtransaction,
+        'gettransaction': lambda params: {**_raw_tx(params[0], TIP_HEIGHT - 100), "amount": 1.5, "fee": -0.0000226},
+        'listtransactions': listtransactions,
+        'listsinceblock': listsinceblock,
+        'masternodelist': masternodelist,
+        'masternode': masternode,
+        'gobject': gobject,
+        'getinfo': {
+            "version": 2000002, "protocolversion": 70208, "walletversion": 61000, "balance": 1523.25,
+            "privatesend_balance": 0.0, "blocks": TIP_HEIGHT, "timeoffset": 0, "connections": 8, "proxy": "",
+            "difficulty": 36237.78062774216, "testnet": False, "keypoololdest": 1500000000, "keypoolsize": 1000,
+            "paytxfee": 0.0, "relayfee": 0.00001, "errors": "",
+        },
+        'getblockchaininfo': {
+            "chain": "main", "blocks": TIP_HEIGHT, "headers": TIP_HEIGHT,
+            "bestblockhash": fake_hash('block', TIP_HEIGHT), "difficulty": 36237.78062774216,
+            "mediantime": 1500000000 + TIP_HEIGHT * 120, "verificationprogress": 0.9999,
+            "chainwork": "0000000000000000000000000000000000000000000000001d8c1e5a1bd2e6f1", "pruned": False,
+        },
+        'getnetworkinfo': {"version": 2000002, "subversion": "/Bolivarcoin Core:2.0.0.2/", "connections": 8},
+        'getgovernanceinfo': {"governanceminquorum": 10, "proposalfee": 5.0, "superblockcycle": 16616},
+        'getbalance': 1523.25,
+        'getwalletinfo': {"walletversion": 61000, "balance": 1523.25, "txcount": wallet_txs},
+        'validateaddress': lambda params: {"isvalid": True, "address": params[0], "ismine": False},
+        'createrawtransaction': lambda params: '01000000000' + fake_hash('raw', dumps(params).decode()) * 2,
+        'fundrawtransaction': fundrawtransaction,
+        'decoderawtransaction': decoderawtransaction,
+        'signrawtransaction': lambda params: {"hex": params[0] + fake_hash('sig', params[0]) * 3, "complete": True},
+        'sendrawtransaction': lambda params: fake_hash('sent', params[0]),
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        self.timeout = self.server.fake_node.idle_timeout
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('content-length', 0)))
+        self.server.requests_count += 1
+        if self.server.fake_node.latency:
+            time.sleep(self.server.fake_node.latency)
+
+        request = loads(body)
+        status, response = self.server.fake_node.answer(request)
+
+        payload = dumps(response)
+        self.send_response(status)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeNode:
+    """ In-process JSON-RPC server mimicking bolivarcoind
+
+        results: method -> result, or method -> callable(params) returning result, over bolivarcoind_results()
+        latency: seconds added to every request
+        idle_timeout: seconds before an idle keep-alive connection is closed, like bolivarcoind rpcservertimeout
+        block_txs, masternodes, wallet_txs, gobjects: payload sizes, see bolivarcoind_results()
+    """
+
+    def __init__(
+            self,
+            results: dict[str, Any | Callable] | None = None,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            latency: float = 0.0,
+            idle_timeout: float | None = None,
+            block_txs: int = 100,
+            masternodes: int = 1000,
+            wallet_txs: int = 1000,
+            gobjects: int = 50,
+    ):
+        self.results = bolivarcoind_results(block_txs, masternodes, wallet_txs, gobjects)
+        if results:
+            self.results.update(results)
+        self.latency = latency
+        self.idle_timeout = idle_timeout
+
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake_node = self
+        self._server.requests_count = 0
+        self._thread: threading.Thread | None = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def requests_count(self) -> int:
+        """Number of HTTP requests received"""
+        return self._server.requests_count
+
+    def answer(self, request: dict | list) -> tuple[int, dict | list]:
+        """Build (http status, JSON response) for a single or batch request"""
+        if isinstance(request, list):
+            return 200, [self._answer_one(item)[1] for item in request]
+        return self._answer_one(request)
+
+    def _answer_one(self, request: dict) -> tuple[int, dict]:
+        method = request.get('method')
+        if method not in self.results:
+            error = {'code': -32601, 'message': 'Method not found'}
+            return 404, {'result': None, 'error': error, 'id': request.get('id')}
+
+        result = self.results[method]
+        if callable(result):
+            result = result(request.get('params', []))
+        return 200, {'result': result, 'error': None, 'id': request.get('id')}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def _serve(connection, options: dict):
+    fake = FakeNode(**options).start()
+    connection.send((fake.host, fake.port))
+    fake._thread.join()
+
+
+class FakeNodeProcess:
+    """ FakeNode in a child process, so client timings and allocations do not include server work
+
+        Same options as FakeNode, results must be picklable
+    """
+
+    def __init__(self, **options):
+        self._options = options
+        self._process: multiprocessing.Process | None = None
+        self.host = ''
+        self.port = 0
+
+    def start(self):
+        parent, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, self._options), daemon=True)
+        self._process.start()
+        self.host, self.port = parent.recv()
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,186 @@
+"""
+    Benchmark suite: per case calls/sec, p50/p99 latency and allocations of the client hot path
+
+    Runs against FakeNode in a child process (no real node needed), so numbers only include client work
+    plus loopback HTTP. Save a run and compare later ones to catch regressions before release.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --calls 500 --latency 1 --block-txs 1000 --only getblock fundrawtransaction
+    python -m benchmarks.suite --save before.json
+    python -m benchmarks.suite --compare before.json
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from orjson import dumps, loads
+
+from boli_orbital_api import Node
+from boli_orbital_api.rpc import _process_result
+from benchmarks.fake_node import TIP_HEIGHT, FakeNodeProcess
+
+# Allocation pass is traced, much slower, so it runs fewer calls
+_TRACED_CALLS = 20
+
+
+def _cases(node: Node) -> dict[str, tuple[Callable[[], Any], float]]:
+    """name -> (call, share of --calls to run)"""
+    blockhash = node.getblockhash(TIP_HEIGHT - 200)['result']
+    txid = node.getblock(blockhash)['result']['tx'][0]
+    decoded = {"result": {"hash": blockhash, "height": TIP_HEIGHT}, "errors": None}
+
+    def getblock_passthrough():
+        with node.passthrough():
+            return node.getblock(blockhash)
+
+    def masternodelist_stream():
+        return sum(1 for _ in node.stream("masternodelist", ["full"]))
+
+    def batch_getblockhash():
+        with node.batch() as batch:
+            for height in range(TIP_HEIGHT - 50, TIP_HEIGHT):
+                batch.getblockhash(height)
+
+    return {
+        "_process_result": (lambda: _process_result(decoded), 10.0),
+        "getblockcount": (node.getblockcount, 1.0),
+        "getblockhash": (lambda: node.getblockhash(TIP_HEIGHT - 100), 1.0),
+        "getinfo": (node.getinfo, 1.0),
+        "getblock": (lambda: node.getblock(blockhash), 1.0),
+        "getblock raw": (lambda: node.getblock(blockhash, verbose=False), 1.0),
+        "getblock passthrough": (getblock_passthrough, 1.0),
+        "getrawtransaction": (lambda: node.raw_call("getrawtransaction", [txid, 1]), 1.0),
+        "listtransactions 1000": (lambda: node.getlisttransactions(count=1000), 0.1),
+        "masternodelist full": (lambda: node.masternodelist("full"), 0.1),
+        "masternodelist full stream": (masternodelist_stream, 0.1),
+        "gobject list": (node.gobject_list, 0.2),
+        "fundrawtransaction": (lambda: node.fundrawtransaction({"bJG26MWSpxiYLada8orPxz8mwpUYubvJFh": 1.0}), 0.5),
+        "batch 50 getblockhash": (batch_getblockhash, 0.2),
+        "map 50 getblockhash": (lambda: node.map("getblockhash", range(TIP_HEIGHT - 50, TIP_HEIGHT)), 0.2),
+    }
+
+
+def measure(call: Callable[[], Any], calls: int, warmup: int = 10) -> dict:
+    """Time calls one by one, then trace allocations of a few more"""
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(calls):
+        start = time.perf_counter_ns()
+        call()
+        latencies.append(time.perf_counter_ns() - start)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    tracemalloc.start()
+    peak = 0
+    before, _ = tracemalloc.get_traced_memory()
+    for _ in range(_TRACED_CALLS):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        call()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    retained = (tracemalloc.get_traced_memory()[0] - before) / _TRACED_CALLS
+    tracemalloc.stop()
+
+    return {
+        "calls": calls,
+        "calls_per_sec": calls / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] / 1e6,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1e6,
+        "peak_kib": peak / 1024,
+        "retained_bytes": retained,
+    }
+
+
+def run(
+        calls: int = 1000,
+        latency_ms: float = 0.0,
+        block_txs: int = 100,
+        masternodes: int = 1000,
+        wallet_txs: int = 1000,
+        gobjects: int = 50,
+        only: list[str] | None = None,
+) -> dict[str, dict]:
+    results = {}
+    with FakeNodeProcess(
+            latency=latency_ms / 1000,
+            block_txs=block_txs,
+            masternodes=masternodes,
+            wallet_txs=wallet_txs,
+            gobjects=gobjects,
+    ) as fake:
+        with Node(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port) as node:
+            for name, (call, share) in _cases(node).items():
+                if only and not any(word in name for word in only):
+                    continue
+                results[name] = measure(call, max(10, int(calls * share)))
+                _print_row(name, results[name])
+    return results
+
+
+def _print_header():
+    print(f"{'case':<28}{'calls/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KiB':>11}{'retained B':>12}")
+
+
+def _print_row(name: str, result: dict, baseline: dict | None = None, threshold: float = 10.0):
+    row = (
+        f"{name:<28}{result['calls_per_sec']:>12.1f}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+        f"{result['peak_kib']:>11.1f}{result['retained_bytes']:>12.0f}"
+    )
+    if baseline is not None:
+        change = (result['calls_per_sec'] / baseline['calls_per_sec'] - 1) * 100
+        row += f"  {change:+6.1f}%{'  REGRESSION' if change < -threshold else ''}"
+    print(row)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=1000, help='calls per case (heavy cases run a share of it)')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency per request, ms')
+    parser.add_argument('--block-txs', type=int, default=100)
+    parser.add_argument('--masternodes', type=int, default=1000)
+    parser.add_argument('--wallet-txs', type=int, default=1000)
+    parser.add_argument('--gobjects', type=int, default=50)
+    parser.add_argument('--only', nargs='*', help='run cases whose name contains any of these words')
+    parser.add_argument('--save', help='write results as JSON')
+    parser.add_argument('--compare', help='JSON of a previous run, exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=10.0, help='calls/sec drop flagged by --compare, %%')
+    args = parser.parse_args(argv)
+
+    _print_header()
+    results = run(
+        calls=args.calls,
+        latency_ms=args.latency,
+        block_txs=args.block_txs,
+        masternodes=args.masternodes,
+        wallet_txs=args.wallet_txs,
+        gobjects=args.gobjects,
+        only=args.only,
+    )
+
+    if args.save:
+        with open(args.save, 'wb') as file:
+            file.write(dumps(results))
+
+    if not args.compare:
+        return 0
+
+    with open(args.compare, 'rb') as file:
+        baseline = loads(file.read())
+    print(f"\nvs {args.compare}")
+    _print_header()
+    regressions = 0
+    for name, result in results.items():
+        if name in baseline:
+            _print_row(name, result, baseline[name], args.threshold)
+            regressions += result['calls_per_sec'] < baseline[name]['calls_per_sec'] * (1 - args.threshold / 100)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
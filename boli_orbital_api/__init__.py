@@ -1,10 +1,66 @@
-from .rpc import (
-    Node,
-    GobjectListSignals,
-    GobjectListTypes,
-    MasternodeCountOptions,
-    MasternodeStartModes,
-    MnListModes,
-    About,
-    VERSION as API_VERSION
-)
+"""
+    Orbital API RPC for Bolivarcoin/Bolicoin
+
+    Names are loaded on first use (PEP 562): "import boli_orbital_api" is cheap, "from boli_orbital_api import Node"
+    loads only what Node needs.
+"""
+from importlib import import_module
+
+# Public name -> (module, attribute)
+_EXPORTS = {
+    'Node': ('.rpc', 'Node'),
+    'Batch': ('.rpc', 'Batch'),
+    'BatchCall': ('.rpc', 'BatchCall'),
+    'GobjectListSignals': ('.rpc', 'GobjectListSignals'),
+    'GobjectListTypes': ('.rpc', 'GobjectListTypes'),
+    'MasternodeCountOptions': ('.rpc', 'MasternodeCountOptions'),
+    'MasternodeStartModes': ('.rpc', 'MasternodeStartModes'),
+    'MnListModes': ('.rpc', 'MnListModes'),
+    'About': ('.rpc', 'About'),
+    'API_VERSION': ('.rpc', 'VERSION'),
+    'AsyncNode': ('.aio', 'AsyncNode'),
+    'AsyncBatch': ('.aio', 'AsyncBatch'),
+    'BlockCache': ('.cache', 'BlockCache'),
+    'TtlCache': ('.cache', 'TtlCache'),
+    'Call': ('.interceptors', 'Call'),
+    'Interceptor': ('.interceptors', 'Interceptor'),
+    'Metrics': ('.metrics', 'Metrics'),
+    'prometheus_text': ('.metrics', 'prometheus_text'),
+    'serve_metrics': ('.metrics', 'serve_metrics'),
+    'NodePool': ('.pool', 'NodePool'),
+    'WalletIndex': ('.indexer', 'WalletIndex'),
+    'NotifyListener': ('.notify', 'NotifyListener'),
+    'BlockEvent': ('.notify', 'BlockEvent'),
+    'WalletEvent': ('.notify', 'WalletEvent'),
+    'InstantSendEvent': ('.notify', 'InstantSendEvent'),
+    'AlertEvent': ('.notify', 'AlertEvent'),
+    'RetryPolicy': ('.resilience', 'RetryPolicy'),
+    'CircuitBreaker': ('.resilience', 'CircuitBreaker'),
+    'ResultStream': ('.stream', 'ResultStream'),
+    'ChainTipTracker': ('.tracker', 'ChainTipTracker'),
+    'TipEvent': ('.tracker', 'TipEvent'),
+    'Transport': ('.transport', 'Transport'),
+    'TransportError': ('.transport', 'TransportError'),
+    'RequestsTransport': ('.transport', 'RequestsTransport'),
+    'SocketTransport': ('.transport', 'SocketTransport'),
+    'RecordingTransport': ('.transport', 'RecordingTransport'),
+    'ReplayTransport': ('.transport', 'ReplayTransport'),
+    'read_recording': ('.transport', 'read_recording'),
+    'configure_logging': ('.logger', 'configure_logging'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module, __name__), attribute)
+    globals()[name] = value  # Next lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
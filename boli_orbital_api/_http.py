@@ -0,0 +1,52 @@
+"""
+    Minimal HTTP/1.1 helpers for JSON-RPC POST requests to bolivarcoind
+
+    Requests are always a small POST to "/", so the request head is built once per Node
+    and only Content-Length changes between calls.
+"""
+from base64 import b64encode
+
+__all__ = ['build_request_head', 'parse_response_head', 'request_bytes']
+
+
+def build_request_head(host: str, port: int, rpc_user: str | None, rpc_password: str | None, keep_alive: bool = True) -> bytes:
+    """Request head up to (not including) Content-Length value"""
+    lines = [
+        'POST / HTTP/1.1',
+        f'Host: {host}:{port}',
+        'Content-Type: text/plain;',
+        f'Connection: {"keep-alive" if keep_alive else "close"}',
+    ]
+    if rpc_user is not None:
+        credentials = b64encode(f'{rpc_user}:{rpc_password or ""}'.encode()).decode()
+        lines.append(f'Authorization: Basic {credentials}')
+    lines.append('Content-Length: ')
+    return '\r\n'.join(lines).encode()
+
+
+def request_bytes(head: bytes, body: bytes) -> bytes:
+    """Complete request, head from build_request_head()"""
+    return b''.join((head, str(len(body)).encode(), b'\r\n\r\n', body))
+
+
+def parse_response_head(head: bytes) -> tuple[int, dict[str, str], bool]:
+    """ Parse status line and headers (head includes final blank line)
+
+        Returns (status code, lowercase headers, keep alive)
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    version, status, *_ = lines[0].split(' ', 2)
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            key, _, value = line.partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        keep_alive = connection == 'keep-alive'
+    else:
+        keep_alive = connection != 'close'
+
+    return int(status), headers, keep_alive
@@ -0,0 +1,554 @@
+"""
+    AsyncNode: asyncio version of Node
+
+    Same methods as Node (same mixins), every method is awaitable.
+    Non-blocking HTTP/1.1 transport with keep-alive connection reuse and bounded concurrency.
+
+        async with AsyncNode(rpc_user="user", rpc_password="password") as node:
+            await node.getblockcount()
+            # {'result': 1050203, 'errors': False}
+
+"""
+import asyncio
+import ssl
+from functools import wraps
+from inspect import isawaitable
+from itertools import count
+from time import monotonic, perf_counter
+from typing import Any, Iterable
+
+from orjson import dumps, loads
+
+from ._http import build_request_head, parse_response_head, request_bytes
+from .cache import BlockCache, TtlCache
+from .interceptors import Call, Interceptor, chain, intercept_async, intercept_batch_async
+from .logger import setup_logger
+from .metrics import Metrics
+from .methods import DEFAULT_BUDGETS, IDEMPOTENT_CALLS, call_name
+from .resilience import _DEFAULT_RETRY_POLICY, CircuitBreaker, RetryPolicy, deadline
+from .rpc import (
+    VERSION,
+    Batch,
+    BatchCall,
+    _BlockChain,
+    _Governance,
+    _Help,
+    _Masternode,
+    _Network,
+    _Transactions,
+    _Utils,
+    _Wallet,
+    _Health,
+    _batch_payload,
+    _call_deadline,
+    _decode_response,
+    _fill_batch,
+    _is_transient,
+    _node_answered,
+    _observe,
+    _observe_batch,
+    _passthrough,
+    _passthrough_mode,
+    _process_result,
+)
+
+__all__ = ['AsyncNode', 'AsyncBatch']
+
+# LOGGER
+logger = setup_logger(__name__)
+
+_MIXINS = (_Utils, _Wallet, _BlockChain, _Network, _Transactions, _Governance, _Masternode, _Help)
+
+
+class _AsyncConnectionPool:
+    """ Keep-alive HTTP/1.1 connections to one node
+
+        max_concurrency: max requests in flight (one connection each)
+        pool_size: max idle connections kept open for reuse
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            scheme: str,
+            head: bytes,
+            pool_size: int,
+            max_concurrency: int,
+            connect_timeout: float | None,
+            read_timeout: float | None,
+    ):
+        self.host = host
+        self.port = port
+        self._ssl = ssl.create_default_context() if scheme == 'https' else None
+        self._head = head
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl),
+            self.connect_timeout
+        )
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> tuple[int, bytes, bool]:
+        status, headers, keep_alive = parse_response_head(await reader.readuntil(b'\r\n\r\n'))
+
+        if 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if size == 0:
+                    await reader.readuntil(b'\r\n')  # No trailers from bolivarcoind
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b''.join(chunks)
+        else:  # Body until connection close
+            content = await reader.read()
+            keep_alive = False
+
+        return status, content, keep_alive
+
+    async def request(self, body: bytes) -> tuple[int, bytes]:
+        """POST body, returns (status code, content)"""
+        async with self._semaphore:
+            while True:
+                reused = bool(self._idle)
+                reader, writer = self._idle.pop() if reused else await self._open()
+                try:
+                    writer.write(request_bytes(self._head, body))
+                    status, content, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader),
+                        self.read_timeout
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if reused:  # Node closed an idle connection, try again
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+
+                if keep_alive and len(self._idle) < self.pool_size:
+                    self._idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, content
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class AsyncBatch(Batch):
+    """ Batch request for AsyncNode, see Batch
+
+        batch = node.batch()
+        info = batch.getinfo()
+        await batch.execute()
+        info.result
+
+        async with node.batch() as batch:
+            info = batch.getinfo()
+    """
+
+    async def execute(self) -> dict:
+        if self.calls:
+            await self._node._send_batch(self.calls)
+        return {call.id: call.result for call in self.calls}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.execute()
+
+
+class AsyncNode(
+    _Utils,
+    _Wallet,
+    _BlockChain,
+    _Network,
+    _Transactions,
+    _Governance,
+    _Masternode,
+    _Help,
+    _Health
+):
+    """ Main RPC/API Class, asyncio version
+
+        Every method of Node is a coroutine here.
+
+        max_concurrency: max RPCs in flight against this node, others wait their turn
+        pool_size: max idle keep-alive connections kept for reuse
+        metrics: True for per method counters and latency histograms (node.metrics), see Node
+        interceptors: Hooks around every call, in order, hooks may be coroutines, see interceptors.py
+    """
+
+    def __init__(
+            self,
+            rpc_user: str | None = None,
+            rpc_password: str | None = None,
+            rpc_port: int = 3563,
+            server_ip: str = "127.0.0.1",
+            scheme: str = 'http',
+            core_type: int = 1,
+            name: str = '',
+            ticker: str = 'BOLI',
+            is_masternode: bool = False,
+            app_id: str = 'standard',
+            pool_size: int = 100,
+            max_concurrency: int = 100,
+            connect_timeout: float | None = 10.0,
+            read_timeout: float | None = None,
+            keep_alive: bool = True,
+            block_cache: BlockCache | None = None,
+            ttl_cache: TtlCache | None = None,
+            health_interval: float = 30.0,
+            retry_policy: RetryPolicy | None = _DEFAULT_RETRY_POLICY,
+            circuit_breaker: CircuitBreaker | bool = True,
+            budgets: dict[str, float] | None = None,
+            metrics: Metrics | bool = False,
+            interceptors: Iterable[Interceptor] | None = None,
+    ):
+        self.server_ip = server_ip
+        self.rpc_port = rpc_port
+        self.rpc_user = rpc_user
+        self.rpc_password = rpc_password
+        self.scheme = scheme
+        self.core_type = core_type
+        self.name = name
+        self.ticker = ticker
+        self.is_masternode = is_masternode
+        self.app_id = f"Orbital_{app_id}"
+        self.block_cache = block_cache
+        self.ttl_cache = ttl_cache
+
+        if retry_policy is _DEFAULT_RETRY_POLICY:
+            retry_policy = RetryPolicy()
+        self.retry_policy: RetryPolicy | None = retry_policy
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker or None
+        self.retries = 0
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.metrics: Metrics | None = Metrics() if metrics is True else metrics or None
+        self.interceptors: list[Interceptor] = chain(interceptors)
+
+        self._valid_node: bool = False
+        self.health_interval = health_interval
+        self._ids = count(1)
+
+        self._pool = _AsyncConnectionPool(
+            host=server_ip,
+            port=rpc_port,
+            scheme=scheme,
+            head=build_request_head(server_ip, rpc_port, rpc_user, rpc_password, keep_alive),
+            pool_size=pool_size,
+            max_concurrency=max_concurrency,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+        )
+
+    async def raw_call(
+            self,
+            method: str,
+            params=None,
+            return_binary=False,
+            use_cache=True,
+            timeout: float | None = None,
+            passthrough: bool | None = None
+    ) -> Any:
+        """Rpc communication raw_call main method, see Node.raw_call"""
+        if self.interceptors:
+            return await intercept_async(
+                self.interceptors,
+                Call(method, params, return_binary, use_cache, timeout, passthrough),
+                self._send_call
+            )
+        return await self._raw_call(method, params, return_binary, use_cache, timeout, passthrough)
+
+    async def _send_call(self, call: Call) -> dict:
+        return await self._raw_call(
+            call.method, call.params, call.return_binary, call.use_cache, call.timeout, call.passthrough
+        )
+
+    async def _raw_call(
+            self,
+            method: str,
+            params,
+            return_binary: bool,
+            use_cache: bool,
+            timeout: float | None,
+            passthrough: bool | None
+    ) -> dict:
+        """raw_call past interceptors, see Node._raw_call"""
+        if passthrough is None:
+            passthrough = _passthrough_mode.get()
+        use_cache = use_cache and not (return_binary or passthrough)  # Caches hold decoded results
+
+        if self.ttl_cache is not None and use_cache and self.ttl_cache.is_cached(method, params):
+            if self.ttl_cache.tip_check_due():
+                await self.raw_call("getbestblockhash")  # Invalidates ttl_cache on new block
+            cached = self.ttl_cache.lookup(method, params)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(call_name(method, params))
+                return cached
+
+        if self.block_cache is not None and use_cache:
+            cached = self.block_cache.lookup(method, params)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(call_name(method, params))
+                return cached
+
+        data = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": [] if params is None else params}
+
+        logger.debug("raw_call: method:%s params:%.200s", method, params)
+
+        name = call_name(method, params)
+        payload = dumps(data)
+        started = perf_counter()
+        response = await self._exchange(payload, name in IDEMPOTENT_CALLS, _call_deadline(self.budgets, (name,), timeout))
+        if self.metrics is not None:
+            _observe(self.metrics, name, started, len(payload), response)
+        if isinstance(response, str):
+            logger.warning('%s raw_call %s failed: %s', self.name, method, response)
+            self._set_health(False)
+            return {"result": None, 'errors': response}
+
+        try:
+            status, content = response
+            self._set_health(_node_answered(status))
+            result = _decode_response(status, content, return_binary, passthrough)
+            if not (return_binary or passthrough):
+                if self.ttl_cache is not None:
+                    self.ttl_cache.store(method, params, result)
+                if self.block_cache is not None:
+                    self.block_cache.store(method, params, result)
+            return result
+
+        except Exception as e:
+            logger.warning("%s raw_call Exception: %s", self.name, e)
+            self._set_health(False)
+            return {"result": None, 'errors': f'{e}'}
+
+    async def _exchange(self, data: bytes, idempotent: bool, until: float) -> tuple[int, bytes] | str:
+        """POST through circuit breaker with retries, see Node._exchange"""
+        attempt = 0
+        while True:
+            remaining = until - monotonic()
+            if remaining <= 0:
+                return f'Deadline exceeded for {self.name or self.server_ip}'
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                return f'Circuit breaker open for {self.name or self.server_ip}'
+
+            response: tuple[int, bytes] | str
+            try:
+                response = await asyncio.wait_for(self._pool.request(data), remaining)
+                if response[0] == 503:
+                    response = f'HTTP 503 {response[1][:100].decode(errors="replace")}'
+            except Exception as e:  # OSError, TimeoutError, IncompleteReadError, malformed HTTP...
+                response = f'{e!r}'
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(not isinstance(response, str))
+
+            transient = isinstance(response, str) or _is_transient(*response)
+            if not transient or not idempotent or self.retry_policy is None \
+                    or attempt + 1 >= self.retry_policy.max_attempts:
+                return response
+
+            delay = self.retry_policy.delay(attempt)
+            if monotonic() + delay >= until:
+                return response
+            logger.debug("%s retry %d in %.3fs", self.name, attempt + 1, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            self.retries += 1
+
+    def batch(self) -> AsyncBatch:
+        """New JSON-RPC batch request, see AsyncBatch"""
+        return AsyncBatch(self)
+
+    @staticmethod
+    def passthrough():
+        """Context manager, every call inside (this task) returns result as raw JSON bytes, see Node.passthrough"""
+        return _passthrough()
+
+    @staticmethod
+    def deadline(seconds: float):
+        """ Context manager, every call inside (this task) must finish within seconds, see Node.deadline
+
+            with node.deadline(2.5):
+                await node.getblockcount()
+        """
+        return deadline(seconds)
+
+    async def _send_batch(self, calls: list[BatchCall]):
+        """Send calls as one JSON array POST and fill every call.response, see Node._send_batch"""
+        if self.interceptors:
+            await intercept_batch_async(self.interceptors, calls, self._post_batch)
+        else:
+            await self._post_batch(calls)
+
+    async def _post_batch(self, calls: list[BatchCall]):
+        """_send_batch past interceptors"""
+        caches = [cache for cache in (self.ttl_cache, self.block_cache) if cache is not None]
+        for cache in caches:
+            calls = cache.lookup_batch(calls)
+        if not calls:
+            return
+
+        logger.debug("_send_batch: %d calls", len(calls))
+
+        names = [call_name(call.method, call.params) for call in calls]
+        payload = _batch_payload(calls)
+        started = perf_counter()
+        response = await self._exchange(
+            payload,
+            all(name in IDEMPOTENT_CALLS for name in names),
+            _call_deadline(self.budgets, names)
+        )
+        if isinstance(response, str):
+            logger.warning('%s _send_batch failed: %s', self.name, response)
+            self._set_health(False)
+            for call in calls:
+                call.response = {"result": None, 'errors': response}
+        else:
+            try:
+                status, content = response
+                self._set_health(_node_answered(status))
+                _fill_batch(calls, loads(content))
+                for cache in caches:
+                    cache.store_batch(calls)
+
+            except Exception as e:
+                logger.warning("%s _send_batch Exception: %r", self.name, e)
+                self._set_health(False)
+                for call in calls:
+                    call.response = {"result": None, 'errors': f'{e!r}'}
+
+        if self.metrics is not None:
+            _observe_batch(self.metrics, calls, started, len(payload), 0 if isinstance(response, str) else len(response[1]))
+
+    async def map(self, method: str, params_list: Iterable) -> list[dict]:
+        """Call same method with many params concurrently (bounded by max_concurrency), see Node.map"""
+        async def call(params):
+            if not isinstance(params, (list, tuple)):
+                params = [params]
+            return await _process_result(self.raw_call(method, params=list(params)))
+
+        return await asyncio.gather(*[call(params) for params in params_list])
+
+    async def fundrawtransaction(
+            self,
+            recipients_with_amounts: dict,  # {"address..1":amount..1,"address..2":amount..2,...}
+    ):
+        """Sending Coins with Automated Raw Transactions, see Node.fundrawtransaction"""
+        rawtransaction = await self.raw_call('createrawtransaction', params=[[], recipients_with_amounts], passthrough=False)
+        if rawtransaction['errors'] is not None:
+            return {"result": rawtransaction.get('result', None), "errors": rawtransaction.get('errors', True)}
+
+        fund = await self.raw_call('fundrawtransaction', params=[rawtransaction['result']], passthrough=False)
+        if fund['errors'] is not None:
+            return {"result": fund.get('result', None), "errors": fund.get('errors', True)}
+        hex = fund['result']['hex']
+        fee = fund['result']['fee']
+
+        decoded = await self.raw_call('decoderawtransaction', params=[hex], passthrough=False)
+        if decoded['errors'] is not None:
+            return {"result": decoded.get('result', None), "errors": decoded.get('errors', True)}
+
+        signed = await self.raw_call('signrawtransaction', params=[hex], passthrough=False)
+        if signed['errors'] is not None:
+            return {"result": signed.get('result', None), "errors": signed.get('errors', True)}
+
+        sent = await self.raw_call('sendrawtransaction', params=[signed['result']['hex']], passthrough=False)
+        if sent['errors'] is not None:
+            return {"result": sent.get('result', None), "errors": sent.get('errors', True)}
+
+        return {
+            "txid": sent['result'],
+            "fee": fee,
+            "errors": sent['errors']
+        }
+
+    async def close(self):
+        """Close all idle connections to node"""
+        await self._pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def probe(self) -> bool:
+        """Check node now (one getblockcount, never cached), returns and updates is_online"""
+        blockcount = await self.raw_call("getblockcount", use_cache=False)
+        self._set_health(blockcount.get('result', None) is not None)
+        return self._valid_node
+
+    async def _is_online(self) -> bool:
+        if self.health_is_stale:
+            await self.probe()
+        return self._valid_node
+
+    @property
+    def is_online(self):
+        """await node.is_online, last known state, node is probed only when it is older than health_interval"""
+        return self._is_online()
+
+    @property
+    def all_node_info(self):
+        """await node.all_node_info, one batch request"""
+        return self._all_node_info()
+
+    async def _all_node_info(self) -> dict:
+        async with self.batch() as batch:
+            calls = {
+                "getblockchaininfo": batch.getblockchaininfo(),
+                "getnetworkinfo": batch.getnetworkinfo(),
+                "getwalletinfo": batch.getwalletinfo()
+            }
+        return {name: call.result for name, call in calls.items()}
+
+    @property
+    def api_version(self) -> str:
+        return VERSION
+
+
+def _awaitable(method):
+    """Mixin methods may return a dict before calling raw_call (bad arguments), always return a coroutine"""
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if isawaitable(result):
+            return await result
+        return result
+
+    return wrapper
+
+
+for _mixin in _MIXINS:
+    for _name, _method in vars(_mixin).items():
+        if not _name.startswith('_') and _name != 'raw_call' and callable(_method):
+            setattr(AsyncNode, _name, _awaitable(_method))
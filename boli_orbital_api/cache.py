@@ -0,0 +1,443 @@
+"""
+    Caches for Node
+
+    BlockCache: immutable block and transaction data (getblock, getblockhash, gettransaction).
+    Only data buried deeper than min_confirmations is cached, it never changes.
+
+        cache = BlockCache("blocks.sqlite3", max_memory_bytes=64 * 1024 * 1024, min_confirmations=100)
+        node = Node(rpc_user="user", rpc_password="password", block_cache=cache)
+        node.getblock("0000...")  # From node
+        node.getblock("0000...")  # From cache
+        cache.stats()
+
+    TtlCache: volatile chain state (getblockcount, getinfo...), kept for a time to live per method
+    and invalidated as soon as best block changes.
+
+        node = Node(rpc_user="user", rpc_password="password", ttl_cache=TtlCache())
+
+"""
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock, RLock
+
+from orjson import OPT_SORT_KEYS, dumps, loads
+
+from .methods import call_name
+
+__all__ = ['BlockCache', 'TtlCache', 'DEFAULT_TTL_POLICIES']
+
+# Seconds to live per call name (see methods.call_name), about one block interval
+DEFAULT_TTL_POLICIES: dict[str, float] = {
+    'getblockcount': 180.0,
+    'getdifficulty': 180.0,
+    'getblockchaininfo': 180.0,
+    'getgovernanceinfo': 180.0,
+    'getinfo': 30.0,
+    'masternode count': 60.0,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    hash BLOB NOT NULL,
+    verbose INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (hash, verbose)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS heights (
+    height INTEGER PRIMARY KEY,
+    hash BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS heights_hash ON heights (hash);
+CREATE TABLE IF NOT EXISTS transactions (
+    txid BLOB PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class _CacheLayer:
+    """Batch support for caches with lookup() and store()"""
+
+    def lookup(self, method: str, params: list | None) -> dict | None:
+        raise NotImplementedError
+
+    def store(self, method: str, params: list | None, response: dict):
+        raise NotImplementedError
+
+    def lookup_batch(self, calls: list) -> list:
+        """Fill response of cached BatchCalls, returns calls still to be sent to node"""
+        missing = []
+        for call in calls:
+            cached = self.lookup(call.method, call.params)
+            if cached is None:
+                missing.append(call)
+            else:
+                call.response = cached
+        return missing
+
+    def store_batch(self, calls: list):
+        for call in calls:
+            if call.response is not None:
+                self.store(call.method, call.params, call.response)
+
+
+class BlockCache(_CacheLayer):
+    """ Two tiers cache for immutable data: memory LRU (bounded in bytes) over local SQLite store
+
+        path: SQLite file, None for memory only
+        max_memory_bytes: max size of serialized data kept in memory
+        min_confirmations: only blocks/transactions with at least these confirmations are cached
+        compress_level: zlib level for stored data (0 to 9)
+
+        Values are stored as zlib compressed JSON, hashes as 32 raw bytes.
+        Cached "confirmations" is the value when it was cached.
+
+        One BlockCache can be shared by many nodes of the same chain, close() it when done.
+    """
+    METHODS = frozenset(('getblock', 'getblockhash', 'gettransaction', 'getblockcount'))
+
+    def __init__(
+            self,
+            path: str | Path | None = None,
+            max_memory_bytes: int = 64 * 1024 * 1024,
+            min_confirmations: int = 100,
+            compress_level: int = 6,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.min_confirmations = min_confirmations
+        self.compress_level = compress_level
+
+        self._lock = RLock()
+        self._memory: OrderedDict[tuple, bytes] = OrderedDict()
+        self._memory_bytes = 0
+
+        # Best known chain height, learnt from node responses
+        self._tip_height: int | None = None
+
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    # ---- Serialization
+    def _pack(self, value) -> bytes:
+        return zlib.compress(dumps(value), self.compress_level)
+
+    @staticmethod
+    def _unpack(data: bytes):
+        return loads(zlib.decompress(data))
+
+    # ---- Memory tier
+    def _memory_get(self, key: tuple) -> bytes | None:
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+        return data
+
+    def _memory_put(self, key: tuple, data: bytes):
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        if len(data) > self.max_memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    # ---- Disk tier
+    def _disk_get(self, key: tuple) -> bytes | None:
+        if self._db is None:
+            return None
+        kind = key[0]
+        if kind == 'block':
+            row = self._db.execute(
+                "SELECT data FROM blocks WHERE hash = ? AND verbose = ?", (bytes.fromhex(key[1]), key[2])
+            ).fetchone()
+        elif kind == 'hash':
+            row = self._db.execute("SELECT hash FROM heights WHERE height = ?", (key[1],)).fetchone()
+        else:
+            row = self._db.execute("SELECT data FROM transactions WHERE txid = ?", (bytes.fromhex(key[1]),)).fetchone()
+        return None if row is None else row[0]
+
+    def _disk_put(self, key: tuple, data: bytes):
+        if self._db is None:
+            return
+        kind = key[0]
+        if kind == 'block':
+            self._db.execute(
+                "INSERT OR REPLACE INTO blocks (hash, verbose, data) VALUES (?, ?, ?)", (bytes.fromhex(key[1]), key[2], data)
+            )
+        elif kind == 'hash':
+            self._db.execute("INSERT OR REPLACE INTO heights (height, hash) VALUES (?, ?)", (key[1], data))
+        else:
+            self._db.execute("INSERT OR REPLACE INTO transactions (txid, data) VALUES (?, ?)", (bytes.fromhex(key[1]), data))
+        self._db.commit()
+
+    def _get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            data = self._memory_get(key)
+            if data is not None:
+                self._stats["memory_hits"] += 1
+                return data
+
+            data = self._disk_get(key)
+            if data is not None:
+                self._stats["disk_hits"] += 1
+                self._memory_put(key, data)
+                return data
+
+            self._stats["misses"] += 1
+            return None
+
+    def _put(self, key: tuple, data: bytes):
+        with self._lock:
+            self._memory_put(key, data)
+            self._disk_put(key, data)
+            self._stats["stores"] += 1
+
+    def _is_deep_hash(self, blockhash: str) -> bool:
+        """Hash already cached as a deep block"""
+        if ('block', blockhash, True) in self._memory:
+            return True
+        if self._db is None:
+            return False
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM heights WHERE hash = ?", (bytes.fromhex(blockhash),)).fetchone() is not None
+
+    def _see_tip(self, height: int):
+        if self._tip_height is None or height > self._tip_height:
+            self._tip_height = height
+
+    # ---- Node interface
+    @staticmethod
+    def _key(method: str, params: list | None) -> tuple | None:
+        """Cache key for a call, None when call is not cacheable"""
+        params = params or []
+        try:
+            if method == 'getblock' and params:
+                return 'block', params[0], bool(params[1]) if len(params) > 1 else True
+            if method == 'getblockhash' and len(params) == 1:
+                return 'hash', int(params[0])
+            if method == 'gettransaction' and len(params) == 1:  # includeWatchonly changes result
+                return 'tx', params[0]
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def lookup(self, method: str, params: list | None) -> dict | None:
+        """Cached response in raw_call format or None"""
+        if method not in self.METHODS:
+            return None
+        key = self._key(method, params)
+        if key is None:
+            return None
+
+        try:
+            data = self._get(key)
+        except ValueError:  # Not an hex hash
+            return None
+        if data is None:
+            return None
+
+        if key[0] == 'hash':
+            return {"result": data.hex(), 'errors': None}
+        return {"result": self._unpack(data), 'errors': None}
+
+    def store(self, method: str, params: list | None, response: dict):
+        """Store a successful raw_call response if it is immutable"""
+        if method not in self.METHODS or response.get('errors') is not None:
+            return
+        result = response.get('result')
+        if result is None:
+            return
+
+        try:
+            if method == 'getblockcount':
+                self._see_tip(int(result))
+                return
+
+            key = self._key(method, params)
+            if key is None:
+                return
+
+            if key[0] == 'block':
+                if isinstance(result, dict):
+                    confirmations = result.get('confirmations', 0)
+                    if confirmations > 0:
+                        self._see_tip(result['height'] + confirmations - 1)
+                    if confirmations >= self.min_confirmations:
+                        self._put(key, self._pack(result))
+                        self._put(('hash', result['height']), bytes.fromhex(result['hash']))
+                elif self._is_deep_hash(key[1]):
+                    self._put(key, self._pack(result))
+
+            elif key[0] == 'hash':
+                if self._tip_height is not None and self._tip_height - key[1] + 1 >= self.min_confirmations:
+                    self._put(key, bytes.fromhex(result))
+
+            elif result.get('confirmations', 0) >= self.min_confirmations:  # Transaction
+                self._put(key, self._pack(result))
+
+        except (KeyError, TypeError, ValueError, AttributeError):  # Unexpected result, do not cache
+            pass
+
+    def stats(self) -> dict:
+        """Hits, misses and memory usage"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_ratio"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class TtlCache(_CacheLayer):
+    """ Per method time to live cache for volatile chain state
+
+        policies: call name -> seconds to live, see DEFAULT_TTL_POLICIES and methods.call_name.
+            Calls not in policies are never cached
+        tip_check_interval: seconds between best block checks (one getbestblockhash shared by all methods),
+            None disables them and cache relies on observed responses and invalidate()
+
+        Everything is invalidated as soon as best block hash (or height) changes, observed from
+        tip checks, getblockcount/getinfo/getblockchaininfo responses or invalidate() calls.
+    """
+
+    def __init__(self, policies: dict[str, float] | None = None, tip_check_interval: float | None = 1.0):
+        self.policies = dict(DEFAULT_TTL_POLICIES if policies is None else policies)
+        self.tip_check_interval = tip_check_interval
+
+        self._lock = Lock()
+        self._entries: dict[tuple, tuple[float, bytes]] = {}
+        self._best_hash: str | None = None
+        self._best_height: int | None = None
+        self._next_tip_check = 0.0
+
+        self._stats: dict[str, dict[str, int]] = {}
+        self._invalidations = 0
+        self._tip_checks = 0
+
+    def is_cached(self, method: str, params: list | None) -> bool:
+        return call_name(method, params) in self.policies
+
+    def _method_stats(self, name: str) -> dict[str, int]:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = {"hits": 0, "misses": 0, "expired": 0}
+        return stats
+
+    @staticmethod
+    def _key(method: str, params: list | None) -> tuple:
+        return method, dumps(params or [], option=OPT_SORT_KEYS)
+
+    def lookup(self, method: str, params: list | None) -> dict | None:
+        name = call_name(method, params)
+        if name not in self.policies:
+            return None
+
+        key = self._key(method, params)
+        now = time.monotonic()
+        with self._lock:
+            stats = self._method_stats(name)
+            entry = self._entries.get(key)
+            if entry is None:
+                stats["misses"] += 1
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                stats["expired"] += 1
+                return None
+            stats["hits"] += 1
+
+        return {"result": loads(entry[1]), 'errors': None}
+
+    def store(self, method: str, params: list | None, response: dict):
+        result = response.get('result')
+        if response.get('errors') is not None or result is None:
+            return
+
+        # Learn best block from responses
+        try:
+            if method == 'getblockcount':
+                self.observe_tip(height=int(result))
+            elif method == 'getinfo':
+                self.observe_tip(height=int(result['blocks']))
+            elif method == 'getblockchaininfo':
+                self.observe_tip(blockhash=result['bestblockhash'], height=int(result['blocks']))
+            elif method == 'getbestblockhash':
+                self.observe_tip(blockhash=result)
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        ttl = self.policies.get(call_name(method, params))
+        if not ttl:
+            return
+        with self._lock:
+            self._entries[self._key(method, params)] = (time.monotonic() + ttl, dumps(result))
+
+    def tip_check_due(self) -> bool:
+        """ True when caller must check best block now (and report it with observe_tip())
+
+            Only one caller gets True per interval
+        """
+        if self.tip_check_interval is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_tip_check:
+                return False
+            self._next_tip_check = now + self.tip_check_interval
+            self._tip_checks += 1
+            return True
+
+    def observe_tip(self, blockhash: str | None = None, height: int | None = None):
+        """Report current best block, cache is invalidated if it changed"""
+        with self._lock:
+            changed = (
+                (blockhash is not None and self._best_hash is not None and blockhash != self._best_hash) or
+                (height is not None and self._best_height is not None and height != self._best_height)
+            )
+            if blockhash is not None:
+                self._best_hash = blockhash
+            if height is not None:
+                self._best_height = height
+            if changed:
+                self._entries.clear()
+                self._invalidations += 1
+
+    def invalidate(self):
+        """Drop everything, call it on new block notifications"""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> dict:
+        """Hits, misses and expired per call name, invalidations and tip checks"""
+        with self._lock:
+            return {
+                "methods": {name: dict(stats) for name, stats in self._stats.items()},
+                "entries": len(self._entries),
+                "invalidations": self._invalidations,
+                "tip_checks": self._tip_checks,
+            }
@@ -0,0 +1,344 @@
+"""
+    WalletIndex: local SQLite index of wallet transactions, synced incrementally with listsinceblock
+
+    listtransactions pages by offset from newest: offsets shift when transactions arrive and a full scan
+    reads the whole wallet again. The index keeps a block hash cursor instead, each sync() reads only what
+    changed since it, and lookups by txid, address, category or time are local queries.
+
+        index = WalletIndex("wallet.sqlite", node)
+        index.sync()                                    # First sync reads the whole wallet, next ones only news
+        index.query(address="bXYZ...", since=1690000000, category="receive")
+        index.transaction("1075db55d4...")
+
+        tracker.on_block(lambda event: index.sync())   # Keep it current with a ChainTipTracker
+
+    Reorgs: the cursor stays confirmations - 1 blocks below tip, so every sync lists again the last blocks and
+    updates their entries. A deeper reorg moves the cursor off the best chain: sync() walks back to the fork
+    (getblockheader), clears block data of entries above it and lists again from there.
+"""
+import sqlite3
+from threading import Lock
+from typing import Any
+
+from .logger import setup_logger
+
+__all__ = ['WalletIndex']
+
+# LOGGER
+logger = setup_logger(__name__)
+
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    txid TEXT NOT NULL,
+    category TEXT NOT NULL,
+    vout INTEGER NOT NULL,
+    move_key TEXT NOT NULL DEFAULT '',
+    address TEXT,
+    account TEXT,
+    otheraccount TEXT,
+    label TEXT,
+    amount INTEGER NOT NULL,
+    fee INTEGER,
+    blockhash TEXT,
+    blockheight INTEGER,
+    blockindex INTEGER,
+    blocktime INTEGER,
+    time INTEGER NOT NULL,
+    timereceived INTEGER,
+    instantlock INTEGER NOT NULL DEFAULT 0,
+    conflicted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (txid, category, vout, move_key)
+);
+CREATE INDEX IF NOT EXISTS entries_address ON entries (address, time);
+CREATE INDEX IF NOT EXISTS entries_category ON entries (category, time);
+CREATE INDEX IF NOT EXISTS entries_time ON entries (time);
+CREATE INDEX IF NOT EXISTS entries_blockheight ON entries (blockheight);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+_UPSERT = """
+INSERT INTO entries VALUES (
+    :txid, :category, :vout, :move_key, :address, :account, :otheraccount, :label, :amount, :fee, :blockhash,
+    :blockheight, :blockindex, :blocktime, :time, :timereceived, :instantlock, :conflicted
+)
+ON CONFLICT (txid, category, vout, move_key) DO UPDATE SET
+    address = excluded.address, account = excluded.account, otheraccount = excluded.otheraccount,
+    label = excluded.label, amount = excluded.amount,
+    fee = excluded.fee, blockhash = excluded.blockhash, blockheight = excluded.blockheight,
+    blockindex = excluded.blockindex, blocktime = excluded.blocktime, time = excluded.time,
+    timereceived = excluded.timereceived, instantlock = excluded.instantlock, conflicted = excluded.conflicted
+"""
+
+# Amounts are stored in satoshis, sums stay exact
+_COIN = 100_000_000
+
+# Max blocks walked back from a cursor left off the best chain
+_MAX_REORG_DEPTH = 10000
+
+
+def _satoshis(amount: float | None) -> int | None:
+    return None if amount is None else round(amount * _COIN)
+
+
+class WalletIndex:
+    """ Persistent wallet transaction index, one row per listsinceblock entry (txid, category, vout)
+
+        "move" entries (accounts moving funds, no transaction) have no txid nor vout, they are told apart by
+        time, account, otheraccount and amount instead.
+
+        path: SQLite database file, ":memory:" for a throwaway index
+        node: Node or NodePool with the wallet, needed by sync() only
+        confirmations: blocks listed again on every sync (reorgs up to that deep are fixed without a walk back)
+        includewatchonly: index watch-only addresses too
+
+        Rows come back as dicts shaped like listtransactions entries, amounts in BOLIVARCOIN,
+        "confirmations" counted from tip seen by last sync.
+    """
+
+    def __init__(self, path: str, node: Any = None, confirmations: int = 6, includewatchonly: bool = False):
+        self.path = path
+        self.node = node
+        self.confirmations = max(1, confirmations)
+        self.includewatchonly = includewatchonly
+
+        self._lock = Lock()  # Connection, held for one query or the sync write transaction
+        self._sync_lock = Lock()  # One sync at a time
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._db.execute("PRAGMA journal_mode=WAL")  # Other processes read while a sync writes
+        with self._db:
+            self._db.executescript(_SCHEMA)
+            version = self._meta('schema')
+            if version is None:
+                self._set_meta('schema', _SCHEMA_VERSION)
+            elif int(version) != _SCHEMA_VERSION:
+                raise ValueError(f"{path} has index schema {version}, expected {_SCHEMA_VERSION}")
+
+    def _meta(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value: Any):
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, None if value is None else str(value)))
+
+    @property
+    def cursor(self) -> tuple[str | None, int | None]:
+        """(block hash, height) next sync lists transactions after, (None, None) before first sync"""
+        with self._lock:
+            blockhash, height = self._meta('cursor'), self._meta('cursor_height')
+        return blockhash, None if height is None else int(height)
+
+    # ┏━┓╻ ╻┏┓╻┏━╸
+    # ┗━┓┗┳┛┃┗┫┃
+    # ┗━┛ ╹ ╹ ╹┗━╸
+    def sync(self) -> dict:
+        """ Read wallet changes since cursor into index, in one SQLite transaction
+
+            Returns {"result": {"entries", "added", "reorg", "cursor", "height"}, "errors": False},
+            on RPC errors {"result": None, "errors": ...} and index is left unchanged.
+            reorg: height of fork point when cursor was off the best chain, else None
+        """
+        with self._sync_lock:
+            with self._lock:
+                cursor = self._meta('cursor')
+
+            # Node round-trips first, readers only wait for the SQLite write
+            fork = None
+            if cursor is not None:
+                header = self.node.raw_call('getblockheader', [cursor])
+                if header.get('errors') is not None:
+                    return {"result": None, "errors": header.get('errors')}
+                if header['result'].get('confirmations', 0) < 0:
+                    walked = self._fork_point(header['result'])
+                    if walked.get('errors'):
+                        return walked
+                    cursor, fork = walked['result']
+
+            listed = self.node.listsinceblock(cursor or "", self.confirmations, self.includewatchonly)
+            if listed.get('errors'):
+                return listed
+            lastblock = listed['result']['lastblock']
+            header = self.node.raw_call('getblockheader', [lastblock])
+            if header.get('errors') is not None:
+                return {"result": None, "errors": header.get('errors')}
+            last_height = header['result']['height']
+            tip_height = last_height + self.confirmations - 1
+
+            rows = [self._row(entry, tip_height) for entry in listed['result']['transactions']]
+            with self._lock, self._db:
+                if fork is not None:
+                    self._db.execute(
+                        "UPDATE entries SET blockhash = NULL, blockheight = NULL, blockindex = NULL, blocktime = NULL"
+                        " WHERE blockheight > ?", (fork,)
+                    )
+                before = self._db.execute("SELECT count(*) FROM entries").fetchone()[0]
+                self._db.executemany(_UPSERT, rows)
+                added = self._db.execute("SELECT count(*) FROM entries").fetchone()[0] - before
+                self._set_meta('cursor', lastblock)
+                self._set_meta('cursor_height', last_height)
+                self._set_meta('tip_height', tip_height)
+
+        if fork is not None:
+            logger.warning("WalletIndex: reorg, cursor moved back to height %d", fork)
+        logger.debug("WalletIndex sync: %d entries, %d new, cursor %s", len(rows), added, lastblock)
+        return {
+            "result": {"entries": len(rows), "added": added, "reorg": fork, "cursor": lastblock, "height": last_height},
+            "errors": False,
+        }
+
+    def _fork_point(self, header: dict) -> dict:
+        """Walk back from a block off the best chain to the last one on it, result (hash, height)"""
+        for _ in range(_MAX_REORG_DEPTH):
+            previous = header.get('previousblockhash')
+            if previous is None:
+                break
+            answer = self.node.raw_call('getblockheader', [previous])
+            if answer.get('errors') is not None:
+                return {"result": None, "errors": answer.get('errors')}
+            header = answer['result']
+            if header.get('confirmations', 0) >= 0:
+                return {"result": (header['hash'], header['height']), "errors": False}
+        # Fork deeper than we walk: index everything again
+        return {"result": (None, -1), "errors": False}
+
+    @staticmethod
+    def _row(entry: dict, tip_height: int) -> dict:
+        confirmations = entry.get('confirmations', 0)
+        move_key = ''
+        if entry['category'] == 'move':  # No txid nor output
+            move_key = f"{entry.get('time', 0)}:{entry.get('account')}:{entry.get('otheraccount')}:{entry['amount']}"
+        return {
+            "txid": entry.get('txid', ''),
+            "category": entry['category'],
+            "vout": entry.get('vout', -1),
+            "move_key": move_key,
+            "address": entry.get('address'),
+            "account": entry.get('account'),
+            "otheraccount": entry.get('otheraccount'),
+            "label": entry.get('label'),
+            "amount": _satoshis(entry['amount']),
+            "fee": _satoshis(entry.get('fee')),
+            "blockhash": entry.get('blockhash') if confirmations > 0 else None,
+            "blockheight": tip_height - confirmations + 1 if confirmations > 0 else None,
+            "blockindex": entry.get('blockindex') if confirmations > 0 else None,
+            "blocktime": entry.get('blocktime') if confirmations > 0 else None,
+            "time": entry.get('time', 0),
+            "timereceived": entry.get('timereceived'),
+            "instantlock": bool(entry.get('instantlock')),
+            "conflicted": confirmations < 0,
+        }
+
+    # ┏━┓╻ ╻┏━╸┏━┓╻┏━╸┏━┓
+    # ┃┓┃┃ ┃┣╸ ┣┳┛┃┣╸ ┗━┓
+    # ┗┻┛┗━┛┗━╸╹┗╸╹┗━╸┗━┛
+    def _entries(self, where: str, params: tuple, order: str = "time DESC", limit: int | None = None,
+                 offset: int = 0) -> list[dict]:
+        sql = f"SELECT * FROM entries{f' WHERE {where}' if where else ''} ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        with self._lock:
+            tip = self._meta('tip_height')
+            rows = self._db.execute(sql, params).fetchall()
+        tip_height = None if tip is None else int(tip)
+        return [self._entry(row, tip_height) for row in rows]
+
+    @staticmethod
+    def _entry(row: sqlite3.Row, tip_height: int | None) -> dict:
+        entry = dict(row)
+        del entry["move_key"]
+        if entry["otheraccount"] is None:  # Only "move" entries have one
+            del entry["otheraccount"]
+        entry["amount"] = entry["amount"] / _COIN
+        if entry["fee"] is not None:
+            entry["fee"] = entry["fee"] / _COIN
+        entry["instantlock"] = bool(entry["instantlock"])
+        entry["conflicted"] = bool(entry["conflicted"])
+        if entry["conflicted"]:
+            entry["confirmations"] = -1
+        elif entry["blockheight"] is None or tip_height is None:
+            entry["confirmations"] = 0
+        else:
+            entry["confirmations"] = tip_height - entry["blockheight"] + 1
+        return entry
+
+    def transaction(self, txid: str) -> list[dict]:
+        """Entries of txid (one per output and category), empty if not in wallet"""
+        return self._entries("txid = ?", (txid,), order="category, vout")
+
+    def query(
+            self,
+            address: str | None = None,
+            category: str | None = None,
+            since: int | None = None,
+            until: int | None = None,
+            limit: int | None = None,
+            offset: int = 0,
+            newest_first: bool = True,
+    ) -> list[dict]:
+        """ Entries matching every given filter
+
+            category: send, receive, generate, immature, orphan, move...
+            since, until: transaction time range, seconds since epoch (until excluded)
+        """
+        conditions, params = [], []
+        for column, operator, value in (
+                ("address", "=", address), ("category", "=", category), ("time", ">=", since), ("time", "<", until)
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        order = "time DESC, txid" if newest_first else "time, txid"
+        return self._entries(" AND ".join(conditions), tuple(params), order=order, limit=limit, offset=offset)
+
+    def addresses(self) -> list[str]:
+        """Wallet addresses with indexed entries"""
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT address FROM entries WHERE address IS NOT NULL").fetchall()
+        return sorted(row[0] for row in rows)
+
+    def balance(self, address: str | None = None, confirmations: int = 1) -> float:
+        """ Sum of entries with at least confirmations
+
+            Whole index: amounts plus each transaction fee once (every send entry repeats its transaction fee).
+            One address: received minus sent amounts, fees belong to transactions, not addresses.
+        """
+        where, params = "conflicted = 0", []
+        with self._lock:
+            tip = self._meta('tip_height')
+            if tip is None:
+                return 0.0
+            if confirmations > 0:
+                where += " AND blockheight <= ?"
+                params.append(int(tip) - confirmations + 1)
+            if address is not None:
+                where += " AND address = ?"
+                params.append(address)
+            total = self._db.execute(f"SELECT coalesce(sum(amount), 0) FROM entries WHERE {where}", params).fetchone()[0]
+            if address is None:
+                total += self._db.execute(
+                    f"SELECT coalesce(sum(fee), 0) FROM (SELECT min(fee) AS fee FROM entries WHERE {where}"
+                    " AND fee IS NOT NULL GROUP BY txid)", params
+                ).fetchone()[0]
+        return total / _COIN
+
+    def stats(self) -> dict:
+        blockhash, height = self.cursor
+        with self._lock:
+            entries, transactions, unconfirmed = self._db.execute(
+                "SELECT count(*), count(DISTINCT txid), count(*) - count(blockheight) FROM entries"
+            ).fetchone()
+        return {
+            "entries": entries, "transactions": transactions, "unconfirmed": unconfirmed,
+            "cursor": blockhash, "cursor_height": height,
+        }
+
+    def close(self):
+        with self._sync_lock, self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,186 @@
+"""
+    Interceptors: ordered hooks around every call of a Node, AsyncNode or NodePool
+
+    Every method (getblock, masternodelist, batches...) goes through raw_call, so one chain sees all calls.
+    on_request hooks run in order, on_response / on_error hooks in reverse order (onion),
+    on_request can answer a call itself (cache, mock, rate limit rejection) and skip the node.
+
+        class Timing(Interceptor):
+            def on_request(self, call):
+                call.context["started"] = time.perf_counter()
+
+            def on_response(self, call, response):
+                print(call.method, time.perf_counter() - call.context["started"])
+                return response
+
+        node = Node(rpc_user="user", rpc_password="password", interceptors=[Timing()])
+        node.interceptors.append(OtherInterceptor())
+
+    With AsyncNode any hook may be a coroutine. An empty chain costs one truthiness check per call.
+"""
+from inspect import isawaitable
+from typing import Any, Awaitable, Callable, Iterable, Sequence
+
+__all__ = ['Call', 'Interceptor']
+
+
+class Call:
+    """ One call on its way through the chain, hooks may change method and params
+
+        batch: True for calls inside a batch request (return_binary, use_cache... do not apply)
+        context: free dict for hooks to share state between on_request and on_response
+    """
+    __slots__ = ('method', 'params', 'return_binary', 'use_cache', 'timeout', 'passthrough', 'batch', 'context')
+
+    def __init__(
+            self,
+            method: str,
+            params: Any = None,
+            return_binary: bool = False,
+            use_cache: bool = True,
+            timeout: float | None = None,
+            passthrough: bool | None = None,
+            batch: bool = False,
+    ):
+        self.method = method
+        self.params = params
+        self.return_binary = return_binary
+        self.use_cache = use_cache
+        self.timeout = timeout
+        self.passthrough = passthrough
+        self.batch = batch
+        self.context: dict = {}
+
+    def __repr__(self):
+        return f"Call(method={self.method!r}, params={self.params!r}, batch={self.batch!r})"
+
+
+class Interceptor:
+    """ Base interceptor, hooks do nothing, override the ones you need
+
+        on_request: before call is sent, return a response dict {"result":..., "errors":...} to answer it
+                    without node, or None to go on
+        on_response: after a successful call (errors is None), returns response (same or a new one)
+        on_error: after a failed call (transport or RPC error), returns response (same or a new one)
+    """
+
+    def on_request(self, call: Call) -> dict | None:
+        return None
+
+    def on_response(self, call: Call, response: dict) -> dict:
+        return response
+
+    def on_error(self, call: Call, response: dict) -> dict:
+        return response
+
+
+def _hook(interceptor: Interceptor, call: Call, response: dict):
+    if response.get('errors') is None:
+        return interceptor.on_response(call, response)
+    return interceptor.on_error(call, response)
+
+
+def run_request(interceptors: Sequence[Interceptor], call: Call) -> tuple[dict | None, int]:
+    """on_request hooks, returns (response if an interceptor answered, number of interceptors reached)"""
+    for index, interceptor in enumerate(interceptors):
+        response = interceptor.on_request(call)
+        if response is not None:
+            return response, index + 1
+    return None, len(interceptors)
+
+
+def run_response(interceptors: Sequence[Interceptor], reached: int, call: Call, response: dict) -> dict:
+    """on_response / on_error hooks of interceptors reached, last one first"""
+    for index in range(reached - 1, -1, -1):
+        response = _hook(interceptors[index], call, response)
+    return response
+
+
+def intercept(interceptors: Sequence[Interceptor], call: Call, send: Callable[[Call], dict]) -> dict:
+    """Run call through interceptors, send(call) reaches node"""
+    response, reached = run_request(interceptors, call)
+    if response is None:
+        response = send(call)
+    return run_response(interceptors, reached, call, response)
+
+
+def intercept_batch(interceptors: Sequence[Interceptor], calls: list, send: Callable[[list], Any]):
+    """ Run BatchCalls through interceptors, send(calls) fills response of calls not answered by a hook
+
+        Each batched call gets its own hooks, as if sent alone.
+    """
+    pending, wrapped = [], []
+    for batch_call in calls:
+        call = Call(batch_call.method, batch_call.params, batch=True)
+        response, reached = run_request(interceptors, call)
+        batch_call.method, batch_call.params = call.method, call.params
+        if response is None:
+            pending.append(batch_call)
+        else:
+            batch_call.response = response
+        wrapped.append((batch_call, call, reached))
+
+    if pending:
+        send(pending)
+
+    for batch_call, call, reached in wrapped:
+        batch_call.response = run_response(interceptors, reached, call, batch_call.response)
+
+
+async def _maybe_await(value):
+    return await value if isawaitable(value) else value
+
+
+async def run_request_async(interceptors: Sequence[Interceptor], call: Call) -> tuple[dict | None, int]:
+    for index, interceptor in enumerate(interceptors):
+        response = await _maybe_await(interceptor.on_request(call))
+        if response is not None:
+            return response, index + 1
+    return None, len(interceptors)
+
+
+async def run_response_async(interceptors: Sequence[Interceptor], reached: int, call: Call, response: dict) -> dict:
+    for index in range(reached - 1, -1, -1):
+        response = await _maybe_await(_hook(interceptors[index], call, response))
+    return response
+
+
+async def intercept_async(
+        interceptors: Sequence[Interceptor],
+        call: Call,
+        send: Callable[[Call], Awaitable[dict]]
+) -> dict:
+    """intercept() for AsyncNode, hooks may be coroutines"""
+    response, reached = await run_request_async(interceptors, call)
+    if response is None:
+        response = await send(call)
+    return await run_response_async(interceptors, reached, call, response)
+
+
+async def intercept_batch_async(
+        interceptors: Sequence[Interceptor],
+        calls: list,
+        send: Callable[[list], Awaitable[Any]]
+):
+    """intercept_batch() for AsyncNode"""
+    pending, wrapped = [], []
+    for batch_call in calls:
+        call = Call(batch_call.method, batch_call.params, batch=True)
+        response, reached = await run_request_async(interceptors, call)
+        batch_call.method, batch_call.params = call.method, call.params
+        if response is None:
+            pending.append(batch_call)
+        else:
+            batch_call.response = response
+        wrapped.append((batch_call, call, reached))
+
+    if pending:
+        await send(pending)
+
+    for batch_call, call, reached in wrapped:
+        batch_call.response = await run_response_async(interceptors, reached, call, batch_call.response)
+
+
+def chain(interceptors: Iterable[Interceptor] | None) -> list[Interceptor]:
+    """Interceptors argument of Node, AsyncNode and NodePool as a list (empty list: fast path)"""
+    return list(interceptors or ())
@@ -1,12 +1,28 @@
 """
 Custom Logger
+
+Importing the package does no logging setup: library loggers live under "boli_orbital_api" with a NullHandler,
+records go wherever the application configures logging. configure_logging() applies the bundled configuration
+(stdout and a log file in a logs directory) for scripts that want it.
+
+Hot paths log with %-style arguments, nothing is formatted while DEBUG is off.
+
+For high volume debug tracing, start_queue_logging() moves handlers (and formatting) of the package
+loggers to a background thread, optionally keeping a random sample of DEBUG records:
+
+    logging.getLogger("boli_orbital_api").setLevel(logging.DEBUG)
+    start_queue_logging(sample_rate=0.01)  # 1% of DEBUG records, every INFO and above
+    ...
+    stop_queue_logging()
 """
 import logging
 import logging.handlers
+import random
 from logging import config
 from pathlib import Path
+from queue import Full, Queue
 
-__all__ = ['setup_logger']
+__all__ = ['setup_logger', 'configure_logging', 'SamplingFilter', 'start_queue_logging', 'stop_queue_logging']
 
 
 class LevelOnlyFilter:
@@ -17,9 +33,8 @@ class LevelOnlyFilter:
         return record.levelno == self.level
 
 
-logs_dir = Path(__file__).resolve().parent / 'logs'
-logs_dir.mkdir(parents=True, exist_ok=True)
-LOG_FILE = Path(logs_dir / 'orbitalapi.log')
+# Default directory of configure_logging(), created only when it is called
+LOGS_DIR = Path(__file__).resolve().parent / 'logs'
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -50,7 +65,7 @@ LOGGING_CONFIG = {
         },
         "file_handler": {
             "class": "logging.FileHandler",
-            "filename": LOG_FILE,
+            "filename": None,  # Set by configure_logging
             "mode": "a",
             "level": "DEBUG",
             "formatter": "file_formatter",
@@ -59,7 +74,7 @@ LOGGING_CONFIG = {
             "class": "logging.handlers.RotatingFileHandler",
             'maxBytes': 2097152,  # 2Mb
             'backupCount': 5,
-            "filename": LOG_FILE,
+            "filename": None,  # Set by configure_logging
             "filters": ["only_warning"],
             "mode": "a",
             "level": "DEBUG",
@@ -95,15 +110,116 @@ LOGGING_CONFIG = {
 
 def setup_logger(name: str):
     """
-        Setup a logger using defaults
+        Logger of a library module, no global logging setup (see configure_logging)
     Args:
-        name:
+        name: module __name__
 
     Returns:
+        logging.Logger
+    """
+    package = logging.getLogger(__name__.rpartition('.')[0])
+    if not package.handlers:
+        package.addHandler(logging.NullHandler())
+    return logging.getLogger(name)
+
 
+def configure_logging(logs_dir: Path | str | None = None):
+    """ Apply bundled logging configuration (LOGGING_CONFIG), opt in
+
+        logs_dir: directory for orbitalapi.log, created if missing, defaults to LOGS_DIR
+        Replaces root logger handlers, call it from applications and scripts, never from libraries.
     """
+    logs_dir = LOGS_DIR if logs_dir is None else Path(logs_dir)
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    log_file = logs_dir / 'orbitalapi.log'
+
+    configuration = {**LOGGING_CONFIG, "handlers": {
+        name: {**handler, "filename": log_file} if "filename" in handler else handler
+        for name, handler in LOGGING_CONFIG["handlers"].items()
+    }}
+    config.dictConfig(configuration)
+
+
+class SamplingFilter(logging.Filter):
+    """ Keeps a random share (rate, 0 to 1) of records at level or below, more severe records always pass """
+
+    def __init__(self, rate: float, level: int = logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > self.level or random.random() < self.rate
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """ QueueHandler that leaves formatting to the listener thread and drops records when queue is full
+
+        Queue is in process, records are not pickled, so they are sent as they are.
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+# (logger, its handlers, its propagate, listener) while queue logging runs
+_queue_logging: tuple[logging.Logger, list, bool, logging.handlers.QueueListener] | None = None
+
+
+def _real_handlers(logger: logging.Logger) -> list[logging.Handler]:
+    """Handlers of logger, without the NullHandler setup_logger() adds to keep the package quiet"""
+    return [handler for handler in logger.handlers if not isinstance(handler, logging.NullHandler)]
+
+
+def start_queue_logging(
+        sample_rate: float = 1.0,
+        sample_level: int = logging.DEBUG,
+        max_queue: int = 10000,
+        name: str = 'boli_orbital_api',
+) -> logging.handlers.QueueListener:
+    """ Log records of logger name (and children) through a queue, handled in a background thread
+
+        Calling thread only puts records in a queue, handlers (stdout, files...) run in listener thread.
+        sample_rate: share of records at sample_level or below to keep, 1.0 keeps all
+        max_queue: records waiting to be handled, more are dropped instead of blocking callers
+
+        Handlers are the ones of logger name, or root handlers if it has none (NullHandler does not count).
+        Returns the listener.
+    """
+    global _queue_logging
+    stop_queue_logging()
 
-    config.dictConfig(LOGGING_CONFIG)
     logger = logging.getLogger(name)
+    handlers = _real_handlers(logger) or _real_handlers(logging.getLogger())
+    handler = _DeferredQueueHandler(Queue(max_queue))
+    if sample_rate < 1.0:
+        handler.addFilter(SamplingFilter(sample_rate, sample_level))
+
+    listener = logging.handlers.QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    _queue_logging = (logger, logger.handlers, logger.propagate, listener)
+    logger.handlers = [handler]
+    logger.propagate = False
+    listener.start()
+    return listener
+
 
-    return logger
+def stop_queue_logging():
+    """Handle records still queued and restore handlers, does nothing if queue logging is not running"""
+    global _queue_logging
+    if _queue_logging is None:
+        return
+    logger, handlers, propagate, listener = _queue_logging
+    _queue_logging = None
+    listener.stop()
+    logger.handlers = handlers
+    logger.propagate = propagate
@@ -0,0 +1,94 @@
+"""
+    RPC methods tables shared by Node features (caches, pools...)
+"""
+
+__all__ = ['call_name', 'READ_ONLY_CALLS', 'IDEMPOTENT_CALLS', 'DEFAULT_BUDGETS', 'DEFAULT_BUDGET']
+
+# Methods where first param is a subcommand, "masternode count" is not "masternode start-all"
+_SUBCOMMAND_METHODS = frozenset(('masternode', 'gobject', 'mnsync'))
+
+
+# Chain data reads, any synced replica answers the same (see call_name).
+# Wallet calls and node local state (getinfo balance, connections, masternode status, mnsync...) are not here,
+# they belong to one node.
+READ_ONLY_CALLS = frozenset((
+    'getblockhash',
+    'getblock',
+    'getbestblockhash',
+    'getblockheader',
+    'getblockcount',
+    'getblockchaininfo',
+    'getdifficulty',
+    'getgovernanceinfo',
+    'getrawtransaction',
+    'getrawmempool',
+    'decoderawtransaction',
+    'gobject get',
+    'gobject getvotes',
+    'gobject deserialize',
+    'gobject count',
+    'gobject list',
+    'masternode count',
+    'masternode current',
+    'masternode winner',
+    'masternode winners',
+    'masternodelist',
+    'help',
+))
+
+# Calls safe to send twice (retries): all chain reads plus wallet and node state reads.
+# Anything creating addresses, moving coins, locking outputs or changing node state is NOT here,
+# a timeout does not tell if node already did it.
+IDEMPOTENT_CALLS = READ_ONLY_CALLS | frozenset((
+    'getinfo',
+    'getwalletinfo',
+    'getbalance',
+    'getaddressesbyaccount',
+    'gettransaction',
+    'listtransactions',
+    'listsinceblock',
+    'validateaddress',
+    'getnetworkinfo',
+    'createrawtransaction',
+    'masternode status',
+    'masternode list-conf',
+    'masternode outputs',
+    'masternode genkey',
+    'mnsync status',
+))
+
+# Seconds a call may take, retries included, when no timeout or deadline is given (see Node.raw_call).
+# Cheap lookups fail fast, big blocks, lists and wallet scans get room.
+DEFAULT_BUDGET = 30.0
+DEFAULT_BUDGETS = {
+    'getblockcount': 5.0,
+    'getbestblockhash': 5.0,
+    'getblockhash': 5.0,
+    'getblockheader': 5.0,
+    'getdifficulty': 5.0,
+    'getinfo': 10.0,
+    'getnetworkinfo': 10.0,
+    'getblockchaininfo': 10.0,
+    'getgovernanceinfo': 10.0,
+    'validateaddress': 10.0,
+    'help': 10.0,
+    'getblock': 60.0,
+    'getrawtransaction': 30.0,
+    'getrawmempool': 30.0,
+    'listtransactions': 60.0,
+    'listsinceblock': 120.0,
+    'masternodelist': 60.0,
+    'gobject list': 60.0,
+    'gobject getvotes': 60.0,
+}
+
+
+def call_name(method: str, params: list | None = None) -> str:
+    """ Name used for per-method tables and policies
+
+        call_name("getblock", ["0000..."]) -> "getblock"
+        call_name("masternode", ["count", "enabled"]) -> "masternode count"
+    """
+    if method in _SUBCOMMAND_METHODS and params:
+        return f"{method} {params[0]}"
+    return method
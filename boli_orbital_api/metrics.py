@@ -0,0 +1,227 @@
+"""
+    Per method metrics: calls, errors, cache hits, bytes in/out and latency histograms
+
+    Disabled by default, a disabled Node only pays one None check per call.
+
+        node = Node(rpc_user="user", rpc_password="password", metrics=True)
+        node.getblockcount()
+        node.metrics.snapshot()   # {'getblockcount': {'calls': 1, 'errors': 0, 'p50_ms': 0.9, ...}}
+        node.metrics.prometheus(node="main")
+
+    Methods are named as in methods.call_name ("getblock", "masternode count"...).
+    Latency is measured around the node exchange, retries included, cache hits are only counted.
+
+    NodePool aggregates its nodes: pool.metrics_snapshot(), pool.prometheus_metrics()
+    serve_metrics() exposes Prometheus text format over HTTP for scraping.
+"""
+from bisect import bisect_left
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+__all__ = ['Metrics', 'DEFAULT_BUCKETS', 'merge_snapshots', 'prometheus_text', 'serve_metrics']
+
+# Latency histogram upper bounds, seconds. From a local node cache hit to a huge listsinceblock
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+_COUNTERS = ('calls', 'errors', 'cache_hits', 'bytes_out', 'bytes_in')
+
+
+def _le(bound: float) -> str:
+    """Prometheus "le" label of a bucket bound"""
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+class _MethodStats:
+    __slots__ = ('calls', 'errors', 'cache_hits', 'bytes_out', 'bytes_in', 'latency_sum', 'counts')
+
+    def __init__(self, buckets: int):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency_sum = 0.0
+        self.counts = [0] * (buckets + 1)  # Last one is +Inf, not cumulative
+
+
+class Metrics:
+    """ Counters and latency histogram per method, thread safe
+
+        buckets: histogram upper bounds in seconds, ascending
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self._methods: dict[str, _MethodStats] = {}
+
+    def _stats(self, method: str) -> _MethodStats:
+        stats = self._methods.get(method)
+        if stats is None:
+            stats = self._methods[method] = _MethodStats(len(self.buckets))
+        return stats
+
+    def observe(self, method: str, seconds: float, bytes_out: int = 0, bytes_in: int = 0, error: bool = False):
+        """Record one call sent to node"""
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._stats(method)
+            stats.calls += 1
+            stats.errors += error
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            stats.latency_sum += seconds
+            stats.counts[index] += 1
+
+    def cache_hit(self, method: str):
+        """Record one call answered by a cache"""
+        with self._lock:
+            self._stats(method).cache_hits += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        """ Copy of counters per method
+
+            histogram: cumulative counts by Prometheus "le" bound ("0.005", ..., "+Inf")
+            p50_ms/p99_ms: estimated from histogram (bucket upper bound), None without calls
+        """
+        bounds = [_le(bound) for bound in self.buckets] + ['+Inf']
+        with self._lock:
+            methods = {
+                method: (
+                    {name: getattr(stats, name) for name in _COUNTERS},
+                    stats.latency_sum,
+                    list(stats.counts)
+                )
+                for method, stats in self._methods.items()
+            }
+
+        snapshot = {}
+        for method, (counters, latency_sum, counts) in sorted(methods.items()):
+            cumulative, histogram = 0, {}
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                histogram[bound] = cumulative
+            snapshot[method] = _with_quantiles({**counters, "latency_sum": latency_sum, "histogram": histogram})
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+    def prometheus(self, node: str = '') -> str:
+        """Prometheus text format of this node metrics"""
+        return prometheus_text({node: self.snapshot()})
+
+
+def _quantile(histogram: dict[str, int], q: float) -> float | None:
+    """Upper bound (ms) of bucket holding quantile q, last finite bound when it is in +Inf"""
+    total = histogram.get('+Inf', 0)
+    if not total:
+        return None
+    rank = q * total
+    finite = None
+    for bound, cumulative in histogram.items():
+        if bound == '+Inf':
+            break
+        finite = float(bound)
+        if cumulative >= rank:
+            return finite * 1000
+    return None if finite is None else finite * 1000
+
+
+def _with_quantiles(stats: dict) -> dict:
+    stats["p50_ms"] = _quantile(stats["histogram"], 0.5)
+    stats["p99_ms"] = _quantile(stats["histogram"], 0.99)
+    return stats
+
+
+def merge_snapshots(snapshots: Iterable[dict[str, dict]]) -> dict[str, dict]:
+    """Sum snapshots of many nodes (same buckets) into one, per method"""
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for method, stats in snapshot.items():
+            total = merged.get(method)
+            if total is None:
+                merged[method] = {
+                    **{name: stats[name] for name in _COUNTERS},
+                    "latency_sum": stats["latency_sum"],
+                    "histogram": dict(stats["histogram"]),
+                }
+                continue
+            for name in (*_COUNTERS, "latency_sum"):
+                total[name] += stats[name]
+            for bound, cumulative in stats["histogram"].items():
+                total["histogram"][bound] = total["histogram"].get(bound, 0) + cumulative
+    return {method: _with_quantiles(merged[method]) for method in sorted(merged)}
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(snapshots: dict[str, dict[str, dict]], prefix: str = 'orbital_rpc') -> str:
+    """ Prometheus text exposition format (0.0.4) of snapshots by node name
+
+        prometheus_text({"main": node.metrics.snapshot(), "backup": other.metrics.snapshot()})
+    """
+    families = (
+        ('calls', 'counter', 'RPC calls sent to node', '_calls_total'),
+        ('errors', 'counter', 'RPC calls failed (transport or RPC error)', '_errors_total'),
+        ('cache_hits', 'counter', 'RPC calls answered by a cache', '_cache_hits_total'),
+        ('bytes_out', 'counter', 'Request bytes sent', '_sent_bytes_total'),
+        ('bytes_in', 'counter', 'Response bytes received', '_received_bytes_total'),
+    )
+    lines = []
+    for key, kind, help_text, suffix in families:
+        lines.append(f'# HELP {prefix}{suffix} {help_text}')
+        lines.append(f'# TYPE {prefix}{suffix} {kind}')
+        for node, snapshot in snapshots.items():
+            for method, stats in snapshot.items():
+                lines.append(f'{prefix}{suffix}{{node="{_label(node)}",method="{_label(method)}"}} {stats[key]}')
+
+    name = f'{prefix}_latency_seconds'
+    lines.append(f'# HELP {name} RPC call latency, retries included')
+    lines.append(f'# TYPE {name} histogram')
+    for node, snapshot in snapshots.items():
+        for method, stats in snapshot.items():
+            labels = f'node="{_label(node)}",method="{_label(method)}"'
+            for bound, cumulative in stats["histogram"].items():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {stats["latency_sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {stats["histogram"].get("+Inf", 0)}')
+    return '\n'.join(lines) + '\n'
+
+
+def serve_metrics(source: Callable[[], str], host: str = '127.0.0.1', port: int = 9464) -> 'ThreadingHTTPServer':
+    """ Serve source() as Prometheus text on http://host:port/metrics, in a daemon thread
+
+        server = serve_metrics(pool.prometheus_metrics, port=9464)
+        ...
+        server.shutdown()
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = source().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, name='orbital_metrics', daemon=True).start()
+    return server
@@ -0,0 +1,276 @@
+"""
+    Push notifications from bolivarcoind: blocknotify, walletnotify, instantsendnotify and alertnotify
+
+    bolivarcoind runs a command on each event, the command sends one datagram to a local UNIX socket
+    where NotifyListener dispatches typed events to callbacks and to caches of attached nodes.
+    No polling: callbacks run milliseconds after bolivarcoind sees a block.
+
+    bolivarcoin.conf:
+
+        blocknotify=python3 -m boli_orbital_api.notify /run/orbital/notify.sock block %s
+        walletnotify=python3 -m boli_orbital_api.notify /run/orbital/notify.sock wallet %s
+        instantsendnotify=python3 -m boli_orbital_api.notify /run/orbital/notify.sock instantsend %s
+        alertnotify=python3 -m boli_orbital_api.notify /run/orbital/notify.sock alert %s
+
+    Without Python on the node host any datagram sender works, "<kind> <value>" in ASCII:
+
+        blocknotify=sh -c 'printf "block %s" | socat - UNIX-SENDTO:/run/orbital/notify.sock'
+
+    Application:
+
+        listener = NotifyListener("/run/orbital/notify.sock", mode=0o666)
+        listener.attach(node)                       # Invalidates node.ttl_cache, stops its tip polling
+        listener.on(BlockEvent, lambda event: print(event.blockhash))
+        listener.start()
+        ...
+        listener.stop()
+"""
+import os
+import socket
+import sys
+import time
+from threading import Condition, Lock, Thread
+from typing import Any, Callable, NamedTuple
+
+from .logger import setup_logger
+
+__all__ = [
+    'NotifyListener',
+    'BlockEvent',
+    'WalletEvent',
+    'InstantSendEvent',
+    'AlertEvent',
+    'send_notification',
+]
+
+# LOGGER
+logger = setup_logger(__name__)
+
+# Datagrams are tiny ("block <64 hex>"), alerts are the longest
+_MAX_DATAGRAM = 4096
+
+
+class BlockEvent(NamedTuple):
+    """blocknotify: new best block"""
+    blockhash: str
+    received: float  # time.time() when listener got it
+
+
+class WalletEvent(NamedTuple):
+    """walletnotify: wallet transaction added or changed (mempool, then again when confirmed)"""
+    txid: str
+    received: float
+
+
+class InstantSendEvent(NamedTuple):
+    """instantsendnotify: InstantSend transaction locked"""
+    txid: str
+    received: float
+
+
+class AlertEvent(NamedTuple):
+    """alertnotify: node alert message"""
+    message: str
+    received: float
+
+
+_KINDS: dict[str, type] = {
+    'block': BlockEvent,
+    'wallet': WalletEvent,
+    'instantsend': InstantSendEvent,
+    'alert': AlertEvent,
+}
+
+Event = BlockEvent | WalletEvent | InstantSendEvent | AlertEvent
+
+
+def send_notification(path: str, kind: str, value: str):
+    """Send one notification datagram to a NotifyListener socket"""
+    if kind not in _KINDS:
+        raise ValueError(f"kind must be one of {', '.join(_KINDS)}")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.sendto(f'{kind} {value}'.encode(), path)
+
+
+class NotifyListener:
+    """ Receives bolivarcoind notifications on a UNIX datagram socket and dispatches them
+
+        path: socket path, a stale socket file left there is replaced
+        mode: permissions of socket file (bolivarcoind user must be able to write), None keeps umask ones
+
+        Callbacks run in listener thread, one event at a time, in registration order.
+        An exception in a callback is logged and does not stop the listener.
+    """
+
+    def __init__(self, path: str, mode: int | None = None):
+        self.path = path
+        self.mode = mode
+
+        self._lock = Lock()
+        self._callbacks: list[tuple[type | None, Callable[[Event], Any]]] = []
+        self._nodes: list = []  # (node, its tip_check_interval) for attached nodes
+        self._socket: socket.socket | None = None
+        self._thread: Thread | None = None
+        self._running = False
+        self._last: dict[type, Event] = {}
+        self._arrived = Condition(self._lock)
+        self._counters = {"received": 0, "invalid": 0, "callback_errors": 0}
+
+    def on(self, event_type: type | None, callback: Callable[[Event], Any]) -> Callable[[Event], Any]:
+        """Call callback(event) for every event of event_type (BlockEvent...), None for all events"""
+        if event_type is not None and event_type not in _KINDS.values():
+            raise ValueError(f"Unknown event type {event_type!r}")
+        with self._lock:
+            self._callbacks.append((event_type, callback))
+        return callback
+
+    def off(self, callback: Callable[[Event], Any]):
+        with self._lock:
+            self._callbacks = [entry for entry in self._callbacks if entry[1] is not callback]
+
+    def attach(self, node):
+        """ Keep caches of node (Node, AsyncNode, or every node of a NodePool) in sync with notifications
+
+            Block events report the new tip to node.ttl_cache, wallet and InstantSend events invalidate it
+            (getinfo carries wallet balance). TtlCache tip polling (getbestblockhash) is turned off while attached.
+        """
+        for target in getattr(node, 'nodes', [node]):
+            cache = getattr(target, 'ttl_cache', None)
+            with self._lock:
+                self._nodes.append((target, None if cache is None else cache.tip_check_interval))
+            if cache is not None:
+                cache.tip_check_interval = None
+
+    def detach(self, node):
+        """Stop updating caches of node, TtlCache tip polling is restored"""
+        targets = getattr(node, 'nodes', [node])
+        with self._lock:
+            detached = [entry for entry in self._nodes if entry[0] in targets]
+            self._nodes = [entry for entry in self._nodes if entry[0] not in targets]
+        for target, interval in detached:
+            cache = getattr(target, 'ttl_cache', None)
+            if cache is not None:
+                cache.tip_check_interval = interval
+
+    def start(self) -> 'NotifyListener':
+        """Bind socket and listen in a background thread"""
+        if self._thread is not None:
+            return self
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Stale socket of a previous run
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._socket.bind(self.path)
+        if self.mode is not None:
+            os.chmod(self.path, self.mode)
+        self._running = True
+        self._thread = Thread(target=self._run, name='orbital_notify', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop listening and remove socket file"""
+        if self._thread is None:
+            return
+        self._running = False
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+                sock.sendto(b'', self.path)  # Wakes recv
+        except OSError:
+            pass
+        self._thread.join()
+        self._thread = None
+        self._socket.close()
+        self._socket = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _run(self):
+        while self._running:
+            try:
+                datagram = self._socket.recv(_MAX_DATAGRAM)
+            except OSError:
+                return
+            if datagram:
+                self.dispatch(datagram)
+
+    def dispatch(self, datagram: bytes) -> Event | None:
+        """Parse and deliver one "<kind> <value>" notification, returns its event (None if invalid)"""
+        kind, _, value = datagram.decode(errors='replace').strip().partition(' ')
+        event_type = _KINDS.get(kind)
+        if event_type is None or not value:
+            with self._lock:
+                self._counters["invalid"] += 1
+            logger.warning("Invalid notification %.100r", datagram)
+            return None
+
+        event = event_type(value.strip(), time.time())
+        with self._lock:
+            self._counters["received"] += 1
+            callbacks = [callback for wanted, callback in self._callbacks if wanted is None or wanted is event_type]
+            nodes = [node for node, _ in self._nodes]
+            self._last[event_type] = event
+            self._arrived.notify_all()
+
+        for node in nodes:
+            cache = getattr(node, 'ttl_cache', None)
+            if cache is None:
+                continue
+            if event_type is BlockEvent:
+                # Unconditional: right after attach() cache may not know the tip yet, observe_tip() alone keeps
+                # serving results of the previous block
+                cache.invalidate()
+                cache.observe_tip(blockhash=event.blockhash)
+            elif event_type is not AlertEvent:
+                cache.invalidate()
+
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                with self._lock:
+                    self._counters["callback_errors"] += 1
+                logger.warning("Notification callback %r failed: %r", callback, e)
+        return event
+
+    def wait_for(self, event_type: type = BlockEvent, timeout: float | None = None) -> Event | None:
+        """Block until next event of event_type arrives, returns it, None on timeout"""
+        with self._lock:
+            last = self._last.get(event_type)
+            if self._arrived.wait_for(lambda: self._last.get(event_type) is not last, timeout):
+                return self._last[event_type]
+            return None
+
+    def last(self, event_type: type = BlockEvent) -> Event | None:
+        """Last event of event_type received, None if none yet"""
+        with self._lock:
+            return self._last.get(event_type)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "callbacks": len(self._callbacks), "nodes": len(self._nodes)}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """python -m boli_orbital_api.notify SOCKET KIND VALUE, for bolivarcoind *notify options"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 3 or argv[1] not in _KINDS:
+        print(f"usage: python -m boli_orbital_api.notify SOCKET {{{','.join(_KINDS)}}} VALUE", file=sys.stderr)
+        return 2
+    try:
+        send_notification(argv[0], argv[1], ' '.join(argv[2:]))
+    except OSError as e:  # Listener not running, never block or fail bolivarcoind
+        print(f"notify: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
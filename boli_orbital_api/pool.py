@@ -0,0 +1,496 @@
+"""
+    NodePool: many bolivarcoind replicas behind the same methods as Node
+
+    Chain reads (see methods.READ_ONLY_CALLS) go to the healthiest, lowest latency replica,
+    everything else (wallet, node local state) is pinned to primary.
+
+        pool = NodePool([
+            Node(rpc_user="user", rpc_password="password", server_ip="10.0.0.1", name="primary"),
+            Node(rpc_user="user", rpc_password="password", server_ip="10.0.0.2", name="replica1"),
+            Node(rpc_user="user", rpc_password="password", server_ip="10.0.0.3", name="replica2"),
+        ])
+        pool.getblock("0000...")       # Any replica
+        pool.sendtoaddress("b...", 1)  # Primary
+        pool.stats()
+
+    hedge=True: a chain read slower than its node p95 latency is sent to a second replica too,
+    first answer wins (pool.hedge_stats())
+
+"""
+import random
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from contextvars import copy_context
+from itertools import count
+from threading import Lock
+from time import monotonic
+from typing import Any, Iterable
+
+from .interceptors import Call, Interceptor, chain, intercept, intercept_batch
+from .logger import setup_logger
+from .methods import READ_ONLY_CALLS, call_name
+from .metrics import merge_snapshots, prometheus_text
+from .resilience import deadline
+from .rpc import (
+    VERSION,
+    Batch,
+    BatchCall,
+    Node,
+    _BlockChain,
+    _Fanout,
+    _Governance,
+    _Help,
+    _Masternode,
+    _Network,
+    _Transactions,
+    _Utils,
+    _Wallet,
+    _is_transport_error,
+    _passthrough,
+)
+from .stream import ResultStream
+
+__all__ = ['NodePool']
+
+# LOGGER
+logger = setup_logger(__name__)
+
+
+class _Member:
+    """Routing state of one node inside a NodePool"""
+    __slots__ = (
+        'node', 'ewma', 'updated', 'in_flight', 'failures', 'ejected_until', 'calls', 'errors',
+        'latencies', 'hedge_after', 'fresh_latencies'
+    )
+
+    def __init__(self, node: Node):
+        self.node = node
+        self.ewma: float | None = None  # Seconds, None until first answer
+        self.updated = 0.0  # monotonic time of last ewma update
+        self.in_flight = 0
+        self.failures = 0  # Consecutive transport failures
+        self.ejected_until: float | None = None
+        self.calls = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=256)  # Last successful latencies, seconds
+        self.hedge_after: float | None = None  # Latency quantile, None until enough samples
+        self.fresh_latencies = 0  # Samples since hedge_after was computed
+
+    def score(self, now: float, half_life: float) -> float:
+        """ Lower is better: expected latency by queue length, unknown nodes first
+
+            Old latencies fade (half_life seconds) so idle replicas get sampled again
+        """
+        if self.ewma is None:
+            return 0.0
+        return self.ewma * 0.5 ** ((now - self.updated) / half_life) * (self.in_flight + 1)
+
+
+class NodePool(
+    _Utils,
+    _Wallet,
+    _BlockChain,
+    _Network,
+    _Transactions,
+    _Governance,
+    _Masternode,
+    _Help,
+    _Fanout
+):
+    """ Load balancing and failover across nodes, same methods as Node
+
+        nodes: replicas, all serve chain reads
+        primary: node for wallet and node local calls, defaults to nodes[0]
+        max_failures: consecutive transport failures before a node is ejected
+        readmit_after: seconds an ejected node waits before receiving calls again
+        ewma_alpha: weight of last latency in the moving average
+        ewma_half_life: seconds for an unrefreshed latency to count half, so unused replicas are tried again
+        hedge: send a slow chain read to a second replica too, first answer wins
+        hedge_quantile: latency quantile of a node (last 256 calls) after which a read is hedged
+        hedge_min_samples: calls a node must answer before its reads are hedged
+        interceptors: hooks around every pool call, before routing (nodes run their own too), see interceptors.py
+
+        Replicas are picked by "power of two choices" on latency EWMA by calls in flight,
+        so load spreads over replicas while slow or busy ones get less work.
+        A failing read is retried on next replica, so is a batch of chain reads only (see batch()) and stream().
+
+        Hedging trades some extra load (about 1 - hedge_quantile of reads) for a shorter tail latency,
+        only chain reads are hedged, they are idempotent and any synced replica answers the same.
+    """
+
+    def __init__(
+            self,
+            nodes: list[Node],
+            primary: Node | None = None,
+            max_failures: int = 3,
+            readmit_after: float = 30.0,
+            ewma_alpha: float = 0.2,
+            ewma_half_life: float = 10.0,
+            hedge: bool = False,
+            hedge_quantile: float = 0.95,
+            hedge_min_samples: int = 20,
+            interceptors: Iterable[Interceptor] | None = None,
+    ):
+        if not nodes:
+            raise ValueError("NodePool needs at least one node")
+
+        self.primary = nodes[0] if primary is None else primary
+        if self.primary not in nodes:
+            nodes = [self.primary, *nodes]
+
+        self.max_failures = max_failures
+        self.readmit_after = readmit_after
+        self.ewma_alpha = ewma_alpha
+        self.ewma_half_life = ewma_half_life
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._hedge_counters = {"eligible": 0, "fired": 0, "won": 0}
+        self._hedge_executor: ThreadPoolExecutor | None = None
+        self.interceptors: list[Interceptor] = chain(interceptors)
+
+        self._members = [_Member(node) for node in nodes]
+        self._primary_member = self._members[nodes.index(self.primary)]
+        self._lock = Lock()
+        self._ids = count(1)
+        self.app_id = self.primary.app_id
+        self.name = 'NodePool'
+
+        self.pool_size = sum(node.pool_size for node in nodes)
+        self._executor_lock = Lock()
+
+    @property
+    def nodes(self) -> list[Node]:
+        return [member.node for member in self._members]
+
+    def _admitted(self) -> list[_Member]:
+        now = monotonic()
+        return [
+            member for member in self._members
+            if member.ejected_until is None or member.ejected_until <= now
+        ]
+
+    def _pick(self, exclude: tuple = ()) -> _Member | None:
+        """Best of two random admitted replicas"""
+        with self._lock:
+            candidates = [member for member in self._admitted() if member not in exclude]
+            if not candidates:
+                return None
+            if len(candidates) > 2:
+                candidates = random.sample(candidates, 2)
+            now = monotonic()
+            member = min(candidates, key=lambda candidate: candidate.score(now, self.ewma_half_life))
+            member.in_flight += 1
+            return member
+
+    def _done(self, member: _Member, started: float, failed: bool):
+        with self._lock:
+            member.in_flight -= 1
+            member.calls += 1
+            if failed:
+                member.errors += 1
+                member.failures += 1
+                if member.failures >= self.max_failures:
+                    member.ejected_until = monotonic() + self.readmit_after
+                    logger.warning("NodePool ejected %s for %ss", member.node.name, self.readmit_after)
+                return
+
+            now = monotonic()
+            latency = now - started
+            member.ewma = latency if member.ewma is None else (
+                self.ewma_alpha * latency + (1 - self.ewma_alpha) * member.ewma
+            )
+            member.updated = now
+            member.failures = 0
+            member.ejected_until = None
+
+            member.latencies.append(latency)
+            member.fresh_latencies += 1
+            if len(member.latencies) >= self.hedge_min_samples and (
+                    member.hedge_after is None or member.fresh_latencies >= 16
+            ):
+                ordered = sorted(member.latencies)
+                member.hedge_after = ordered[int(self.hedge_quantile * (len(ordered) - 1))]
+                member.fresh_latencies = 0
+
+    def _call_on(
+            self,
+            member: _Member,
+            method: str,
+            params,
+            return_binary: bool,
+            use_cache: bool,
+            timeout: float | None,
+            passthrough: bool | None
+    ) -> dict:
+        started = monotonic()
+        result = {"result": None, 'errors': 'Not called'}
+        try:
+            result = member.node.raw_call(
+                method,
+                params=params,
+                return_binary=return_binary,
+                use_cache=use_cache,
+                timeout=timeout,
+                passthrough=passthrough
+            )
+        finally:
+            self._done(member, started, _is_transport_error(result))
+        return result
+
+    def _hedged_call(self, member: _Member, exclude: tuple, *call) -> tuple[dict, tuple]:
+        """ Call member, if it takes longer than its hedge_after send same call to a second replica
+
+            Returns (first good answer, members used)
+        """
+        if member.hedge_after is None:
+            return self._call_on(member, *call), (member,)
+
+        with self._lock:
+            self._hedge_counters["eligible"] += 1
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='orbital_hedge')
+        executor = self._hedge_executor
+
+        first = executor.submit(copy_context().run, self._call_on, member, *call)
+        try:
+            return first.result(timeout=member.hedge_after), (member,)
+        except FutureTimeout:
+            pass
+
+        second_member = self._pick(exclude=(*exclude, member))
+        if second_member is None:
+            return first.result(), (member,)
+
+        with self._lock:
+            self._hedge_counters["fired"] += 1
+        second = executor.submit(copy_context().run, self._call_on, second_member, *call)
+
+        result = {"result": None, 'errors': 'Not called'}
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if not _is_transport_error(result):
+                    if future is second:
+                        with self._lock:
+                            self._hedge_counters["won"] += 1
+                    return result, (member, second_member)
+        return result, (member, second_member)
+
+    def raw_call(
+            self,
+            method: str,
+            params=None,
+            return_binary=False,
+            use_cache=True,
+            timeout: float | None = None,
+            passthrough: bool | None = None
+    ) -> Any:
+        """Route call: chain reads to best replica (with failover and optional hedging), anything else to primary"""
+        if self.interceptors:
+            return intercept(
+                self.interceptors,
+                Call(method, params, return_binary, use_cache, timeout, passthrough),
+                self._send_call
+            )
+        return self._route(method, params, return_binary, use_cache, timeout, passthrough)
+
+    def _send_call(self, call: Call) -> dict:
+        return self._route(call.method, call.params, call.return_binary, call.use_cache, call.timeout, call.passthrough)
+
+    def _route(
+            self,
+            method: str,
+            params,
+            return_binary: bool,
+            use_cache: bool,
+            timeout: float | None,
+            passthrough: bool | None
+    ) -> dict:
+        """raw_call past interceptors"""
+        call = (method, params, return_binary, use_cache, timeout, passthrough)
+        if call_name(method, params) not in READ_ONLY_CALLS:
+            with self._lock:
+                self._primary_member.in_flight += 1
+            return self._call_on(self._primary_member, *call)
+
+        tried = ()
+        result = {"result": None, 'errors': 'No nodes available'}
+        while (member := self._pick(exclude=tried)) is not None:
+            if self.hedge:
+                result, used = self._hedged_call(member, tried, *call)
+            else:
+                result, used = self._call_on(member, *call), (member,)
+            if not _is_transport_error(result):
+                return result
+            tried = (*tried, *used)
+        return result
+
+    def batch(self) -> Batch:
+        """New JSON-RPC batch request, sent to a replica (with failover) if all calls are chain reads, else to primary"""
+        return Batch(self)
+
+    def _send_batch(self, calls: list[BatchCall]):
+        if self.interceptors:
+            intercept_batch(self.interceptors, calls, self._post_batch)
+        else:
+            self._post_batch(calls)
+
+    def _post_batch(self, calls: list[BatchCall]):
+        """Chain reads only: best replica, retried on next one if it does not answer. Else primary, no retry"""
+        if any(call_name(call.method, call.params) not in READ_ONLY_CALLS for call in calls):
+            with self._lock:
+                self._primary_member.in_flight += 1
+            self._batch_on(self._primary_member, calls)
+            return
+
+        tried = ()
+        while (member := self._pick(exclude=tried)) is not None:
+            if not self._batch_on(member, calls):
+                return
+            tried = (*tried, member)
+        if not tried:
+            for call in calls:
+                call.response = {"result": None, 'errors': 'No nodes available'}
+
+    def _batch_on(self, member: _Member, calls: list[BatchCall]) -> bool:
+        """Send batch to member, True if it did not answer"""
+        started = monotonic()
+        failed = True
+        try:
+            member.node._send_batch(calls)
+            failed = any(_is_transport_error(call.response) for call in calls)
+        finally:
+            self._done(member, started, failed)
+        return failed
+
+    def stream(self, method: str, params=None, chunk_size: int = 65536, timeout: float | None = None) -> ResultStream:
+        """ Node.stream routed like raw_call: chain reads to best replica (failover, no hedging), else primary
+
+            Replica latency counts time to first byte, body download is up to consumer
+        """
+        if call_name(method, params) not in READ_ONLY_CALLS:
+            with self._lock:
+                self._primary_member.in_flight += 1
+            return self._stream_on(self._primary_member, method, params, chunk_size, timeout)
+
+        tried = ()
+        result = ResultStream((), errors='No nodes available')
+        while (member := self._pick(exclude=tried)) is not None:
+            result = self._stream_on(member, method, params, chunk_size, timeout)
+            if not isinstance(result.errors, str):
+                return result
+            tried = (*tried, member)
+        return result
+
+    def _stream_on(self, member: _Member, method: str, params, chunk_size: int, timeout: float | None) -> ResultStream:
+        started = monotonic()
+        result = ResultStream((), errors='Not called')
+        try:
+            result = member.node.stream(method, params, chunk_size=chunk_size, timeout=timeout)
+        finally:
+            self._done(member, started, isinstance(result.errors, str))
+        return result
+
+    def probe(self) -> bool:
+        """ Check every node now (see Node.probe), ejected nodes that answer are admitted again
+
+            Returns True if any node is online
+        """
+        online = False
+        for member in self._members:
+            if member.node.probe():
+                online = True
+                with self._lock:
+                    member.failures = 0
+                    member.ejected_until = None
+        return online
+
+    def fundrawtransaction(self, recipients_with_amounts: dict):
+        """Wallet operation, on primary, see Node.fundrawtransaction"""
+        return self.primary.fundrawtransaction(recipients_with_amounts)
+
+    @property
+    def is_online(self) -> bool:
+        """True if any node is online"""
+        return any(member.node.is_online for member in self._admitted())
+
+    @property
+    def all_node_info(self) -> dict:
+        """Primary node info, see Node.all_node_info"""
+        return self.primary.all_node_info
+
+    @property
+    def api_version(self) -> str:
+        return VERSION
+
+    def stats(self) -> list[dict]:
+        """Routing state per node"""
+        now = monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": member.node.name,
+                    "primary": member is self._primary_member,
+                    "admitted": member.ejected_until is None or member.ejected_until <= now,
+                    "latency_ewma_ms": None if member.ewma is None else member.ewma * 1000,
+                    "hedge_after_ms": None if member.hedge_after is None else member.hedge_after * 1000,
+                    "in_flight": member.in_flight,
+                    "calls": member.calls,
+                    "errors": member.errors,
+                }
+                for member in self._members
+            ]
+
+    def hedge_stats(self) -> dict:
+        """ Hedging counters
+
+            eligible: chain reads sent to a node with known latency quantile
+            fired: reads also sent to a second replica
+            won: reads answered first by second replica
+        """
+        with self._lock:
+            counters = dict(self._hedge_counters)
+        counters["fired_ratio"] = counters["fired"] / counters["eligible"] if counters["eligible"] else 0.0
+        return counters
+
+    def metrics_snapshot(self) -> dict[str, dict]:
+        """Per method metrics summed over nodes built with metrics enabled, see metrics.Metrics"""
+        return merge_snapshots(
+            member.node.metrics.snapshot() for member in self._members if member.node.metrics is not None
+        )
+
+    def prometheus_metrics(self) -> str:
+        """Prometheus text format, one series per node (node name, or ip:port when unnamed) and method"""
+        return prometheus_text({
+            member.node.name or f'{member.node.server_ip}:{member.node.rpc_port}': member.node.metrics.snapshot()
+            for member in self._members
+            if member.node.metrics is not None
+        })
+
+    @staticmethod
+    def passthrough():
+        """Context manager, every call inside returns result as raw JSON bytes, see Node.passthrough"""
+        return _passthrough()
+
+    @staticmethod
+    def deadline(seconds: float):
+        """Context manager, every call inside must finish within seconds, see Node.deadline"""
+        return deadline(seconds)
+
+    def close(self):
+        """Close all nodes"""
+        self._shutdown_executor()
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        for member in self._members:
+            member.node.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,158 @@
+"""
+    Retries, circuit breaker and deadlines for Node
+
+    RetryPolicy: jittered exponential backoff, only idempotent calls are retried (see methods.IDEMPOTENT_CALLS)
+    CircuitBreaker: after many consecutive failures calls fail fast until node looks alive again
+
+        node = Node(
+            rpc_user="user",
+            rpc_password="password",
+            retry_policy=RetryPolicy(max_attempts=4, base_delay=0.1, max_delay=2.0),
+            circuit_breaker=CircuitBreaker(failure_threshold=5, reset_timeout=10.0),
+        )
+        node.circuit_breaker.stats()
+
+    deadline: every call inside the block (retries included) must finish in time
+
+        with node.deadline(2.5):
+            node.getblockcount()
+            node.getblock("0000...")
+
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+from typing import Any, Iterator
+
+__all__ = ['RetryPolicy', 'CircuitBreaker', 'deadline', 'current_deadline']
+
+# monotonic() time current calls must finish by, per thread / asyncio task
+_deadline: ContextVar[float | None] = ContextVar('orbital_deadline', default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """ Calls inside share a deadline of seconds from now, nested deadlines keep the earliest
+
+        Yields the deadline (monotonic time)
+    """
+    at = monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < at:
+        at = current
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    """Deadline (monotonic time) set by deadline() for this thread / task, None if there is none"""
+    return _deadline.get()
+
+
+class RetryPolicy:
+    """ Jittered exponential backoff
+
+        max_attempts: total attempts, including first one
+        base_delay: seconds, upper bound of first wait, doubles every attempt
+        max_delay: max seconds to wait between attempts
+
+        "Full jitter": wait is random between 0 and the bound, so many clients do not retry in waves
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.1, max_delay: float = 2.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number attempt (0 based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+# Default retry_policy argument of Node / AsyncNode: every node gets its own RetryPolicy()
+_DEFAULT_RETRY_POLICY: Any = object()
+
+
+class CircuitBreaker:
+    """ Per node circuit breaker
+
+        failure_threshold: consecutive failures that open the breaker
+        reset_timeout: seconds open before one trial call is allowed (half open)
+
+        closed: calls go through
+        open: calls fail fast, node is not contacted
+        half_open: one trial call, success closes the breaker, failure opens it again
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._counters = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a call can go to node now"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self._counters["rejected"] += 1
+            return False
+
+    def record(self, success: bool):
+        """Report result of an allowed call"""
+        with self._lock:
+            if success:
+                self._counters["successes"] += 1
+                self._failures = 0
+                self._state = self.CLOSED
+                self._trial_in_flight = False
+                return
+
+            self._counters["failures"] += 1
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._counters["opened"] += 1
+                self._state = self.OPEN
+                self._opened_at = monotonic()
+                self._trial_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {"state": state, "consecutive_failures": self._failures, **self._counters}
@@ -16,15 +16,30 @@
     __url__: "https://orbital.center"
 
 """
-from typing import Any
-
-from orjson import dumps
-from requests import Response, exceptions as request_exceptions, post
-
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from inspect import isawaitable
+from itertools import count
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter, sleep, time
+from typing import Any, Iterable, Iterator
+
+from orjson import JSONDecodeError, dumps, loads
+from .cache import BlockCache, TtlCache
+from .interceptors import Call, Interceptor, chain, intercept, intercept_batch
 from .logger import setup_logger
+from .metrics import Metrics
+from .methods import DEFAULT_BUDGET, DEFAULT_BUDGETS, IDEMPOTENT_CALLS, call_name
+from .resilience import _DEFAULT_RETRY_POLICY, CircuitBreaker, RetryPolicy, current_deadline, deadline
+from .stream import ResultStream
+from .transport import RequestsTransport, SocketTransport, Transport, TransportError
 
 __all__ = [
     "Node",
+    "Batch",
+    "BatchCall",
     "GobjectListSignals",
     "GobjectListTypes",
     "MasternodeCountOptions",
@@ -39,6 +54,9 @@ VERSION = "0.9b17"
 # LOGGER
 logger = setup_logger(__name__)
 
+# Passthrough mode of current thread / asyncio task, see Node.passthrough()
+_passthrough_mode: ContextVar[bool] = ContextVar('orbital_passthrough', default=False)
+
 
 class GobjectListSignals:
     """See gobject_list()"""
@@ -91,6 +109,12 @@ class MnListModes:
 
 def _process_result(result):
     """Process results coming from RAW calls"""
+    if isinstance(result, BatchCall):  # Pending inside a Batch, processed later
+        return result
+
+    if isawaitable(result):  # AsyncNode raw_call
+        return _process_result_async(result)
+
     try:
         if result.get('result') is not None:  # OK
             return {"result": result.get('result'), 'errors': False}
@@ -101,6 +125,198 @@ def _process_result(result):
         return {"result": None, "errors": f'{e}'}
 
 
+async def _process_result_async(result):
+    return _process_result(await result)
+
+
+def _decode_response(
+        status_code: int,
+        content: bytes,
+        return_binary: bool = False,
+        passthrough: bool = False
+) -> dict:
+    """Decode a single JSON-RPC HTTP response into raw_call format"""
+    if status_code == 200:
+        if return_binary:
+            return {"result": content, 'errors': None}
+        if passthrough:
+            return _passthrough_response(content)
+        return {"result": loads(content)['result'], 'errors': None}
+
+    if passthrough:
+        return _passthrough_response(content)
+
+    decoded = loads(content)
+    return {"result": decoded['result'], 'errors': decoded['error']}
+
+
+_RESULT_PREFIX = b'{"result":'
+_ERROR_MEMBER = b',"error":'
+
+
+def _passthrough_response(content: bytes) -> dict:
+    """ Result as an untouched memoryview slice of content, for proxies forwarding node output
+
+        bitcoind writes {"result":<result>,"error":<error>,"id":<id>}: only the small tail is decoded,
+        result is never parsed. Other shapes fall back to a full decode with result encoded again.
+        The slice keeps whole content alive, call bytes() on it to keep only result.
+    """
+    if content.startswith(_RESULT_PREFIX):
+        end = content.rfind(_ERROR_MEMBER)
+        if end > 0:
+            try:
+                tail = loads(b'{' + content[end + 1:])
+            except JSONDecodeError:
+                tail = None
+            if isinstance(tail, dict) and 'error' in tail:
+                if tail['error'] is not None:
+                    return {"result": None, 'errors': tail['error']}
+                return {"result": memoryview(content)[len(_RESULT_PREFIX):end], 'errors': None}
+
+    decoded = loads(content)
+    if decoded.get('error') is not None:
+        return {"result": None, 'errors': decoded['error']}
+    return {"result": memoryview(dumps(decoded.get('result'))), 'errors': None}
+
+
+# bitcoind RPC_IN_WARMUP: node is still loading blocks/indexes
+_RPC_IN_WARMUP = -28
+
+
+def _is_transient(status_code: int, content: bytes) -> bool:
+    """Node answered but cannot serve now: HTTP work queue full (503) or still starting (RPC_IN_WARMUP)"""
+    if status_code == 503:
+        return True
+    if status_code == 500 and b'-28' in content:
+        try:
+            return loads(content)['error']['code'] == _RPC_IN_WARMUP
+        except (ValueError, KeyError, TypeError):
+            return False
+    return False
+
+
+# HTTP statuses where node did not serve the call: wrong credentials, work queue full
+_OFFLINE_STATUSES = frozenset((401, 503))
+
+
+def _node_answered(status_code: int) -> bool:
+    """Any JSON-RPC answer (errors too: 404 unknown method, 500 bad parameter...) means node is online"""
+    return status_code not in _OFFLINE_STATUSES
+
+
+def _call_deadline(budgets: dict[str, float], names: Iterable[str], timeout: float | None = None) -> float:
+    """ monotonic() time a call must finish by
+
+        timeout if given, else largest budget of called methods, never later than an enclosing deadline()
+    """
+    if timeout is None:
+        timeout = max(budgets.get(name, DEFAULT_BUDGET) for name in names)
+    at = monotonic() + timeout
+    enclosing = current_deadline()
+    return at if enclosing is None or at < enclosing else enclosing
+
+
+@contextmanager
+def _passthrough() -> Iterator[None]:
+    token = _passthrough_mode.set(True)
+    try:
+        yield
+    finally:
+        _passthrough_mode.reset(token)
+
+
+def _observe(metrics: Metrics, name: str, started: float, sent: int, response: tuple[int, bytes] | str):
+    """Record one node exchange started at perf_counter() time started"""
+    if isinstance(response, str):
+        metrics.observe(name, perf_counter() - started, sent, 0, True)
+    else:
+        metrics.observe(name, perf_counter() - started, sent, len(response[1]), response[0] != 200)
+
+
+def _observe_batch(metrics: Metrics, calls: list['BatchCall'], started: float, sent: int, received: int):
+    """Record every call of a batch with the batch latency, bytes shared evenly"""
+    seconds = perf_counter() - started
+    for call in calls:
+        metrics.observe(
+            call_name(call.method, call.params),
+            seconds,
+            sent // len(calls),
+            received // len(calls),
+            call.response is None or call.response.get('errors') is not None
+        )
+
+
+def _is_transport_error(response: dict | None) -> bool:
+    """Node did not answer (connection refused, timeout...), errors from node itself are dicts"""
+    return response is None or isinstance(response.get('errors'), str)
+
+
+def _fill_batch(calls: list['BatchCall'], responses: Any) -> bool:
+    """ Match a decoded batch response to its calls by request id
+
+        Returns False when node rejected the whole batch
+    """
+    if not isinstance(responses, list):
+        error = responses.get('error', True) if isinstance(responses, dict) else True
+        for call in calls:
+            call.response = {"result": None, 'errors': error}
+        return False
+
+    by_id = {item.get('id'): item for item in responses}
+    for call in calls:
+        item = by_id.get(call.id)
+        if item is None:
+            call.response = {"result": None, 'errors': f'No response for id {call.id}'}
+        else:
+            call.response = {"result": item.get('result'), 'errors': item.get('error')}
+    return True
+
+
+def _entry_key(entry: dict) -> tuple:
+    """ Identity of a listtransactions entry
+
+        "move" entries have no txid, vout nor address, they are told apart by time, accounts, amount and comment
+    """
+    if entry.get('category') == 'move':
+        return (
+            'move', entry.get('time'), entry.get('account'), entry.get('otheraccount'), entry.get('amount'),
+            entry.get('comment'),
+        )
+    return entry.get('txid'), entry.get('category'), entry.get('vout'), entry.get('address')
+
+
+def _batch_payload(calls: list['BatchCall']) -> bytes:
+    """Serialize calls as one JSON-RPC batch (JSON array)"""
+    return dumps([
+        {"jsonrpc": "2.0", "id": call.id, "method": call.method, "params": call.params}
+        for call in calls
+    ])
+
+
+class BatchCall:
+    """ A call queued inside a Batch
+
+        result is available after Batch.execute()
+    """
+    __slots__ = ('id', 'method', 'params', 'response')
+
+    def __init__(self, request_id: int, method: str, params: list):
+        self.id = request_id
+        self.method = method
+        self.params = params
+        self.response: dict | None = None
+
+    @property
+    def result(self) -> dict:
+        """Processed result, same format as any other method {"result":..., "errors":...}"""
+        if self.response is None:
+            return {"result": None, "errors": "Batch not executed"}
+        return _process_result(self.response)
+
+    def __repr__(self):
+        return f"BatchCall(id={self.id!r}, method={self.method!r}, params={self.params!r})"
+
+
 # ╻ ╻┏━┓╻  ╻  ┏━╸╺┳╸
 # ┃╻┃┣━┫┃  ┃  ┣╸  ┃
 # ┗┻┛╹ ╹┗━╸┗━╸┗━╸ ╹
@@ -553,6 +769,65 @@ class _Transactions:
             )
         )
 
+    def listsinceblock(
+            self,
+            blockhash: str = "",
+            target_confirmations: int = 1,
+            includewatchonly: bool = False
+    ) -> dict:
+        """
+            listsinceblock ( "blockhash" target-confirmations includeWatchonly)
+
+            Get all transactions in blocks since block [blockhash], or all transactions if omitted
+
+            Arguments:
+            1. "blockhash"            (string, optional) The block hash to list transactions since
+            2. target-confirmations:  (numeric, optional) The confirmations required, must be 1 or more
+            3. includeWatchonly:      (bool, optional, default=false) Include transactions to watchonly addresses (see 'importaddress')
+
+            Result:
+            {
+              "transactions": [
+                "account":"accountname",  (string) DEPRECATED. The account name associated with the transaction. Will be "" for the default account.
+                "address":"bolivarcoinaddress",  (string) The bolivarcoin address of the transaction. Not present for move transactions (category = move).
+                "category":"send|receive",  (string) The transaction category. 'send' has negative amounts, 'receive' has positive amounts.
+                "amount": x.xxx,          (numeric) The amount in BOLIVARCOIN. This is negative for the 'send' category, and for the 'move' category for moves
+                                                     outbound. It is positive for the 'receive' category, and for the 'move' category for inbound funds.
+                "vout" : n,               (numeric) the vout value
+                "fee": x.xxx,             (numeric) The amount of the fee in BOLIVARCOIN. This is negative and only available for the 'send' category of transactions.
+                "instantlock" : true|false, (bool) Current transaction lock state. Available for 'send' and 'receive' category of transactions.
+                "confirmations": n,       (numeric) The number of blockchain confirmations for the transaction. Available for 'send' and 'receive' category of transactions.
+                "blockhash": "hashvalue", (string) The block hash containing the transaction. Available for 'send' and 'receive' category of transactions.
+                "blockindex": n,          (numeric) The index of the transaction in the block that includes it. Available for 'send' and 'receive' category of transactions.
+                "blocktime": xxx,         (numeric) The block time in seconds since epoch (1 Jan 1970 GMT).
+                "txid": "transactionid",  (string) The transaction id. Available for 'send' and 'receive' category of transactions.
+                "time": xxx,              (numeric) The transaction time in seconds since epoch (Jan 1 1970 GMT).
+                "timereceived": xxx,      (numeric) The time received in seconds since epoch (Jan 1 1970 GMT). Available for 'send' and 'receive' category of transactions.
+                "comment": "...",         (string) If a comment is associated with the transaction.
+                "label" : "label"         (string) A comment for the address/transaction, if any
+                "to": "...",              (string) If a comment to is associated with the transaction.
+              ],
+              "lastblock": "lastblockhash"  (string) The hash of the last block
+            }
+
+            Examples:
+            > bolivarcoin-cli listsinceblock
+            > bolivarcoin-cli listsinceblock "000000000000000bacf66f7497b7dc45ef753ee9a7d38571037cdb1a57f663ad" 6
+            > curl --user myusername --data-binary '{"jsonrpc": "1.0", "id":"curltest", "method": "listsinceblock", "params": ["000000000000000bacf66f7497b7dc45ef753ee9a7d38571037cdb1a57f663ad", 6] }' -H 'content-type: text/plain;' http://127.0.0.1:14776/
+
+            "lastblock" is target-confirmations - 1 blocks below tip: passing it back as blockhash lists again the
+            transactions of the last target-confirmations - 1 blocks, so a reorg that deep is seen on next call.
+        """
+        return _process_result(
+            self.raw_call(
+                "listsinceblock", params=[
+                    blockhash,
+                    target_confirmations,
+                    includewatchonly
+                ]
+            )
+        )
+
 
 # ┏┳┓╻┏┓╻╻┏┓╻┏━╸
 # ┃┃┃┃┃┗┫┃┃┗┫┃╺┓
@@ -1101,6 +1376,22 @@ class _BlockChain:
         """
         return _process_result(self.raw_call("getblockcount"))
 
+    def getbestblockhash(self) -> dict:
+        """
+            getbestblockhash
+
+            Returns the hash of the best (tip) block in the longest block chain.
+
+            Result
+            "hex"      (string) the block hash hex encoded
+
+            Examples
+            > bolivarcoin-cli getbestblockhash
+            > curl --user myusername --data-binary '{"jsonrpc": "1.0", "id":"curltest", "method": "getbestblockhash", "params": [] }' -H 'content-type: text/plain;' http://127.0.0.1:14776/
+
+        """
+        return _process_result(self.raw_call("getbestblockhash"))
+
     def getblockchaininfo(self) -> dict:
         """
             getblockchaininfo
@@ -1157,6 +1448,282 @@ class _BlockChain:
         return _process_result(self.raw_call("getdifficulty"))
 
 
+class _Health:
+    """ Cached node health, shared by Node and AsyncNode
+
+        Every answer (or failure) from node updates it, so busy nodes never need extra probes
+    """
+    _valid_node: bool = False
+    _last_check: float | None = None  # monotonic
+    last_seen: float | None = None  # Unix time of last successful answer from node
+    health_interval: float = 30.0
+
+    def _set_health(self, online: bool):
+        self._valid_node = online
+        self._last_check = monotonic()
+        if online:
+            self.last_seen = time()
+
+    @property
+    def health_is_stale(self) -> bool:
+        """True when there is no news from node in last health_interval seconds"""
+        return self._last_check is None or monotonic() - self._last_check > self.health_interval
+
+
+class _Fanout:
+    """ Concurrent helpers over raw_call() and batch(), shared by Node and NodePool
+
+        Needs pool_size (max workers) and _executor_lock
+    """
+    pool_size: int = 10
+    _executor: ThreadPoolExecutor | None = None
+    _executor_lock: Lock
+
+    def map(self, method: str, params_list: Iterable, max_workers: int | None = None) -> list[dict]:
+        """ Call same method with many params concurrently, results in same order as params_list
+
+            Calls run in a thread pool over the shared connection pool (max_workers defaults to pool_size)
+
+            node.map("getblock", ["hash1", "hash2", ...])
+            node.map("getblock", [["hash1", False], ["hash2", False], ...])
+            # [{'result': ..., 'errors': False}, ...]
+        """
+        def call(params):
+            if not isinstance(params, (list, tuple)):
+                params = [params]
+            return _process_result(self.raw_call(method, params=list(params)))
+
+        def run(executor: ThreadPoolExecutor) -> list[dict]:
+            # Each call runs in a copy of caller context, so node.deadline() applies inside workers
+            futures = [executor.submit(copy_context().run, call, params) for params in params_list]
+            return [future.result() for future in futures]
+
+        if max_workers is not None:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='orbital_map') as executor:
+                return run(executor)
+
+        return run(self._get_executor())
+
+    def iter_blocks(
+            self,
+            start: int = 0,
+            end: int | None = None,
+            verbose: bool = True,
+            window: int = 200,
+            batch_size: int = 50
+    ) -> Iterator[dict]:
+        """ Walk blocks from height start to end (not included, like range), in height order
+
+            end: defaults to current block count (last block included)
+            verbose: same as getblock()
+            window: max blocks fetched ahead of consumer (in flight or waiting), bounds memory
+            batch_size: blocks per batch request, every batch is 2 round-trips (getblockhash, getblock)
+
+            Yields one {"result":..., "errors":...} per height
+
+            for block in node.iter_blocks(1000000, 1001000):
+                block['result']['height']
+        """
+        if end is None:
+            blockcount = self.getblockcount()
+            if blockcount['errors']:
+                yield blockcount
+                return
+            end = blockcount['result'] + 1
+
+        executor = self._get_executor()
+        in_flight = max(1, window // batch_size)
+        pending = deque()
+
+        try:
+            for height in range(start, end, batch_size):
+                pending.append(executor.submit(copy_context().run, self._fetch_blocks, range(height, min(height + batch_size, end)), verbose))
+                if len(pending) >= in_flight:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # Consumer stopped early (break, close(), exception): batches not started yet are dropped
+            for future in pending:
+                future.cancel()
+
+    def _fetch_blocks(self, heights: range, verbose: bool) -> list[dict]:
+        """getblockhash for all heights in one batch, then getblock for all hashes in one batch"""
+        with self.batch() as batch:
+            hashes = [batch.raw_call("getblockhash", params=[height]) for height in heights]
+
+        with self.batch() as batch:
+            blocks = [
+                batch.getblock(blockhash.result['result'], verbose) if blockhash.result['result'] else blockhash
+                for blockhash in hashes
+            ]
+
+        return [block.result for block in blocks]
+
+    def iter_transactions(
+            self,
+            account: str = "*",
+            include_watchonly: bool = False,
+            stop_at: str | None = None,
+            page_size: int = 100,
+            max_page_size: int = 5000,
+            target_seconds: float = 0.25,
+            max_page_bytes: int = 4_000_000,
+            overlap: int = 16
+    ) -> Iterator[dict]:
+        """ Walk wallet transactions newest first, over listtransactions pages
+
+            stop_at: txid where to stop (not yielded), for "everything new since X"
+            page_size: first page, next ones grow or shrink so one takes about target_seconds
+                and weighs less than max_page_bytes, up to max_page_size entries
+            overlap: entries of previous page asked again, transactions arriving while walking shift
+                offsets, entries already yielded are skipped
+
+            Next page is fetched while current one is consumed.
+            Yields one {"result": entry, "errors": False} per entry, a failed page yields its error and ends.
+
+            for tx in node.iter_transactions(stop_at=last_seen_txid):
+                tx['result']['txid']
+        """
+        executor = self._get_executor()
+        size = max(1, page_size)
+        offset = 0
+        pending = executor.submit(copy_context().run, self._fetch_transactions, account, size, offset, include_watchonly)
+        previous_keys: set = set()
+        shared = 0  # Entries next page shares with current one
+
+        try:
+            while pending is not None:
+                page_shared = shared
+                page, seconds, weight = pending.result()
+                if page['errors']:
+                    yield page
+                    return
+                entries = page['result'] or []
+
+                # Full page: more may follow, fetch next one (sized by this one) while this one is consumed
+                pending = None
+                if len(entries) == size:
+                    per_entry = max(seconds, 1e-6) / size
+                    next_size = int(min(
+                        max_page_size,
+                        size * 2,
+                        max(1.0, target_seconds / per_entry),
+                        max(1.0, max_page_bytes * size / max(weight, 1)),
+                    ))
+                    # Shared entries must fit in both pages, they are only checked against current one
+                    shared = min(overlap, size // 2, next_size // 2)
+                    offset += size - shared
+                    size = next_size
+                    pending = executor.submit(
+                        copy_context().run, self._fetch_transactions, account, size, offset, include_watchonly
+                    )
+
+                keys = set()
+                for entry in reversed(entries):  # Pages come oldest first
+                    key = _entry_key(entry)
+                    keys.add(key)
+                    if key in previous_keys:
+                        continue
+                    if stop_at is not None and entry.get('txid') == stop_at:
+                        return
+                    yield {"result": entry, 'errors': False}
+
+                if page_shared and not keys & previous_keys:
+                    logger.warning("iter_transactions: no overlap at offset %d, wallet entries may have been skipped", offset)
+                previous_keys = keys
+        finally:
+            # Consumer stopped early (stop_at, break, close()): prefetched page is not needed
+            if pending is not None:
+                pending.cancel()
+
+    def _fetch_transactions(self, account: str, count: int, skip: int, include_watchonly: bool) -> tuple[dict, float, int]:
+        """One listtransactions page, with seconds it took and its JSON size"""
+        started = perf_counter()
+        answer = self.raw_call(
+            "listtransactions", params=[account, count, skip, include_watchonly], use_cache=False, passthrough=True
+        )
+        seconds = perf_counter() - started
+        if answer.get('errors') is not None or answer.get('result') is None:
+            return {"result": None, 'errors': answer.get('errors') or True}, seconds, 0
+        return {"result": loads(answer['result']), 'errors': False}, seconds, len(answer['result'])
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='orbital_map')
+        return self._executor
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# ┏┓ ┏━┓╺┳╸┏━╸╻ ╻
+# ┣┻┓┣━┫ ┃ ┃  ┣━┫
+# ┗━┛╹ ╹ ╹ ┗━╸╹ ╹
+class Batch(
+    _Utils,
+    _Wallet,
+    _BlockChain,
+    _Network,
+    _Transactions,
+    _Governance,
+    _Masternode,
+    _Help
+):
+    """ JSON-RPC batch request
+
+        Collects calls and sends them to node as ONE JSON array POST (one round-trip).
+        Every method returns a BatchCall, its result is available after execute()
+
+        batch = node.batch()
+        blockhash = batch.getblockhash(1000)
+        info = batch.getinfo()
+        batch.execute()
+        info.result
+        # {'result': {...}, 'errors': False}
+
+        Or as context manager, executed on exit:
+        with node.batch() as batch:
+            info = batch.getinfo()
+
+        https://dashcore.readme.io/docs/core-api-ref-remote-procedure-calls#batch-requests
+    """
+
+    def __init__(self, node: 'Node'):
+        self._node = node
+        self.calls: list[BatchCall] = []
+
+    def raw_call(self, method: str, params=None, return_binary=False) -> BatchCall:
+        """Queue a call, return_binary is not supported inside a batch"""
+        call = BatchCall(next(self._node._ids), method, [] if params is None else params)
+        self.calls.append(call)
+        return call
+
+    def execute(self) -> dict:
+        """ Send all queued calls in one request
+
+            Returns {request id: {"result":..., "errors":...}}, errors are kept per call
+        """
+        if self.calls:
+            self._node._send_batch(self.calls)
+        return {call.id: call.result for call in self.calls}
+
+    def __len__(self):
+        return len(self.calls)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.execute()
+
+
 # ┏┓╻┏━┓╺┳┓┏━╸
 # ┃┗┫┃ ┃ ┃┃┣╸
 # ╹ ╹┗━┛╺┻┛┗━╸
@@ -1168,13 +1735,17 @@ class Node(
     _Transactions,
     _Governance,
     _Masternode,
-    _Help
+    _Help,
+    _Health,
+    _Fanout
 ):
     """ Main RPC/API Class
 
         Communicate with nodes via RPC
 
         BOLICOIN COMPATIBLE VERSION: v2.0.0.2-g
+
+        Construction does not touch the network, node is contacted on first call.
     """
 
     def __init__(
@@ -1189,7 +1760,37 @@ class Node(
             ticker: str = 'BOLI',
             is_masternode: bool = False,
             app_id: str = 'standard',
+            pool_size: int = 10,
+            connect_timeout: float | None = 10.0,
+            read_timeout: float | None = None,
+            keep_alive: bool = True,
+            block_cache: BlockCache | None = None,
+            ttl_cache: TtlCache | None = None,
+            health_interval: float = 30.0,
+            retry_policy: RetryPolicy | None = _DEFAULT_RETRY_POLICY,
+            circuit_breaker: CircuitBreaker | bool = True,
+            budgets: dict[str, float] | None = None,
+            transport: Transport | str | None = None,
+            metrics: Metrics | bool = False,
+            interceptors: Iterable[Interceptor] | None = None,
     ):
+        """
+            pool_size: Max number of pooled (keep-alive) connections to this node
+            connect_timeout: Seconds to wait for TCP connection, None waits forever
+            read_timeout: Seconds to wait for node response, None waits forever
+            keep_alive: Reuse connections between calls, False closes connection after every call
+            block_cache: Optional cache for immutable blocks and transactions, see BlockCache
+            ttl_cache: Optional cache for volatile chain state (getblockcount, getinfo...), see TtlCache
+            health_interval: Seconds is_online trusts last known state before probing node again
+            retry_policy: Backoff for transient failures of idempotent calls (see methods.IDEMPOTENT_CALLS), defaults
+                          to a new RetryPolicy() per node, None disables
+            circuit_breaker: True for a default CircuitBreaker, False disables, or your own CircuitBreaker
+            budgets: Seconds per method a call may take (retries included), over methods.DEFAULT_BUDGETS
+            transport: How requests reach node, a Transport, or 'requests' (default) / 'socket' to build
+                       RequestsTransport / SocketTransport from the arguments above, see transport.py
+            metrics: True for per method counters and latency histograms (node.metrics), or your own Metrics
+            interceptors: Hooks around every call, in order (node.interceptors list), see interceptors.py
+        """
 
         self.server_ip = server_ip
         self.rpc_port = rpc_port
@@ -1201,42 +1802,119 @@ class Node(
         self.ticker = ticker
         self.is_masternode = is_masternode
         self.app_id = f"Orbital_{app_id}"
+        self.block_cache = block_cache
+        self.ttl_cache = ttl_cache
+
+        # Transient failures: retries for idempotent calls, fail fast while node is down
+        if retry_policy is _DEFAULT_RETRY_POLICY:
+            retry_policy = RetryPolicy()
+        self.retry_policy: RetryPolicy | None = retry_policy
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker: CircuitBreaker | None = circuit_breaker or None
+        self.retries = 0
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+
+        # Disabled by default, then calls only check it is None
+        self.metrics: Metrics | None = Metrics() if metrics is True else metrics or None
+        self.interceptors: list[Interceptor] = chain(interceptors)
+
+        # Unique and monotonically increasing JSON-RPC ids, request payload is built per call (thread safe)
+        self._ids = count(1)
+
+        # Pooled HTTP session by default, one per Node
+        self._url = f'{self.scheme}://{self.server_ip}:{self.rpc_port}/'
+        self.pool_size = pool_size
+        if transport is None or transport == 'requests':
+            transport = RequestsTransport(
+                self._url,
+                auth=(self.rpc_user, self.rpc_password),
+                pool_size=pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                keep_alive=keep_alive,
+            )
+        elif transport == 'socket':
+            if scheme != 'http':
+                raise ValueError("transport='socket' supports http only, use transport='requests'")
+            transport = SocketTransport(
+                server_ip,
+                rpc_port,
+                rpc_user,
+                rpc_password,
+                pool_size=pool_size,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                keep_alive=keep_alive,
+            )
+        self.transport: Transport = transport
 
-        self._headers = {'content-type': 'text/plain;', }
-        self._data = {"jsonrpc": "2.0", "id": self.app_id, "method": ""}
+        # Thread pool for map(), created on first use
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = Lock()
 
         # save valid node state and error if exists
         self._valid_node: bool = False
         self._node_error: dict = {"error": None}
 
-        logger.debug(f"Version: {self.api_version}")
+        # Lazy connection: health is learnt from calls, probe() or background checks
+        self.health_interval = health_interval
+        self._health_thread: Thread | None = None
+        self._health_stop = Event()
+
+        logger.debug("Version: %s", VERSION)
 
-        # Check connection and test if a valid node
-        self._connect()
+    def probe(self) -> bool:
+        """Check node now (one getblockcount, never cached), returns and updates is_online"""
+        blockcount = self.raw_call("getblockcount", use_cache=False)
+        self._set_health(blockcount.get('result', None) is not None)
+        return self._valid_node
 
     def _check_online_status(self):
-        try:  # It will fail if not communication
-            blockcount = self.getblockcount()
-            if blockcount.get('result', None) is None:
-                return False
-            self._valid_node = True
-            return True
-        except:
-            self._valid_node = False
-            return False
+        return self.probe()
 
     def _connect(self):
         """
         Test connection with node and verify is a valid Node
         """
         logger.debug("Connecting node...")
-        self._check_online_status()
+        self.probe()
+
+    def start_health_checks(self, interval: float | None = None):
+        """ Probe node in a background thread every interval seconds (defaults to health_interval)
+
+            Calls made meanwhile count as checks, is_online never blocks while running
+        """
+        if self._health_thread is not None:
+            return
+        interval = self.health_interval if interval is None else interval
+        self._health_stop.clear()
+
+        def run():
+            while True:
+                if self._last_check is None or monotonic() - self._last_check >= interval:
+                    self.probe()
+                if self._health_stop.wait(interval):
+                    return
+
+        self._health_thread = Thread(target=run, name=f'orbital_health_{self.name}', daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self):
+        if self._health_thread is None:
+            return
+        self._health_stop.set()
+        self._health_thread.join()
+        self._health_thread = None
 
     def raw_call(
             self,
             method: str,
             params=None,
-            return_binary=False
+            return_binary=False,
+            use_cache=True,
+            timeout: float | None = None,
+            passthrough: bool | None = None
     ) -> Any:
         """ Rpc communication raw_call main method
 
@@ -1254,46 +1932,252 @@ class Node(
         {"result": response, 'errors': f'{e}'}
 
         return_binary: Some methods prefer use binary version instead JSON
+        use_cache: False always asks node (result is still cached)
+        timeout: Seconds for this call, retries included, defaults to method budget (see budgets, deadline())
+        passthrough: Result as raw JSON bytes (memoryview), defaults to passthrough() mode
 
         """
+        if self.interceptors:
+            return intercept(
+                self.interceptors,
+                Call(method, params, return_binary, use_cache, timeout, passthrough),
+                self._send_call
+            )
+        return self._raw_call(method, params, return_binary, use_cache, timeout, passthrough)
+
+    def _send_call(self, call: Call) -> dict:
+        return self._raw_call(
+            call.method, call.params, call.return_binary, call.use_cache, call.timeout, call.passthrough
+        )
+
+    def _raw_call(
+            self,
+            method: str,
+            params,
+            return_binary: bool,
+            use_cache: bool,
+            timeout: float | None,
+            passthrough: bool | None
+    ) -> dict:
+        """raw_call past interceptors: caches, metrics and node exchange"""
+        if passthrough is None:
+            passthrough = _passthrough_mode.get()
+        use_cache = use_cache and not (return_binary or passthrough)  # Caches hold decoded results
+
+        if self.ttl_cache is not None and use_cache and self.ttl_cache.is_cached(method, params):
+            if self.ttl_cache.tip_check_due():
+                self.raw_call("getbestblockhash")  # Invalidates ttl_cache on new block
+            cached = self.ttl_cache.lookup(method, params)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(call_name(method, params))
+                return cached
+
+        if self.block_cache is not None and use_cache:
+            cached = self.block_cache.lookup(method, params)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.cache_hit(call_name(method, params))
+                return cached
+
+        data = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": [] if params is None else params}
+
+        logger.debug("raw_call: method:%s params:%.200s", method, params)
+
+        name = call_name(method, params)
+        payload = dumps(data)
+        started = perf_counter()
+        response = self._exchange(payload, name in IDEMPOTENT_CALLS, _call_deadline(self.budgets, (name,), timeout))
+        if self.metrics is not None:
+            _observe(self.metrics, name, started, len(payload), response)
+        if isinstance(response, str):
+            logger.warning('%s raw_call %s failed: %s', self.name, method, response)
+            self._set_health(False)
+            return {"result": None, 'errors': response}
 
-        self._data["params"] = [] if params is None else params
+        try:
+            status, content = response
+            self._set_health(_node_answered(status))
+            result = _decode_response(status, content, return_binary, passthrough)
+            if not (return_binary or passthrough):
+                if self.ttl_cache is not None:
+                    self.ttl_cache.store(method, params, result)
+                if self.block_cache is not None:
+                    self.block_cache.store(method, params, result)
+            return result
+
+        except BaseException as e:
+            logger.warning("%s raw_call BaseException: %s", self.name, e)
+            self._set_health(False)
+            return {"result": None, 'errors': f'{e}'}
 
-        self._data["method"] = method
+    def _post(self, data: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        """ POST a serialized JSON-RPC request (single or batch) through transport
+
+            timeout: Seconds left, caps transport timeouts
+        """
+        return self.transport.request(data, timeout)
+
+    def _exchange(self, data: bytes, idempotent: bool, until: float) -> tuple[int, bytes] | str:
+        """ POST through circuit breaker, retrying transient failures when idempotent, before until (monotonic)
+
+            Returns node response (any HTTP status) or a transport error message.
+            Only transport failures and 503 (node overloaded) count as breaker failures,
+            RPC errors mean node is alive.
+        """
+        attempt = 0
+        while True:
+            remaining = until - monotonic()
+            if remaining <= 0:
+                return f'Deadline exceeded for {self.name or self._url}'
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+                return f'Circuit breaker open for {self.name or self._url}'
+
+            response: tuple[int, bytes] | str
+            try:
+                response = self._post(data, remaining)
+                if response[0] == 503:
+                    response = f'HTTP 503 {response[1][:100].decode(errors="replace")}'
+            except TransportError as e:
+                response = f'{e}'
+            except Exception as e:  # Malformed HTTP, a failing custom transport...
+                response = f'{e!r}'
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(not isinstance(response, str))
+
+            transient = isinstance(response, str) or _is_transient(*response)
+            if not transient or not idempotent or self.retry_policy is None \
+                    or attempt + 1 >= self.retry_policy.max_attempts:
+                return response
+
+            delay = self.retry_policy.delay(attempt)
+            if monotonic() + delay >= until:
+                return response
+            logger.debug("%s retry %d in %.3fs", self.name, attempt + 1, delay)
+            sleep(delay)
+            attempt += 1
+            self.retries += 1
+
+    def batch(self) -> Batch:
+        """New JSON-RPC batch request, see Batch"""
+        return Batch(self)
+
+    def stream(
+            self,
+            method: str,
+            params=None,
+            chunk_size: int = 65536,
+            timeout: float | None = None
+    ) -> ResultStream:
+        """ Call method and decode result while body downloads, one item at a time (see stream.ResultStream)
 
-        logger.debug(f"raw_call: method:{method} params:{params}")
+            For multi-megabyte results: masternodelist full, gobject list, listtransactions with big count...
+            Array results yield elements, object results yield (key, value) pairs.
+            Never cached or retried. Iterate it to the end, or close() it, to release the connection.
+
+            stream = node.stream("masternodelist", ["full"])
+            for outpoint, info in stream:
+                ...
+            stream.errors  # None when OK
+        """
+        data = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": [] if params is None else params}
+        until = _call_deadline(self.budgets, (call_name(method, params),), timeout)
+
+        logger.debug("stream: method:%s params:%.200s", method, params)
+
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            return ResultStream((), errors=f'Circuit breaker open for {self.name or self._url}')
 
-        response: Response = Response()
         try:
-            # print(self._data, dumps(self._data), sep="\n")
-            response = post(
-                url=f'{self.scheme}://{self.server_ip}:{self.rpc_port}/',
-                headers=self._headers,
-                data=dumps(self._data),
-                auth=(self.rpc_user, self.rpc_password)
-            )
+            status, chunks, close = self.transport.stream(dumps(data), until - monotonic(), chunk_size)
+        except Exception as e:
+            logger.warning('%s stream %s failed: %s', self.name, method, e)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(False)
+            self._set_health(False)
+            return ResultStream((), errors=f'{e}' if isinstance(e, TransportError) else f'{e!r}')
 
-            if response.status_code == 200:
-                self._valid_node = True
-                if return_binary:
-                    return {"result": response.content, 'errors': None}
-                else:
-                    return {"result": response.json()['result'], 'errors': None}
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record(status != 503)
+        self._set_health(_node_answered(status))
+        if status not in (200, 404, 500):  # Not a JSON-RPC answer
+            close()
+            return ResultStream((), errors=f'HTTP {status}')
 
-            else:
-                self._valid_node = False
-                return {"result": response.json()['result'], 'errors': response.json()['error']}
+        return ResultStream(chunks, close=close)
 
+    @staticmethod
+    def passthrough():
+        """ Context manager, every call inside (this thread) returns result as raw JSON bytes
 
-        except request_exceptions.RequestException as e:
-            logger.warning(f'{self.name} raw_call request_exceptions.RequestException error')
-            self._valid_node = False
-            return {"result": None, 'errors': f'{e}'}
+            Result is a memoryview slice of node response, never decoded, ready to forward.
+            Caches are skipped, batches are still decoded.
 
-        except BaseException as e:
-            logger.warning(f"{self.name} raw_call BaseException: {e}")
-            self._valid_node = False
-            return {"result": None, 'errors': f'{e}'}
+            with node.passthrough():
+                block = node.getblock("0000...")
+            block['result']  # <memory at 0x...>, bytes(block['result']) == b'{"hash":"0000...",...}'
+        """
+        return _passthrough()
+
+    @staticmethod
+    def deadline(seconds: float):
+        """ Context manager, every call inside (this thread) must finish within seconds, retries included
+
+            with node.deadline(2.5):
+                node.getblockcount()
+                node.getblock("0000...")
+        """
+        return deadline(seconds)
+
+    def _send_batch(self, calls: list[BatchCall]):
+        """ Send calls as one JSON array POST and fill every call.response
+
+            Responses are matched by request id, an error in one call does not affect others
+        """
+        if self.interceptors:
+            intercept_batch(self.interceptors, calls, self._post_batch)
+        else:
+            self._post_batch(calls)
+
+    def _post_batch(self, calls: list[BatchCall]):
+        """_send_batch past interceptors"""
+        caches = [cache for cache in (self.ttl_cache, self.block_cache) if cache is not None]
+        for cache in caches:
+            calls = cache.lookup_batch(calls)
+        if not calls:
+            return
+
+        logger.debug("_send_batch: %d calls", len(calls))
+
+        names = [call_name(call.method, call.params) for call in calls]
+        payload = _batch_payload(calls)
+        started = perf_counter()
+        response = self._exchange(
+            payload,
+            all(name in IDEMPOTENT_CALLS for name in names),
+            _call_deadline(self.budgets, names)
+        )
+        if isinstance(response, str):
+            logger.warning('%s _send_batch failed: %s', self.name, response)
+            self._set_health(False)
+            for call in calls:
+                call.response = {"result": None, 'errors': response}
+        else:
+            try:
+                self._set_health(_node_answered(response[0]))
+                _fill_batch(calls, loads(response[1]))
+                for cache in caches:
+                    cache.store_batch(calls)
+
+            except BaseException as e:
+                logger.warning("%s _send_batch BaseException: %s", self.name, e)
+                self._set_health(False)
+                for call in calls:
+                    call.response = {"result": None, 'errors': f'{e}'}
+
+        if self.metrics is not None:
+            _observe_batch(self.metrics, calls, started, len(payload), 0 if isinstance(response, str) else len(response[1]))
 
     # OBLIGATORIO ENTENDER PREREQUISITOS
     # https://github.com/BlockchainCommons/Learning-Bitcoin-from-the-Command-Line/blob/master/04_5_Sending_Coins_with_Automated_Raw_Transactions.md
@@ -1311,7 +2195,8 @@ class Node(
                 params=[
                     [],
                     recipients_with_amounts,
-                ]
+                ],
+                passthrough=False
             )
 
             if rawtransaction['errors'] is not None:
@@ -1327,7 +2212,8 @@ class Node(
         try:
             fund = self.raw_call(
                 method='fundrawtransaction',
-                params=[rawtransaction['result']]
+                params=[rawtransaction['result']],
+                passthrough=False
             )
 
             # print(f"fund {fund}")
@@ -1356,7 +2242,8 @@ class Node(
         try:
             decoded = self.raw_call(
                 method='decoderawtransaction',
-                params=[hex]
+                params=[hex],
+                passthrough=False
             )
             # print(f"decoded {decoded}")
 
@@ -1371,7 +2258,8 @@ class Node(
         try:
             signed = self.raw_call(
                 method='signrawtransaction',
-                params=[hex]
+                params=[hex],
+                passthrough=False
             )
 
             # print(f"signed {signed}")
@@ -1390,7 +2278,8 @@ class Node(
         try:
             sent = self.raw_call(
                 method='sendrawtransaction',
-                params=[signedhex]
+                params=[signedhex],
+                passthrough=False
             )
 
             # print(f"sent {sent}")
@@ -1412,37 +2301,35 @@ class Node(
             "errors": sent['errors']
         }
 
+    def close(self):
+        """Close transport (pooled connections, recordings...), stop map() workers and health checks"""
+        self.stop_health_checks()
+        self._shutdown_executor()
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     @property
     def is_online(self) -> bool:
-        self._check_online_status()
+        """Last known state, node is probed only when it is older than health_interval (and no background checks)"""
+        if self._health_thread is None and self.health_is_stale:
+            self.probe()
         return self._valid_node
 
     @property
     def all_node_info(self) -> dict:
-        """Execute three methods to get all status info about this node
-
-        TODO: Use multiple raw call (batch requests)
-            https://dashcore.readme.io/docs/core-api-ref-remote-procedure-calls#batch-requests
-            curl --user 'MNMIO34333:KSAJSHDSS' --data-binary '''
-              [
-                {
-                  "method": "getblockhash",
-                  "params": [0],
-                  "id": "foo"
-                },
-                {
-                  "method": "getinfo",
-                  "params": [1],
-                  "id": "foo2"
-                }
-              ]''' \
-              --header 'Content-Type: text/plain;' localhost:62026
-        """
-        return {
-            "getblockchaininfo": self.getblockchaininfo(),
-            "getnetworkinfo": self.getnetworkinfo(),
-            "getwalletinfo": self.getwalletinfo()
-        }
+        """Execute three methods to get all status info about this node, in one batch request (one round-trip)"""
+        with self.batch() as batch:
+            calls = {
+                "getblockchaininfo": batch.getblockchaininfo(),
+                "getnetworkinfo": batch.getnetworkinfo(),
+                "getwalletinfo": batch.getwalletinfo()
+            }
+        return {name: call.result for name, call in calls.items()}
 
     @property
     def api_version(self) -> str:
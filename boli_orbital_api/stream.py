@@ -0,0 +1,209 @@
+"""
+    Streaming decoder for big RPC results
+
+    A JSON-RPC response {"result": [...], "error": null, "id": 1} is decoded while it downloads,
+    one result item at a time: peak memory is one item, not the whole object graph.
+
+        stream = node.stream("masternodelist", ["full"])
+        for outpoint, info in stream:        # dict result: (key, value) pairs
+            ...
+        stream.errors                        # Known once stream is exhausted
+
+        for tx in node.stream("listtransactions", ["*", 100000]):  # list result: elements
+            ...
+
+"""
+import re
+from typing import Any, Callable, Iterable, Iterator
+
+from orjson import loads
+
+__all__ = ['ResultScanner', 'ResultStream']
+
+_STRUCTURAL = re.compile(rb'[\[\]{}",:]')
+_STRING_END = re.compile(rb'["\\]')
+
+
+class ResultScanner:
+    """ Incremental scanner of one JSON-RPC response object
+
+        feed() bytes as they arrive, it returns result items completed so far:
+        elements if result is an array, (key, value) pairs if result is an object.
+        Other members ("error", "id", a scalar "result") are kept in members.
+    """
+
+    def __init__(self):
+        self.members: dict[str, Any] = {}
+        self.kind: bytes | None = None  # b'[' or b'{' when result is streamed
+        self.done = False
+
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._member_start: int | None = None  # Top level "key": value being buffered
+        self._result_at: int | None = None  # Value start of "result", until we know if it is a container
+        self._streaming = False
+        self._item_start = 0
+
+    def feed(self, chunk: bytes) -> list:
+        """Scan next bytes of body, returns completed result items"""
+        buf = self._buf
+        buf += chunk
+        items = []
+        pos = self._pos
+
+        while pos < len(buf):
+            if self._in_string:
+                match = _STRING_END.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if buf[match.start()] == 0x5C:  # Backslash, skip escaped byte
+                    if match.start() + 1 >= len(buf):
+                        pos = match.start()
+                        break
+                    pos = match.start() + 2
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            index = match.start()
+            char = buf[index]
+            pos = index + 1
+
+            if char == 0x22:  # "
+                self._in_string = True
+                self._result_at = None
+                continue
+
+            depth = self._depth
+
+            if char == 0x5B or char == 0x7B:  # [ {
+                if depth == 0:
+                    self._member_start = pos
+                elif depth == 1 and self._result_at is not None and not buf[self._result_at:index].strip():
+                    self.kind = bytes((char,))
+                    self._streaming = True
+                    self._member_start = None
+                    self._item_start = pos
+                self._result_at = None
+                self._depth = depth + 1
+                continue
+
+            self._result_at = None
+
+            if char == 0x5D or char == 0x7D:  # ] }
+                self._depth = depth - 1
+                if depth == 2 and self._streaming:
+                    self._item(buf[self._item_start:index], items)
+                    self._streaming = False
+                elif depth == 1:
+                    self._member(buf, index)
+                    self.done = True
+                    pos = len(buf)
+                    break
+                continue
+
+            if char == 0x2C:  # ,
+                if depth == 2 and self._streaming:
+                    self._item(buf[self._item_start:index], items)
+                    self._item_start = pos
+                elif depth == 1:
+                    self._member(buf, index)
+                    self._member_start = pos
+                continue
+
+            # :
+            if depth == 1 and self._member_start is not None and loads(buf[self._member_start:index]) == 'result':
+                self._result_at = pos
+
+        # Drop consumed bytes, keep the item or member being buffered
+        if self._streaming:
+            keep = self._item_start
+        elif self._member_start is not None:
+            keep = self._member_start
+        else:
+            keep = pos
+        if self._result_at is not None:
+            keep = min(keep, self._result_at)
+        if keep:
+            del buf[:keep]
+            pos -= keep
+            self._item_start -= keep
+            if self._member_start is not None:
+                self._member_start -= keep
+            if self._result_at is not None:
+                self._result_at -= keep
+        self._pos = pos
+        return items
+
+    def _item(self, raw: bytearray, items: list):
+        if not raw.strip():
+            return
+        if self.kind == b'[':
+            items.append(loads(raw))
+        else:
+            items.append(next(iter(loads(b'{' + raw + b'}').items())))
+
+    def _member(self, buf: bytearray, end: int):
+        """Decode a buffered top level "key": value"""
+        if self._member_start is None:
+            return
+        raw = buf[self._member_start:end]
+        self._member_start = None
+        if raw.strip():
+            self.members.update(loads(b'{' + raw + b'}'))
+
+
+class ResultStream:
+    """ Iterator over items of one RPC result, decoded while body downloads
+
+        Array result: yields elements
+        Object result: yields (key, value) pairs
+        Scalar result: yields it once, null result yields nothing
+
+        errors: node or decode error, known once iteration is over (node sends "error" after "result")
+    """
+
+    def __init__(self, chunks: Iterable[bytes], close: Callable[[], Any] | None = None, errors: Any = None):
+        self.errors = errors
+        self._chunks = chunks if errors is None else ()
+        self._close = close
+        self._scanner = ResultScanner()
+
+    def __iter__(self) -> Iterator:
+        scanner = self._scanner
+        try:
+            for chunk in self._chunks:
+                yield from scanner.feed(chunk)
+                if scanner.done:
+                    break
+            if not scanner.done:
+                self.errors = self.errors or 'Incomplete response'
+            else:
+                self.errors = scanner.members.get('error')
+                result = scanner.members.get('result')
+                if scanner.kind is None and result is not None:
+                    yield result
+        except Exception as e:  # Bad JSON, connection lost while downloading...
+            self.errors = f'{e}'
+        finally:
+            self.close()
+
+    def close(self):
+        """Release connection, also done when iteration ends"""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
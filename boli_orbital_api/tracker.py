@@ -0,0 +1,346 @@
+"""
+    ChainTipTracker: one poller watching the best block for many consumers
+
+    N threads or tasks waiting for blocks cost one getbestblockhash stream, not N.
+    Polling adapts to block time: slow right after a block, fast once next block is due.
+    Reorgs are found by linking each new tip to the last known hashes.
+
+        tracker = ChainTipTracker(node)
+        tracker.start()
+
+        tip = tracker.wait_for_new_block(timeout=600)   # Any thread
+        tracker.on_block(lambda event: print(event.height, event.blockhash, event.reorg))
+
+        for event in tracker.blocks():                  # Every connected block, in order
+            ...
+        async for event in tracker.ablocks():           # asyncio
+            ...
+
+    With NotifyListener (blocknotify) or ZmqSubscriber, call tracker.poke() on their events to poll at once.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from threading import Condition, Event, Thread
+from typing import Any, AsyncIterator, Callable, Iterator, NamedTuple
+
+from .logger import setup_logger
+
+__all__ = ['ChainTipTracker', 'TipEvent']
+
+# LOGGER
+logger = setup_logger(__name__)
+
+
+class TipEvent(NamedTuple):
+    """ One block connected to best chain
+
+        reorg: blocks were disconnected before this one (only set on first block of the new branch)
+        disconnected: hashes of disconnected blocks, highest first
+    """
+    height: int
+    blockhash: str
+    previousblockhash: str | None
+    reorg: bool
+    disconnected: tuple[str, ...]
+    received: float  # time.time()
+    skipped: int = 0  # Blocks before this one never delivered (more than max_backfill missed)
+
+
+class ChainTipTracker:
+    """ Shared best block poller with reorg detection
+
+        node: Node or NodePool (sync)
+        block_time: expected seconds between blocks
+        min_interval: seconds between polls once a block is due
+        max_interval: seconds between polls right after a block
+        depth: recent blocks kept to find where a reorg forks
+        history: events kept for blocks() iterators that fall behind
+        max_backfill: max blocks delivered for one poll when more than depth arrived (long pause, deep reorg)
+
+        Blocks arriving faster than polls are all delivered, in order. A reorg deeper than depth disconnects
+        every known block and delivers the new branch from the lowest known height.
+
+        Callbacks run in poller thread, in order, an exception in one is logged and skipped.
+    """
+
+    def __init__(
+            self,
+            node: Any,
+            block_time: float = 180.0,
+            min_interval: float = 1.0,
+            max_interval: float = 30.0,
+            depth: int = 20,
+            history: int = 100,
+            max_backfill: int = 1000,
+    ):
+        self.node = node
+        self.block_time = block_time
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.depth = depth
+        self.max_backfill = max_backfill
+
+        self._recent: OrderedDict[int, str] = OrderedDict()  # height -> hash, best chain, ascending
+        self._events: deque[tuple[int, TipEvent]] = deque(maxlen=history)  # (sequence, event)
+        self._sequence = 0
+        self._last_block_at: float | None = None  # monotonic time a new tip was seen
+        self._changed = Condition()
+        self._callbacks: list[Callable[[TipEvent], Any]] = []
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread: Thread | None = None
+        self._counters = {"polls": 0, "blocks": 0, "reorgs": 0, "errors": 0}
+
+    @property
+    def tip(self) -> TipEvent | None:
+        """Last connected block, None until first poll"""
+        with self._changed:
+            return self._events[-1][1] if self._events else None
+
+    # ╺┳╸┏━┓┏━┓┏━╸╻┏ ╻┏┓╻┏━╸
+    #  ┃ ┣┳┛┣━┫┃  ┣┻┓┃┃┗┫┃╺┓
+    #  ╹ ╹┗╸╹ ╹┗━╸╹ ╹╹╹ ╹┗━┛
+    def poll(self) -> list[TipEvent]:
+        """Check best block now (poller does it), returns blocks connected since last poll"""
+        self._counters["polls"] += 1
+        best = self.node.raw_call('getbestblockhash', use_cache=False)
+        blockhash = best.get('result')
+        if best.get('errors') is not None or not blockhash:
+            self._counters["errors"] += 1
+            return []
+        if blockhash in self._recent.values():
+            return []  # Same tip, or a lagging replica behind a NodePool
+
+        # Walk back from new tip until a known block (fork point) or depth blocks
+        branch: list[tuple[int, str, str | None]] = []
+        cursor: str | None = blockhash
+        known = {value: height for height, value in self._recent.items()}
+        while cursor is not None and cursor not in known and len(branch) < self.depth:
+            header = self.node.raw_call('getblockheader', [cursor])
+            result = header.get('result')
+            if header.get('errors') is not None or not result:
+                self._counters["errors"] += 1
+                return []
+            branch.append((result['height'], cursor, result.get('previousblockhash')))
+            if not self._recent:
+                break  # First poll, tracking starts at tip
+            cursor = result.get('previousblockhash')
+        branch.reverse()
+
+        fork = known.get(cursor) if cursor is not None else None
+        skipped = 0
+        if fork is None and self._recent:
+            # Walk ended before a known block: many new blocks, or a reorg deeper than depth.
+            # Best chain hashes at known heights tell which known blocks are still there.
+            heights = sorted(self._recent, reverse=True)
+            hashes = self._block_hashes(heights)
+            if hashes is None:
+                return []
+            fork = next((height for height, value in zip(heights, hashes) if self._recent[height] == value), None)
+            if fork is None:  # All known blocks left the best chain, fork is below them
+                fork = heights[-1] - 1
+
+            # Blocks between fork and walked branch, by height
+            missing = range(fork + 1, branch[0][0])
+            if len(missing) > self.max_backfill:
+                skipped = len(missing) - self.max_backfill
+                missing = missing[skipped:]
+            hashes = self._block_hashes(missing)
+            if hashes is None:
+                return []
+            previous = self._recent.get(missing.start - 1)
+            filled = []
+            for height, value in zip(missing, hashes):
+                filled.append((height, value, previous))
+                previous = value
+            if filled and filled[-1][1] != branch[0][2]:
+                self._counters["errors"] += 1
+                return []  # Best chain changed while asking, next poll sees it settled
+            branch = filled + branch
+
+        if fork is None:
+            disconnected = () if not self._recent else tuple(reversed(self._recent.values()))
+            self._recent.clear()
+        else:
+            disconnected = tuple(self._recent[height] for height in reversed(self._recent) if height > fork)
+            for height in [height for height in self._recent if height > fork]:
+                del self._recent[height]
+
+        now = time.time()
+        events = []
+        for index, (height, connected, previous) in enumerate(branch):
+            first = index == 0
+            reorg = first and bool(disconnected)
+            events.append(TipEvent(
+                height, connected, previous, reorg, disconnected if reorg else (), now, skipped if first else 0
+            ))
+            self._recent[height] = connected
+        while len(self._recent) > self.depth:
+            self._recent.popitem(last=False)
+
+        self._publish(events)
+        return events
+
+    def _block_hashes(self, heights) -> list[str] | None:
+        """Best chain hashes at heights, in one batch, None on errors"""
+        if not heights:
+            return []
+        with self.node.batch() as batch:
+            calls = [batch.getblockhash(height) for height in heights]
+        hashes = [call.result['result'] for call in calls]
+        if not all(hashes):
+            self._counters["errors"] += 1
+            return None
+        return hashes
+
+    def _publish(self, events: list[TipEvent]):
+        if not events:
+            return
+        self._last_block_at = time.monotonic()
+        self._counters["blocks"] += len(events)
+        self._counters["reorgs"] += sum(event.reorg for event in events)
+        if events[0].reorg:
+            logger.warning(
+                "Reorg at height %d: %d blocks disconnected", events[0].height, len(events[0].disconnected)
+            )
+
+        with self._changed:
+            for event in events:
+                self._sequence += 1
+                self._events.append((self._sequence, event))
+            self._changed.notify_all()
+            callbacks = list(self._callbacks)
+            waiters = list(self._async_waiters)
+
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:  # Loop closed
+                self._async_waiters.discard((loop, waiter))
+
+        for event in events:
+            for callback in callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.warning("Tip callback %r failed: %r", callback, e)
+
+    def interval(self) -> float:
+        """Seconds until next poll: half the expected time left before next block, within limits"""
+        if self._last_block_at is None:
+            return self.min_interval
+        remaining = self.block_time - (time.monotonic() - self._last_block_at)
+        return min(self.max_interval, max(self.min_interval, remaining / 2))
+
+    # ┏━┓┏━┓╻  ╻  ┏━╸┏━┓
+    # ┣━┛┃ ┃┃  ┃  ┣╸ ┣┳┛
+    # ╹  ┗━┛┗━╸┗━╸┗━╸╹┗╸
+    def start(self) -> 'ChainTipTracker':
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name='orbital_tip_tracker', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        with self._changed:
+            self._thread = None
+            self._changed.notify_all()  # Ends blocks() iterators
+            waiters = list(self._async_waiters)
+        for loop, waiter in waiters:  # Ends ablocks() iterators
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                pass
+
+    def poke(self):
+        """Poll now, e.g. on a blocknotify or ZMQ hashblock event"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:  # Unexpected answer shape, keep tracking
+                self._counters["errors"] += 1
+                logger.warning("ChainTipTracker poll failed: %r", e)
+            self._wake.wait(self.interval())
+            self._wake.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # ┏━╸┏━┓┏┓╻┏━┓╻ ╻┏┳┓┏━╸┏━┓┏━┓
+    # ┃  ┃ ┃┃┗┫┗━┓┃ ┃┃┃┃┣╸ ┣┳┛┗━┓
+    # ┗━╸┗━┛╹ ╹┗━┛┗━┛╹ ╹┗━╸╹┗╸┗━┛
+    def on_block(self, callback: Callable[[TipEvent], Any]) -> Callable[[TipEvent], Any]:
+        """Call callback(event) for every connected block"""
+        with self._changed:
+            self._callbacks.append(callback)
+        return callback
+
+    def off(self, callback: Callable[[TipEvent], Any]):
+        with self._changed:
+            self._callbacks = [registered for registered in self._callbacks if registered is not callback]
+
+    def wait_for_new_block(self, timeout: float | None = None) -> TipEvent | None:
+        """Block until tip changes, returns new tip, None on timeout"""
+        with self._changed:
+            sequence = self._sequence
+            if not self._changed.wait_for(lambda: self._sequence != sequence, timeout):
+                return None
+            return self._events[-1][1]
+
+    def _since(self, sequence: int) -> tuple[int, list[TipEvent]]:
+        """Events after sequence (oldest are lost if consumer is more than history behind)"""
+        events = [event for number, event in self._events if number > sequence]
+        return self._sequence, events
+
+    def blocks(self, timeout: float | None = None) -> Iterator[TipEvent]:
+        """Every block connected from now on, in order, until stop() or timeout seconds without blocks"""
+        with self._changed:
+            sequence = self._sequence
+        while self._thread is not None:
+            with self._changed:
+                if not self._changed.wait_for(lambda: self._sequence != sequence or self._thread is None, timeout):
+                    return
+                sequence, events = self._since(sequence)
+            yield from events
+
+    async def ablocks(self) -> AsyncIterator[TipEvent]:
+        """blocks() for asyncio, woken by poller thread (no thread per consumer)"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._changed:
+            sequence = self._sequence
+            self._async_waiters.add(waiter)
+        try:
+            while self._thread is not None:
+                await waiter[1].wait()
+                waiter[1].clear()
+                with self._changed:
+                    sequence, events = self._since(sequence)
+                for event in events:
+                    yield event
+        finally:
+            with self._changed:
+                self._async_waiters.discard(waiter)
+
+    def stats(self) -> dict:
+        tip = self.tip
+        return {
+            **self._counters,
+            "height": None if tip is None else tip.height,
+            "next_poll_in": self.interval(),
+            "consumers": len(self._callbacks) + len(self._async_waiters),
+        }
@@ -0,0 +1,508 @@
+"""
+    Transports: how Node sends a JSON-RPC body to bolivarcoind and gets the HTTP answer back
+
+    RequestsTransport: pooled keep-alive requests.Session (default)
+    SocketTransport: minimal keep-alive HTTP/1.1 over raw sockets, less per-call overhead, optional pipelining
+    RecordingTransport: wraps another transport and records every call to a compact file
+    ReplayTransport: answers from a recording, no node needed, at full speed or at recorded timing
+
+        # Record production traffic
+        node = Node(rpc_user="user", rpc_password="password")
+        node.transport = RecordingTransport(node.transport, "traffic.rec")
+        ...
+        node.close()  # Flushes recording
+
+        # Replay it on a laptop
+        node = Node(transport=ReplayTransport("traffic.rec", speed=1.0))
+        node.getblock("0000...")
+
+"""
+import gzip
+import socket
+import struct
+import time
+from collections import defaultdict
+from itertools import count
+from threading import Lock
+from typing import Callable, Iterator, NamedTuple
+
+from orjson import JSONDecodeError, dumps, loads
+
+from ._http import build_request_head, parse_response_head, request_bytes
+
+__all__ = [
+    'Transport',
+    'TransportError',
+    'RequestsTransport',
+    'SocketTransport',
+    'RecordingTransport',
+    'ReplayTransport',
+    'Record',
+    'read_recording',
+]
+
+
+class TransportError(ConnectionError):
+    """Node could not be reached or did not answer (refused, reset, timeout...)"""
+
+
+class Transport:
+    """ Base transport, subclasses implement request()
+
+        request(): POST body, returns (HTTP status, body), raises TransportError when node does not answer.
+        Any HTTP status is returned, bitcoind uses 500 for RPC errors and 503 when its work queue is full.
+    """
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        """ POST body
+
+            timeout: seconds left for the whole call, None uses transport defaults
+        """
+        raise NotImplementedError
+
+    def stream(
+            self,
+            body: bytes,
+            timeout: float | None = None,
+            chunk_size: int = 65536
+    ) -> tuple[int, Iterator[bytes], Callable[[], None]]:
+        """POST body, returns (HTTP status, body chunks, close), default reads whole body first"""
+        status, content = self.request(body, timeout)
+        return status, iter((content,)), lambda: None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """ Pooled keep-alive HTTP session (requests)
+
+        requests is imported by the first RequestsTransport, not with the package
+        pool_size: max pooled connections
+        connect_timeout, read_timeout: seconds, None waits forever, a call timeout caps both
+        keep_alive: False closes connection after every call
+    """
+
+    def __init__(
+            self,
+            url: str,
+            auth: tuple[str | None, str | None] | None = None,
+            pool_size: int = 10,
+            connect_timeout: float | None = 10.0,
+            read_timeout: float | None = None,
+            keep_alive: bool = True,
+    ):
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+        from requests.exceptions import RequestException
+
+        self.url = url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._errors = RequestException
+
+        self._session = Session()
+        self._session.mount(url.split('://', 1)[0] + '://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self._session.headers.update({'content-type': 'text/plain;'})
+        if not keep_alive:
+            self._session.headers['connection'] = 'close'
+        self._session.auth = auth
+
+    def _timeouts(self, timeout: float | None) -> tuple[float | None, float | None]:
+        connect_timeout, read_timeout = self.connect_timeout, self.read_timeout
+        if timeout is not None:
+            connect_timeout = timeout if connect_timeout is None else min(connect_timeout, timeout)
+            read_timeout = timeout if read_timeout is None else min(read_timeout, timeout)
+        return connect_timeout, read_timeout
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        try:
+            response = self._session.post(url=self.url, data=body, timeout=self._timeouts(timeout))
+            return response.status_code, response.content
+        except self._errors as e:
+            raise TransportError(f'{e}') from e
+
+    def stream(self, body: bytes, timeout: float | None = None, chunk_size: int = 65536):
+        try:
+            response = self._session.post(url=self.url, data=body, timeout=self._timeouts(timeout), stream=True)
+        except self._errors as e:
+            raise TransportError(f'{e}') from e
+        return response.status_code, response.iter_content(chunk_size), response.close
+
+    def close(self):
+        self._session.close()
+
+
+class _Connection:
+    """One keep-alive socket with its buffered reader"""
+    __slots__ = ('sock', 'reader')
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = sock.makefile('rb', buffering=65536)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class SocketTransport(Transport):
+    """ Minimal keep-alive HTTP/1.1 client over raw sockets
+
+        Requests to bolivarcoind are always a small POST to "/": request head (auth included) is built once,
+        a call is one sendall() and a buffered read, no hooks, adapters or header merging.
+        Plain HTTP only, use RequestsTransport for https.
+
+        pool_size: max idle connections kept for reuse, one connection per call in flight
+        connect_timeout, read_timeout: seconds, None waits forever, a call timeout caps both
+        keep_alive: False asks node to close connection after every call, and never reuses it
+
+        request_many(): HTTP pipelining, many requests written at once on one connection
+    """
+
+    def __init__(
+            self,
+            host: str = '127.0.0.1',
+            port: int = 3563,
+            rpc_user: str | None = None,
+            rpc_password: str | None = None,
+            pool_size: int = 10,
+            connect_timeout: float | None = 10.0,
+            read_timeout: float | None = None,
+            keep_alive: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keep_alive = keep_alive
+        self._head = build_request_head(host, port, rpc_user, rpc_password, keep_alive)
+        self._idle: list[_Connection] = []
+        self._lock = Lock()
+
+    def _checkout(self, timeout: float | None) -> tuple[_Connection, bool]:
+        """Idle connection (reused=True) or a new one"""
+        with self._lock:
+            if self._idle:
+                connection = self._idle.pop()
+                reused = True
+            else:
+                connection = None
+                reused = False
+        if connection is None:
+            connect_timeout = self.connect_timeout
+            if timeout is not None:
+                connect_timeout = timeout if connect_timeout is None else min(connect_timeout, timeout)
+            sock = socket.create_connection((self.host, self.port), timeout=connect_timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _Connection(sock)
+
+        read_timeout = self.read_timeout
+        if timeout is not None:
+            read_timeout = timeout if read_timeout is None else min(read_timeout, timeout)
+        connection.sock.settimeout(read_timeout)
+        return connection, reused
+
+    def _checkin(self, connection: _Connection, keep_alive: bool):
+        if keep_alive and self.keep_alive:  # Some servers close without saying "Connection: close"
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(connection)
+                    return
+        connection.close()
+
+    @staticmethod
+    def _read_head(reader) -> tuple[int, dict[str, str], bool]:
+        lines = []
+        while True:
+            line = reader.readline(65537)
+            if not line:
+                raise ConnectionResetError('Connection closed by node')
+            lines.append(line)
+            if line == b'\r\n':
+                return parse_response_head(b''.join(lines))
+
+    @staticmethod
+    def _read_body(reader, headers: dict[str, str], keep_alive: bool) -> tuple[bytes, bool]:
+        if 'content-length' in headers:
+            length = int(headers['content-length'])
+            content = reader.read(length)
+            if len(content) < length:
+                raise ConnectionResetError('Connection closed by node')
+            return content, keep_alive
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(reader.readline(65537).split(b';', 1)[0], 16)
+                if size == 0:
+                    reader.readline(65537)  # No trailers from bolivarcoind
+                    return b''.join(chunks), keep_alive
+                chunks.append(reader.read(size))
+                reader.read(2)
+
+        return reader.read(), False  # Body until connection close
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        return self.request_many((body,), timeout)[0]
+
+    def request_many(self, bodies, timeout: float | None = None) -> list[tuple[int, bytes]]:
+        """ Pipelined POSTs on one connection: all requests are written at once, answers read in order
+
+            A JSON-RPC batch (Node.batch()) is usually better, pipelining keeps calls independent at HTTP level.
+        """
+        data = b''.join(request_bytes(self._head, body) for body in bodies)
+        while True:
+            try:
+                connection, reused = self._checkout(timeout)
+            except OSError as e:
+                raise TransportError(f'{e!r}') from e
+
+            answers = []
+            try:
+                connection.sock.sendall(data)
+                keep_alive = True
+                for _ in range(len(bodies)):
+                    if not keep_alive:
+                        raise ConnectionResetError('Node closed pipelined connection')
+                    status, headers, keep_alive = self._read_head(connection.reader)
+                    content, keep_alive = self._read_body(connection.reader, headers, keep_alive)
+                    answers.append((status, content))
+            except (ConnectionError, BrokenPipeError) as e:
+                connection.close()
+                if reused and not answers:  # Node closed an idle connection, try again on a new one
+                    continue
+                raise TransportError(f'{e!r}') from e
+            except (OSError, ValueError) as e:  # Timeout, malformed HTTP...
+                connection.close()
+                raise TransportError(f'{e!r}') from e
+
+            self._checkin(connection, keep_alive)
+            return answers
+
+    def stream(self, body: bytes, timeout: float | None = None, chunk_size: int = 65536):
+        data = request_bytes(self._head, body)
+        while True:
+            try:
+                connection, reused = self._checkout(timeout)
+            except OSError as e:
+                raise TransportError(f'{e!r}') from e
+            try:
+                connection.sock.sendall(data)
+                status, headers, keep_alive = self._read_head(connection.reader)
+                break
+            except (ConnectionError, BrokenPipeError) as e:
+                connection.close()
+                if reused:  # Node closed an idle connection, try again on a new one
+                    continue
+                raise TransportError(f'{e!r}') from e
+            except (OSError, ValueError) as e:  # Timeout, malformed HTTP...
+                connection.close()
+                raise TransportError(f'{e!r}') from e
+
+        length = int(headers['content-length']) if 'content-length' in headers else None
+        state = {"done": False, "closed": False}
+
+        def chunks() -> Iterator[bytes]:
+            if length is None:  # Chunked or until close, read it whole
+                content, alive = self._read_body(connection.reader, headers, keep_alive)
+                state["done"] = alive
+                yield content
+                return
+            left = length
+            while left:
+                chunk = connection.reader.read(min(chunk_size, left))
+                if not chunk:
+                    raise ConnectionResetError('Connection closed by node')
+                left -= len(chunk)
+                if not left:  # Reader may stop at last item, connection is reusable already
+                    state["done"] = keep_alive
+                yield chunk
+
+        def close():
+            if state["closed"]:
+                return
+            state["closed"] = True
+            if state["done"]:
+                self._checkin(connection, True)
+            else:
+                connection.close()
+
+        return status, chunks(), close
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+# ┏━┓┏━╸┏━╸┏━┓┏━┓╺┳┓   ┏━┓┏━╸┏━┓╻  ┏━┓╻ ╻
+# ┣┳┛┣╸ ┃  ┃ ┃┣┳┛ ┃┃   ┣┳┛┣╸ ┣━┛┃  ┣━┫┗┳┛
+# ╹┗╸┗━╸┗━╸┗━┛╹┗╸╺┻┛   ╹┗╸┗━╸╹  ┗━╸╹ ╹ ╹
+#
+# Recording file: gzip stream of records, each one
+#   header <dfIII: offset (seconds since recording start), latency (seconds), HTTP status,
+#                  request length, response length
+#   request: JSON [method, params], no id
+#   response: JSON {"result":..., "error":...}, no id
+# Batches are recorded as one record per call, so a batch replays from single calls and vice versa.
+
+_MAGIC = b'ORBREC1\n'
+_HEADER = struct.Struct('<dfIII')
+
+
+class Record(NamedTuple):
+    offset: float  # Seconds since recording start
+    latency: float  # Seconds node took to answer
+    status: int
+    method: str
+    params: list
+    response: bytes  # {"result":..., "error":...}, no id
+
+
+def _key(method: str, params: list | None) -> bytes:
+    return dumps([method, [] if params is None else params])
+
+
+def _without_id(item: dict) -> bytes:
+    return dumps({"result": item.get('result'), "error": item.get('error')})
+
+
+class RecordingTransport(Transport):
+    """ Record every call made through transport to path (see read_recording, ReplayTransport)
+
+        Thread safe. close() (or Node.close()) flushes the file.
+    """
+
+    def __init__(self, transport: Transport, path: str, compress_level: int = 6):
+        self.transport = transport
+        self.path = path
+        self._file = gzip.open(path, 'wb', compresslevel=compress_level)
+        self._file.write(_MAGIC)
+        self._lock = Lock()
+        self._started = time.monotonic()
+        self.records = 0
+
+    def _write(self, offset: float, latency: float, status: int, request: bytes, response: bytes):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_HEADER.pack(offset, latency, status, len(request), len(response)))
+            self._file.write(request)
+            self._file.write(response)
+            self.records += 1
+
+    def _record(self, started: float, status: int, body: bytes, content: bytes):
+        offset = started - self._started
+        latency = time.monotonic() - started
+        try:
+            request, response = loads(body), loads(content)
+        except JSONDecodeError:  # Not a JSON-RPC answer (503...), not recorded
+            return
+
+        if isinstance(request, list):
+            by_id = {item.get('id'): item for item in response} if isinstance(response, list) else {}
+            for call in request:
+                item = by_id.get(call.get('id'))
+                if item is not None:
+                    self._write(offset, latency, 200, _key(call['method'], call.get('params')), _without_id(item))
+        elif isinstance(response, dict):
+            self._write(offset, latency, status, _key(request['method'], request.get('params')), _without_id(response))
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        started = time.monotonic()
+        status, content = self.transport.request(body, timeout)
+        self._record(started, status, body, content)
+        return status, content
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self.transport.close()
+
+
+def read_recording(path: str) -> Iterator[Record]:
+    """ Records of a recording file, in recorded order
+
+        Load tests can replay traffic shape from them:
+        for record in read_recording("traffic.rec"): node.raw_call(record.method, record.params)
+    """
+    with gzip.open(path, 'rb') as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f'{path} is not an Orbital API recording')
+        while header := file.read(_HEADER.size):
+            offset, latency, status, request_length, response_length = _HEADER.unpack(header)
+            method, params = loads(file.read(request_length))
+            yield Record(offset, latency, status, method, params, file.read(response_length))
+
+
+class ReplayTransport(Transport):
+    """ Answer calls from a recording, no node needed
+
+        speed: None answers at once, 1.0 waits recorded node latency, 2.0 half of it...
+        Calls are matched by method and params, a call recorded many times replays its answers in turn.
+        Unknown calls get a JSON-RPC error (HTTP 500), like a node would.
+    """
+
+    def __init__(self, path: str, speed: float | None = None):
+        self.path = path
+        self.speed = speed
+        self._answers: dict[bytes, list[tuple[int, bytes, float]]] = defaultdict(list)
+        for record in read_recording(path):
+            self._answers[_key(record.method, record.params)].append(
+                (record.status, record.response, record.latency)
+            )
+        self._turns: dict[bytes, Iterator[int]] = {}
+        self._lock = Lock()
+        self.misses = 0
+
+    def _answer(self, method: str, params: list | None, request_id) -> tuple[int, bytes, float]:
+        key = _key(method, params)
+        answers = self._answers.get(key)
+        if not answers:
+            with self._lock:
+                self.misses += 1
+            error = {"code": -32603, "message": f"Not in recording: {method} {params}"}
+            return 500, dumps({"result": None, "error": error, "id": request_id}), 0.0
+
+        with self._lock:
+            turn = self._turns.get(key)
+            if turn is None:
+                turn = self._turns[key] = count()
+            status, response, latency = answers[next(turn) % len(answers)]
+        return status, response[:-1] + b',"id":' + dumps(request_id) + b'}', latency
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        request = loads(body)
+        if isinstance(request, list):
+            answers = [self._answer(call['method'], call.get('params'), call.get('id')) for call in request]
+            status = 200
+            content = b'[' + b','.join(answer[1] for answer in answers) + b']'
+            latency = max((answer[2] for answer in answers), default=0.0)
+        else:
+            status, content, latency = self._answer(request['method'], request.get('params'), request.get('id'))
+
+        if self.speed:
+            wait = latency / self.speed
+            if timeout is not None and wait > timeout:
+                time.sleep(timeout)
+                raise TransportError(f'Replay read timed out ({timeout:.3f}s)')
+            time.sleep(wait)
+        return status, content
+
+    def methods(self) -> dict[str, int]:
+        """Recorded answers per method"""
+        counts: dict[str, int] = defaultdict(int)
+        for key, answers in self._answers.items():
+            counts[loads(key)[0]] += len(answers)
+        return dict(counts)
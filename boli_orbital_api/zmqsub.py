@@ -0,0 +1,310 @@
+"""
+    ZMQ subscriber for bolivarcoind zmqpub* notifications (optional, needs pyzmq)
+
+    bolivarcoin.conf:
+
+        zmqpubhashblock=tcp://127.0.0.1:28332
+        zmqpubrawblock=tcp://127.0.0.1:28332
+        zmqpubhashtx=tcp://127.0.0.1:28332
+        zmqpubrawtx=tcp://127.0.0.1:28332
+        zmqpubhashtxlock=tcp://127.0.0.1:28332
+        zmqpubrawtxlock=tcp://127.0.0.1:28332
+
+    Every message carries a sequence number per topic. A gap means messages were lost (subscriber late or
+    slow, publisher high water mark reached): blocks are fetched again through node (getblockhash/getblock),
+    missed mempool transactions are found with getrawmempool. Events go to a bounded queue, a slow consumer
+    makes the subscriber wait, ZMQ then drops at publisher and the gap is backfilled once consumer catches up.
+
+        subscriber = ZmqSubscriber("tcp://127.0.0.1:28332", topics=("hashblock", "hashtxlock"), node=node)
+        subscriber.start()
+        for event in subscriber:             # or: event = subscriber.get(timeout=1.0)
+            print(event.topic, event.hash)
+
+        async for event in subscriber.events():  # asyncio consumers
+            ...
+"""
+import asyncio
+import hashlib
+import struct
+import threading
+import time
+from collections import OrderedDict
+from queue import Empty, Full, Queue
+from typing import Any, AsyncIterator, Iterable, Iterator, NamedTuple
+
+from .logger import setup_logger
+
+__all__ = ['ZmqSubscriber', 'ZmqEvent', 'TOPICS']
+
+# LOGGER
+logger = setup_logger(__name__)
+
+TOPICS = ('hashblock', 'hashtx', 'hashtxlock', 'rawblock', 'rawtx', 'rawtxlock')
+_BLOCK_TOPICS = ('hashblock', 'rawblock')
+_MEMPOOL_TOPICS = ('hashtx', 'rawtx')
+
+# Seconds between stop checks while waiting for messages or queue room
+_POLL_INTERVAL = 0.2
+
+
+def _block_reference(topic: str, body: bytes) -> tuple[str, int]:
+    """ (hash of a known block, height of body block minus its height)
+
+        hashblock body is the block hash. rawblock hash needs X11, its header gives the previous block hash instead
+        (after 4 bytes of version).
+    """
+    if topic == 'hashblock':
+        return body.hex(), 0
+    return body[4:36][::-1].hex(), 1
+
+
+class ZmqEvent(NamedTuple):
+    """ One notification
+
+        body: 32 byte hash (hash* topics, RPC byte order) or serialized block / transaction (raw* topics)
+        sequence: publisher sequence number, None for backfilled events
+        backfilled: fetched through RPC after a sequence gap
+    """
+    topic: str
+    body: bytes
+    sequence: int | None
+    backfilled: bool
+    received: float  # time.time()
+
+    @property
+    def hash(self) -> str | None:
+        """Block hash or txid as RPC shows it, None for rawblock (X11 of header, subscribe hashblock too)"""
+        if self.topic.startswith('hash'):
+            return self.body.hex()
+        if self.topic == 'rawblock':
+            return None
+        return hashlib.sha256(hashlib.sha256(self.body).digest()).digest()[::-1].hex()
+
+
+class ZmqSubscriber:
+    """ Threaded ZMQ SUB socket with sequence gap detection, RPC backfill and a bounded event queue
+
+        endpoints: one or many publisher addresses ("tcp://127.0.0.1:28332")
+        topics: some of TOPICS
+        node: Node or NodePool used to backfill gaps, None only counts them
+        max_queue: events waiting for consumer, subscriber blocks when full (backpressure)
+        high_water_mark: ZMQ receive buffer, messages
+        max_backfill: max blocks or transactions fetched for one gap
+
+        Lost txlock messages can not be fetched again (RPC has no history of locks), they are only counted.
+        pyzmq is imported by start(), handle() works without it.
+    """
+
+    def __init__(
+            self,
+            endpoints: str | Iterable[str],
+            topics: Iterable[str] = ('hashblock', 'hashtx', 'hashtxlock'),
+            node: Any = None,
+            max_queue: int = 10000,
+            high_water_mark: int = 10000,
+            max_backfill: int = 1000,
+    ):
+        self.endpoints = [endpoints] if isinstance(endpoints, str) else list(endpoints)
+        self.topics = tuple(topics)
+        unknown = set(self.topics) - set(TOPICS)
+        if unknown:
+            raise ValueError(f"Unknown topics {sorted(unknown)}, use {TOPICS}")
+        self.node = node
+        self.high_water_mark = high_water_mark
+        self.max_backfill = max_backfill
+
+        self._queue: Queue[ZmqEvent] = Queue(max_queue)
+        self._sequences: dict[str, int] = {}
+        self._heights: dict[str, int] = {}  # Tip height when start() connected, per block topic
+        self._last_blocks: dict[str, tuple[str, int]] = {}  # Last block received per topic, see _block_reference
+        self._seen: OrderedDict[str, None] = OrderedDict()  # Recent txids, for mempool backfill
+        self._thread: threading.Thread | None = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._counters = {
+            "received": 0, "gaps": 0, "missed": 0, "backfilled": 0, "unrecovered": 0, "queue_full_waits": 0,
+            "dropped": 0,
+        }
+
+    def get(self, timeout: float | None = None) -> ZmqEvent | None:
+        """Next event, None after timeout seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def __iter__(self) -> Iterator[ZmqEvent]:
+        """Events until stop()"""
+        while self._running or not self._queue.empty():
+            event = self.get(_POLL_INTERVAL)
+            if event is not None:
+                yield event
+
+    async def events(self) -> AsyncIterator[ZmqEvent]:
+        """Events until stop(), for asyncio consumers (waits in a worker thread)"""
+        while self._running or not self._queue.empty():
+            event = await asyncio.to_thread(self.get, _POLL_INTERVAL)
+            if event is not None:
+                yield event
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "queued": self._queue.qsize(), "sequences": dict(self._sequences)}
+
+    def start(self) -> 'ZmqSubscriber':
+        """Connect and receive in a background thread"""
+        if self._thread is not None:
+            return self
+        try:
+            import zmq
+        except ImportError as e:
+            raise ImportError("ZmqSubscriber needs pyzmq: pip install boli_orbital_api[zmq]") from e
+
+        if self.node is not None:
+            height = self.node.getblockcount().get('result')
+            for topic in _BLOCK_TOPICS:
+                if topic in self.topics and height is not None:
+                    self._heights[topic] = height
+
+        socket = zmq.Context.instance().socket(zmq.SUB)
+        socket.setsockopt(zmq.RCVHWM, self.high_water_mark)
+        for topic in self.topics:
+            socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+        for endpoint in self.endpoints:
+            socket.connect(endpoint)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, args=(socket,), name='orbital_zmq', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._running = False
+        self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self, socket):
+        try:
+            while self._running:
+                if not socket.poll(_POLL_INTERVAL * 1000):
+                    continue
+                frames = socket.recv_multipart()
+                if len(frames) < 2:
+                    continue
+                sequence = struct.unpack('<I', frames[2])[0] if len(frames) > 2 and len(frames[2]) == 4 else None
+                self.handle(frames[0].decode(errors='replace'), frames[1], sequence)
+        except Exception as e:
+            logger.warning("ZmqSubscriber stopped: %r", e)
+            self._running = False
+        finally:
+            socket.close(linger=0)
+
+    def handle(self, topic: str, body: bytes, sequence: int | None):
+        """Process one message: detect and backfill a gap, then queue the event"""
+        with self._lock:
+            self._counters["received"] += 1
+            last = self._sequences.get(topic)
+            if sequence is not None:
+                self._sequences[topic] = sequence
+
+        if last is not None and sequence is not None:
+            missed = (sequence - last - 1) & 0xFFFFFFFF
+            if missed:
+                with self._lock:
+                    self._counters["gaps"] += 1
+                    self._counters["missed"] += missed
+                logger.warning("ZMQ %s gap: %d messages lost (sequence %d -> %d)", topic, missed, last, sequence)
+                self._backfill(topic, body, missed)
+
+        event = ZmqEvent(topic, body, sequence, False, time.time())
+        if topic in _BLOCK_TOPICS:
+            self._last_blocks[topic] = _block_reference(topic, body)
+        elif topic in _MEMPOOL_TOPICS:
+            self._remember(event.hash)
+        self._put(event)
+
+    def _put(self, event: ZmqEvent):
+        """ Queue event, waiting while queue is full
+
+            Without receiving thread (stopped, or handle() called directly) nothing waits for room: a full queue
+            drops the event.
+        """
+        while True:
+            try:
+                self._queue.put(event, timeout=_POLL_INTERVAL)
+                return
+            except Full:
+                with self._lock:
+                    self._counters["queue_full_waits"] += 1
+                    if not self._running:
+                        self._counters["dropped"] += 1
+                        return
+
+    def _remember(self, txid: str):
+        self._seen[txid] = None
+        if len(self._seen) > 100000:
+            self._seen.popitem(last=False)
+
+    def _backfilled(self, topic: str, body: bytes):
+        with self._lock:
+            self._counters["backfilled"] += 1
+        self._put(ZmqEvent(topic, body, None, True, time.time()))
+
+    def _backfill(self, topic: str, body: bytes, missed: int):
+        if self.node is None or topic.endswith('txlock'):
+            with self._lock:
+                self._counters["unrecovered"] += missed
+            return
+        if topic in _BLOCK_TOPICS:
+            self._backfill_blocks(topic, body)
+        else:
+            self._backfill_mempool(topic)
+
+    def _height(self, reference: tuple[str, int]) -> int | None:
+        """Height of a block given by _block_reference, from node"""
+        blockhash, offset = reference
+        header = self.node.raw_call('getblockheader', [blockhash]).get('result')
+        return header['height'] + offset if header else None
+
+    def _backfill_blocks(self, topic: str, body: bytes):
+        """ Blocks between last block received and the one just received
+
+            Heights are read from headers, counting messages drifts on reorgs (new branch blocks are published
+            again at heights already seen).
+        """
+        last = self._last_blocks.get(topic)
+        last_height = self._heights.get(topic) if last is None else self._height(last)
+        height = self._height(_block_reference(topic, body))
+        if last_height is None or height is None:
+            return
+        start = max(last_height + 1, height - self.max_backfill)
+        for missing in range(start, height):
+            blockhash = self.node.getblockhash(missing).get('result')
+            if not blockhash:
+                return
+            if topic == 'hashblock':
+                self._backfilled(topic, bytes.fromhex(blockhash))
+            else:
+                raw = self.node.getblock(blockhash, False).get('result')
+                if raw:
+                    self._backfilled(topic, bytes.fromhex(raw))
+
+    def _backfill_mempool(self, topic: str):
+        """Mempool transactions not seen yet"""
+        txids = self.node.raw_call('getrawmempool').get('result') or []
+        for txid in [txid for txid in txids if txid not in self._seen][:self.max_backfill]:
+            self._remember(txid)
+            if topic == 'hashtx':
+                self._backfilled(topic, bytes.fromhex(txid))
+            else:
+                raw = self.node.raw_call('getrawtransaction', [txid]).get('result')
+                if raw:
+                    self._backfilled(topic, bytes.fromhex(raw))
@@ -0,0 +1,24 @@
+"""
+    Shared fixtures: a FakeNode per test, and Node factory talking to it
+"""
+import pytest
+
+from boli_orbital_api import Node
+from benchmarks.fake_node import FakeNode
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    """FakeNode options of fake, test modules override it for other payload sizes"""
+    return {}
+
+
+@pytest.fixture
+def fake(fake_options):
+    with FakeNode(**fake_options) as fake:
+        yield fake
+
+
+def node_for(fake: FakeNode, cls=Node, **kwargs):
+    """Node (or cls, e.g. AsyncNode) of fake"""
+    return cls(rpc_user='user', rpc_password='password', server_ip=fake.host, rpc_port=fake.port, **kwargs)
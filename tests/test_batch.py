@@ -0,0 +1,96 @@
+"""
+    JSON-RPC batches: one round-trip for many calls, responses matched by id, errors kept per call
+"""
+import asyncio
+
+import pytest
+
+from boli_orbital_api import AsyncNode, Node
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode, fake_hash
+from tests.conftest import node_for
+
+
+class RejectingNode(FakeNode):
+    """Answers batches with a single error object, like a node without batch support"""
+
+    def answer(self, request):
+        if isinstance(request, list):
+            return 500, {'result': None, 'error': {'code': -32600, 'message': 'Invalid Request'}, 'id': None}
+        return super().answer(request)
+
+
+@pytest.mark.parametrize('transport', ['requests', 'socket'])
+def test_one_request_for_many_calls(fake, transport):
+    with node_for(fake, transport=transport) as node:
+        before = fake.requests_count
+        with node.batch() as batch:
+            count = batch.getblockcount()
+            hashes = [batch.getblockhash(height) for height in range(TIP_HEIGHT - 5, TIP_HEIGHT)]
+            missing = batch.raw_call('unknown_method')
+        assert fake.requests_count == before + 1
+        assert len(batch) == 7
+
+        assert count.result == {'result': TIP_HEIGHT, 'errors': False}
+        assert [call.result['result'] for call in hashes] == [
+            fake_hash('block', height) for height in range(TIP_HEIGHT - 5, TIP_HEIGHT)
+        ]
+        assert missing.result['result'] is None
+        assert missing.result['errors']['code'] == -32601
+
+
+def test_execute_returns_results_by_id(fake):
+    with node_for(fake) as node:
+        batch = node.batch()
+        first, second = batch.getblockcount(), batch.getdifficulty()
+        assert first.result['errors'] == 'Batch not executed'
+        results = batch.execute()
+        assert first.id != second.id
+        assert results == {first.id: first.result, second.id: second.result}
+
+
+def test_empty_batch_sends_nothing(fake):
+    with node_for(fake) as node:
+        before = fake.requests_count
+        assert node.batch().execute() == {}
+        assert fake.requests_count == before
+
+
+def test_exception_inside_block_skips_execution(fake):
+    with node_for(fake) as node:
+        before = fake.requests_count
+        with pytest.raises(RuntimeError):
+            with node.batch() as batch:
+                call = batch.getblockcount()
+                raise RuntimeError
+        assert fake.requests_count == before
+        assert call.result['errors'] == 'Batch not executed'
+
+
+def test_rejected_batch_fails_every_call():
+    with RejectingNode() as fake, node_for(fake) as node:
+        with node.batch() as batch:
+            calls = [batch.getblockcount(), batch.getdifficulty()]
+        assert all(call.result['result'] is None for call in calls)
+        assert all(call.result['errors']['code'] == -32600 for call in calls)
+
+
+def test_unreachable_node_fails_every_call():
+    with FakeNode() as fake:
+        host, port = fake.host, fake.port
+    node = Node('user', 'password', server_ip=host, rpc_port=port, connect_timeout=1, retry_policy=None)
+    with node.batch() as batch:
+        calls = [batch.getblockcount(), batch.getdifficulty()]
+    assert all(call.result['result'] is None and call.result['errors'] for call in calls)
+
+
+def test_async_batch(fake):
+    async def run():
+        async with node_for(fake, AsyncNode) as node:
+            async with node.batch() as batch:
+                count = batch.getblockcount()
+                blockhash = batch.getblockhash(TIP_HEIGHT)
+            return count.result, blockhash.result
+
+    count, blockhash = asyncio.run(run())
+    assert count == {'result': TIP_HEIGHT, 'errors': False}
+    assert blockhash == {'result': fake_hash('block', TIP_HEIGHT), 'errors': False}
@@ -0,0 +1,162 @@
+"""
+    BlockCache (immutable blocks, memory over SQLite) and TtlCache (volatile chain state, invalidated on new blocks)
+"""
+import time
+
+import pytest
+
+from boli_orbital_api import BlockCache, TtlCache
+from benchmarks.fake_node import TIP_HEIGHT, fake_hash
+from tests.conftest import node_for
+
+DEEP = TIP_HEIGHT - 500
+SHALLOW = TIP_HEIGHT - 10
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"block_txs": 3}
+
+
+def block(height: int, confirmations: int) -> dict:
+    return {"hash": fake_hash('block', height), "height": height, "confirmations": confirmations, "tx": []}
+
+
+# ┏┓ ╻  ┏━┓┏━╸╻┏
+# ┣┻┓┃  ┃ ┃┃  ┣┻┓
+# ┗━┛┗━╸┗━┛┗━╸╹ ╹
+def test_block_cache_keeps_only_deep_blocks(fake):
+    cache = BlockCache(min_confirmations=100)
+    with node_for(fake, block_cache=cache) as node:
+        deep, shallow = fake_hash('block', DEEP), fake_hash('block', SHALLOW)
+        first = node.getblock(deep)
+        requests = fake.requests_count
+        assert node.getblock(deep) == first
+        assert fake.requests_count == requests
+
+        node.getblock(shallow)
+        node.getblock(shallow)
+        assert fake.requests_count == requests + 2
+
+        node.getblock(deep, False)  # Raw block of a known deep hash
+        node.getblock(deep, False)
+        assert fake.requests_count == requests + 3
+    assert cache.stats()["memory_hits"] == 2
+
+
+def test_block_hash_cached_once_tip_is_known(fake):
+    cache = BlockCache(min_confirmations=100)
+    with node_for(fake, block_cache=cache) as node:
+        node.getblockhash(DEEP)
+        assert cache.lookup('getblockhash', [DEEP]) is None  # Tip unknown, depth unknown
+        node.getblockcount()
+        node.getblockhash(DEEP)
+        node.getblockhash(SHALLOW)
+    assert cache.lookup('getblockhash', [DEEP]) == {"result": fake_hash('block', DEEP), 'errors': None}
+    assert cache.lookup('getblockhash', [SHALLOW]) is None
+
+
+def test_block_cache_batches_send_only_missing_calls(fake):
+    cache = BlockCache()
+    with node_for(fake, block_cache=cache) as node:
+        node.getblock(fake_hash('block', DEEP))
+        with node.batch() as batch:
+            cached = batch.getblock(fake_hash('block', DEEP))
+            fetched = batch.getblock(fake_hash('block', DEEP + 1))
+        requests = fake.requests_count
+        with node.batch() as batch:
+            both = [batch.getblock(fake_hash('block', height)) for height in (DEEP, DEEP + 1)]
+        assert fake.requests_count == requests  # Both cached now
+    assert cached.result['result']['height'] == DEEP
+    assert fetched.result['result']['height'] == DEEP + 1
+    assert [call.result['result']['height'] for call in both] == [DEEP, DEEP + 1]
+
+
+def test_block_cache_persists_on_disk(tmp_path):
+    path = tmp_path / 'blocks.sqlite3'
+    cache = BlockCache(path)
+    cache.store('getblock', [fake_hash('block', DEEP)], {"result": block(DEEP, 500), 'errors': None})
+    cache.store('gettransaction', [fake_hash('tx', 1)], {"result": {"txid": fake_hash('tx', 1), "confirmations": 150}, 'errors': None})
+    cache.close()
+
+    cache = BlockCache(path)
+    assert cache.lookup('getblock', [fake_hash('block', DEEP)])['result'] == block(DEEP, 500)
+    assert cache.lookup('getblockhash', [DEEP])['result'] == fake_hash('block', DEEP)  # Learnt from the block
+    assert cache.lookup('gettransaction', [fake_hash('tx', 1)])['result']['confirmations'] == 150
+    assert cache.stats()["disk_hits"] == 3
+    cache.close()
+
+
+def test_block_cache_memory_is_bounded():
+    cache = BlockCache(max_memory_bytes=600, compress_level=0)
+    for height in range(10):
+        cache.store('getblock', [fake_hash('block', height)], {"result": block(height, 1000), 'errors': None})
+    stats = cache.stats()
+    assert 0 < stats["memory_bytes"] <= 600
+    assert cache.lookup('getblock', [fake_hash('block', 9)]) is not None
+    assert cache.lookup('getblock', [fake_hash('block', 0)]) is None  # Least recently used, evicted
+
+
+def test_block_cache_ignores_errors_and_odd_params():
+    cache = BlockCache()
+    cache.store('getblock', ['00' * 32], {"result": None, 'errors': {'code': -5}})
+    cache.store('getblock', ['11' * 32], {"result": {"confirmations": 1000}, 'errors': None})  # No height
+    assert cache.lookup('getblock', ['00' * 32]) is None
+    assert cache.lookup('getblock', ['11' * 32]) is None
+    assert cache.lookup('getblockhash', ['one']) is None
+    assert cache.lookup('getinfo', []) is None
+
+
+# ╺┳╸╺┳╸╻
+#  ┃  ┃ ┃
+#  ╹  ╹ ┗━╸
+def test_ttl_cache_serves_until_block_changes(fake):
+    cache = TtlCache(tip_check_interval=None)
+    with node_for(fake, ttl_cache=cache) as node:
+        assert node.getdifficulty()['result'] == 36237.78062774216
+        requests = fake.requests_count
+        assert node.getdifficulty()['result'] == 36237.78062774216
+        assert fake.requests_count == requests
+
+        node.getblockcount()
+        assert fake.requests_count == requests + 1
+
+        cache.observe_tip(height=TIP_HEIGHT + 1)  # New block seen elsewhere (getinfo, tracker...)
+        node.getdifficulty()
+        node.getblockcount()
+        assert fake.requests_count == requests + 3
+
+        cache.invalidate()  # blocknotify
+        node.getdifficulty()
+        assert fake.requests_count == requests + 4
+    assert cache.stats()["methods"]["getdifficulty"] == {"hits": 1, "misses": 3, "expired": 0}
+
+
+def test_ttl_cache_invalidated_by_tip_checks(fake):
+    cache = TtlCache(tip_check_interval=0.0)
+    with node_for(fake, ttl_cache=cache) as node:
+        node.getdifficulty()
+        node.getdifficulty()
+        assert cache.stats()["methods"]["getdifficulty"]["hits"] == 1
+
+        fake.results['getbestblockhash'] = fake_hash('block', TIP_HEIGHT + 1)
+        node.getdifficulty()
+        assert cache.stats()["invalidations"] == 1
+        assert cache.stats()["methods"]["getdifficulty"]["misses"] == 2
+
+
+def test_ttl_cache_entries_expire():
+    cache = TtlCache(policies={'getinfo': 0.05}, tip_check_interval=None)
+    cache.store('getinfo', [], {"result": {"blocks": 10}, 'errors': None})
+    cache.store('getnetworkinfo', [], {"result": {"version": 1}, 'errors': None})
+    assert cache.lookup('getinfo', []) == {"result": {"blocks": 10}, 'errors': None}
+    assert cache.lookup('getnetworkinfo', []) is None  # No policy, never cached
+    time.sleep(0.1)
+    assert cache.lookup('getinfo', []) is None
+    assert cache.stats()["methods"]["getinfo"]["expired"] == 1
+
+
+def test_ttl_cache_one_tip_check_per_interval():
+    cache = TtlCache(tip_check_interval=60.0)
+    assert [cache.tip_check_due() for _ in range(3)] == [True, False, False]
+    assert TtlCache(tip_check_interval=None).tip_check_due() is False
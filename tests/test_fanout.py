@@ -0,0 +1,65 @@
+"""
+    Node.map() and Node.iter_blocks(): concurrent calls over the connection pool, results in order
+"""
+import pytest
+
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode, fake_hash
+from tests.conftest import node_for
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"block_txs": 2}
+
+
+def test_map_keeps_params_order(fake):
+    heights = list(range(TIP_HEIGHT - 30, TIP_HEIGHT))
+    with node_for(fake) as node:
+        results = node.map('getblockhash', heights)
+        assert [result['result'] for result in results] == [fake_hash('block', height) for height in heights]
+        assert all(result['errors'] is False for result in results)
+
+        blocks = node.map('getblock', [[fake_hash('block', height), True] for height in heights[:3]], max_workers=2)
+        assert [block['result']['height'] for block in blocks] == heights[:3]
+
+
+def test_map_keeps_errors_per_call(fake):
+    with node_for(fake) as node:
+        results = node.map('getblockhash', [1, 2])
+        missing = node.map('unknown_method', [1, 2])
+    assert all(result['errors'] is False for result in results)
+    assert all(result['result'] is None and result['errors']['code'] == -32601 for result in missing)
+
+
+def test_iter_blocks_in_height_order(fake):
+    start = TIP_HEIGHT - 57
+    with node_for(fake) as node:
+        blocks = list(node.iter_blocks(start, TIP_HEIGHT, window=20, batch_size=7))
+        raw = list(node.iter_blocks(start, start + 3, verbose=False))
+    assert [block['result']['height'] for block in blocks] == list(range(start, TIP_HEIGHT))
+    assert all(block['errors'] is False for block in blocks)
+    assert all(isinstance(block['result'], str) for block in raw) and len(raw) == 3
+
+
+def test_iter_blocks_ends_at_tip_by_default(fake):
+    fake.results['getblockcount'] = TIP_HEIGHT - 1000
+    with node_for(fake) as node:
+        heights = [block['result']['height'] for block in node.iter_blocks(TIP_HEIGHT - 1010)]
+    assert heights == list(range(TIP_HEIGHT - 1010, TIP_HEIGHT - 999))
+
+
+def test_iter_blocks_yields_block_count_error(fake):
+    del fake.results['getblockcount']
+    with node_for(fake, retry_policy=None) as node:
+        answers = list(node.iter_blocks(0))
+    assert len(answers) == 1 and answers[0]['errors']['code'] == -32601
+
+
+def test_iter_blocks_stopped_early_cancels_pending_batches():
+    with FakeNode(latency=0.02, block_txs=2) as fake:
+        node = node_for(fake, pool_size=1)
+        blocks = node.iter_blocks(TIP_HEIGHT - 200, TIP_HEIGHT, window=200, batch_size=10)
+        assert next(blocks)['result']['height'] == TIP_HEIGHT - 200
+        blocks.close()
+        node.close()  # Waits for batches already running
+        assert fake.requests_count <= 6  # 2 requests per batch, 20 batches were queued
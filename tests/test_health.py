@@ -0,0 +1,75 @@
+"""
+    Cached health state: RPC errors mean node is online, transport failures, 401 and 503 mean it is not
+"""
+import asyncio
+
+import pytest
+
+from boli_orbital_api import AsyncNode, Node
+from benchmarks.fake_node import FakeNode
+from tests.conftest import node_for
+
+_STATUSES = {'bad_parameter': 500, 'unauthorized': 401, 'overloaded': 503}
+
+
+class StatusNode(FakeNode):
+    """FakeNode answering some methods with an HTTP error status, like bolivarcoind does"""
+
+    def _answer_one(self, request: dict) -> tuple[int, dict]:
+        status = _STATUSES.get(request.get('method'))
+        if status is None:
+            return super()._answer_one(request)
+        error = {'code': -8, 'message': 'Invalid parameter'}
+        return status, {'result': None, 'error': error, 'id': request.get('id')}
+
+
+@pytest.fixture
+def fake():
+    with StatusNode() as fake:
+        yield fake
+
+
+@pytest.mark.parametrize('method', ['unknown_method', 'bad_parameter'])
+def test_rpc_errors_keep_node_online(fake, method):
+    with node_for(fake, retry_policy=None, circuit_breaker=False) as node:
+        answer = node.raw_call(method)
+        assert answer['errors'] is not None
+        requests = fake.requests_count
+        assert node.is_online is True
+        assert fake.requests_count == requests  # Fresh state, no probe
+
+
+@pytest.mark.parametrize('method', ['unauthorized', 'overloaded'])
+def test_unusable_node_is_offline(fake, method):
+    with node_for(fake, retry_policy=None, circuit_breaker=False) as node:
+        node.raw_call(method)
+        assert node._valid_node is False
+
+
+def test_batch_with_rpc_errors_keeps_node_online(fake):
+    with node_for(fake, retry_policy=None, circuit_breaker=False) as node:
+        with node.batch() as batch:
+            missing = batch.raw_call('unknown_method')
+            count = batch.getblockcount()
+        assert missing.result['errors'] is not None
+        assert count.result['errors'] is False
+        assert node._valid_node is True
+
+
+def test_transport_failure_is_offline():
+    with FakeNode() as fake:
+        host, port = fake.host, fake.port
+    with Node(rpc_user='user', rpc_password='password', server_ip=host, rpc_port=port, retry_policy=None) as node:
+        assert node.raw_call('getblockcount')['errors'] is not None
+        assert node._valid_node is False
+
+
+def test_async_rpc_errors_keep_node_online(fake):
+    async def run():
+        async with node_for(fake, AsyncNode, retry_policy=None, circuit_breaker=False) as node:
+            await node.raw_call('unknown_method')
+            online_after_error = node._valid_node
+            await node.raw_call('unauthorized')
+            return online_after_error, node._valid_node
+
+    assert asyncio.run(run()) == (True, False)
@@ -0,0 +1,83 @@
+"""
+    Import must be fast and side effect free: no logging setup, no directories, no requests until needed
+
+    Every check runs in a fresh interpreter.
+    ORBITAL_IMPORT_BUDGET: seconds "from boli_orbital_api import Node" may take (best of 5), default 0.3
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+IMPORT_BUDGET = float(os.environ.get('ORBITAL_IMPORT_BUDGET', '0.3'))
+
+
+def run(code: str) -> str:
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_package_import_loads_no_submodule():
+    code = (
+        "import sys, boli_orbital_api\n"
+        "print(sorted(name for name in sys.modules if name.startswith('boli_orbital_api.')))"
+    )
+    assert run(code) == '[]'
+
+
+def test_no_logging_setup_no_filesystem_work():
+    code = (
+        "import logging, os, sys\n"
+        "made = []\n"
+        "mkdir = os.mkdir\n"
+        "os.mkdir = lambda path, *args, **kwargs: made.append(path) or mkdir(path, *args, **kwargs)\n"
+        "logging.basicConfig(level=logging.ERROR, format='app %(message)s')\n"
+        "root = logging.getLogger()\n"
+        "handlers, level = list(root.handlers), root.level\n"
+        "from boli_orbital_api import *\n"
+        "Node(rpc_user='user', rpc_password='password', transport='socket').close()\n"
+        "print(made == [], root.handlers == handlers, root.level == level)"
+    )
+    assert run(code) == 'True True True'
+
+
+def test_requests_imported_only_by_requests_transport():
+    code = (
+        "import sys\n"
+        "from boli_orbital_api import Node\n"
+        "Node(transport='socket')\n"
+        "before = 'requests' in sys.modules\n"
+        "Node()\n"
+        "print(before, 'requests' in sys.modules)"
+    )
+    assert run(code) == 'False True'
+
+
+def test_import_time():
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        "from boli_orbital_api import Node\n"
+        "print(time.perf_counter() - start)"
+    )
+    seconds = min(float(run(code)) for _ in range(5))
+    assert seconds < IMPORT_BUDGET, f'{seconds * 1000:.1f} ms, budget {IMPORT_BUDGET * 1000:.0f} ms'
+
+
+def test_queue_logging_reaches_root_handlers():
+    code = (
+        "import logging, io\n"
+        "stream = io.StringIO()\n"
+        "logging.basicConfig(level=logging.INFO, stream=stream, format='%(name)s %(message)s')\n"
+        "import boli_orbital_api\n"
+        "from boli_orbital_api.logger import setup_logger, start_queue_logging, stop_queue_logging\n"
+        "logger = setup_logger('boli_orbital_api.rpc')\n"
+        "start_queue_logging()\n"
+        "logger.warning('queued record')\n"
+        "stop_queue_logging()\n"
+        "logger.warning('direct record')\n"
+        "print(stream.getvalue().splitlines())"
+    )
+    assert run(code) == "['boli_orbital_api.rpc queued record', 'boli_orbital_api.rpc direct record']"
@@ -0,0 +1,153 @@
+"""
+    WalletIndex against FakeNode: first sync, incremental syncs, "move" entries and reorgs
+"""
+import threading
+
+import pytest
+
+from boli_orbital_api import WalletIndex
+from benchmarks.fake_node import TIP_HEIGHT, fake_hash
+from tests.conftest import node_for
+
+WALLET_TXS = 40
+MOVES = [
+    {"account": "savings", "otheraccount": "", "category": "move", "amount": 2.5, "time": 1700000000, "comment": ""},
+    {"account": "", "otheraccount": "savings", "category": "move", "amount": -2.5, "time": 1700000000, "comment": ""},
+    {"account": "savings", "otheraccount": "", "category": "move", "amount": 1.0, "time": 1700000100, "comment": ""},
+]
+ORPHAN = {  # Mined in a block that a reorg takes away
+    "account": "", "address": "bOrphan", "category": "receive", "amount": 3.0, "vout": 0, "confirmations": 2,
+    "blockhash": fake_hash('block', TIP_HEIGHT - 1), "blockindex": 1, "blocktime": 1700000200,
+    "txid": fake_hash('orphan'), "time": 1700000200, "timereceived": 1700000200,
+}
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"wallet_txs": WALLET_TXS}
+
+
+@pytest.fixture
+def fake(fake):
+    """Shared FakeNode, also listing fake.extra entries"""
+    listsinceblock = fake.results['listsinceblock']
+    fake.extra = [*MOVES, ORPHAN]  # Entries listed on top of FakeNode ones by next call
+
+    def listed(params):
+        answer = listsinceblock(params)
+        answer["transactions"] += fake.extra
+        return answer
+
+    fake.results['listsinceblock'] = listed
+    return fake
+
+
+@pytest.fixture
+def index(fake):
+    node = node_for(fake)
+    with WalletIndex(':memory:', node, confirmations=6) as index:
+        yield index
+    node.close()
+
+
+def test_first_sync_reads_whole_wallet(index):
+    synced = index.sync()
+    assert synced["errors"] is False
+    assert synced["result"] == {
+        "entries": WALLET_TXS + 4, "added": WALLET_TXS + 4, "reorg": None,
+        "cursor": fake_hash('block', TIP_HEIGHT - 5), "height": TIP_HEIGHT - 5,
+    }
+    assert index.cursor == (fake_hash('block', TIP_HEIGHT - 5), TIP_HEIGHT - 5)
+
+    moves = index.query(category='move')
+    assert sorted((move["account"], move["otheraccount"], move["amount"]) for move in moves) == [
+        ("", "savings", -2.5), ("savings", "", 1.0), ("savings", "", 2.5)
+    ]
+    assert all(move["txid"] == '' for move in moves)
+
+    entry = index.transaction(fake_hash('wallet', 7))[0]
+    assert entry["blockheight"] == TIP_HEIGHT - 7 and entry["confirmations"] == 8
+    assert "otheraccount" not in entry
+    assert index.stats()["entries"] == WALLET_TXS + 4
+
+
+def test_incremental_sync_lists_only_recent_blocks(fake, index):
+    index.sync()
+    fake.extra = [{**ORPHAN, "txid": fake_hash('new'), "confirmations": 0, "blockhash": None}]
+    synced = index.sync()["result"]
+    assert synced["entries"] == 5 + 1  # Last confirmations - 1 blocks again, and the new one
+    assert synced["added"] == 1 and synced["reorg"] is None
+    new = index.transaction(fake_hash('new'))[0]
+    assert new["blockheight"] is None and new["confirmations"] == 0
+    assert index.stats()["unconfirmed"] == 1 + len(MOVES)  # Moves are never in a block
+
+    fake.extra = MOVES  # Listed again: updated, not duplicated
+    assert index.sync()["result"]["added"] == 0
+    assert len(index.query(category='move')) == 3
+
+
+def test_cursor_off_best_chain_walks_back_to_fork(fake, index):
+    index.sync()
+    stale = fake_hash('block', TIP_HEIGHT - 5)
+    getblockheader = fake.results['getblockheader']
+    fake.results['getblockheader'] = lambda params: (
+        {**getblockheader(params), "confirmations": -1} if params[0] == stale else getblockheader(params)
+    )
+    fake.extra = []  # Orphan transaction is gone from the new branch
+
+    synced = index.sync()["result"]
+    assert synced["reorg"] == TIP_HEIGHT - 6
+    orphan = index.transaction(fake_hash('orphan'))[0]
+    assert orphan["blockhash"] is None and orphan["blockheight"] is None and orphan["confirmations"] == 0
+    relisted = index.transaction(fake_hash('wallet', 0))[0]
+    assert relisted["blockheight"] == TIP_HEIGHT  # Listed again from fork, block data back
+
+
+def test_queries_do_not_wait_for_node_during_sync(fake, index):
+    index.sync()
+    listsinceblock = fake.results['listsinceblock']
+    listing, release = threading.Event(), threading.Event()
+
+    def slow(params):  # Node is slow to answer, until the queries below are done
+        listing.set()
+        release.wait(10)
+        return listsinceblock(params)
+
+    fake.results['listsinceblock'] = slow
+    syncing = threading.Thread(target=index.sync)
+    syncing.start()
+    try:
+        assert listing.wait(10)
+        answered = []
+        reader = threading.Thread(target=lambda: answered.append((index.stats(), index.balance(), index.query(limit=1))))
+        reader.start()
+        reader.join(2)
+        assert answered and answered[0][0]["entries"] == WALLET_TXS + 4
+    finally:
+        release.set()
+        syncing.join()
+
+
+def test_failed_sync_leaves_index_unchanged(fake, index):
+    index.sync()
+    before = index.stats()
+    del fake.results['listsinceblock']
+    failed = index.sync()
+    assert failed["result"] is None and failed["errors"]
+    assert index.stats() == before
+
+
+def test_index_persists_and_checks_schema(fake, tmp_path):
+    path = str(tmp_path / 'wallet.sqlite')
+    node = node_for(fake)
+    with WalletIndex(path, node) as index:
+        index.sync()
+        cursor = index.cursor
+    with WalletIndex(path) as index:
+        assert index.cursor == cursor
+        assert index.balance(confirmations=0) == sum(entry["amount"] for entry in index.query())
+        index._db.execute("UPDATE meta SET value = '1' WHERE key = 'schema'")
+        index._db.commit()
+    with pytest.raises(ValueError):
+        WalletIndex(path)
+    node.close()
@@ -0,0 +1,159 @@
+"""
+    Interceptor chain of Node, AsyncNode and NodePool against FakeNode: order, short-circuit, rewrites, batches
+"""
+import asyncio
+
+from boli_orbital_api import AsyncNode, Call, Interceptor, NodePool
+from boli_orbital_api import aio, rpc
+from benchmarks.fake_node import TIP_HEIGHT, fake_hash
+from tests.conftest import node_for
+
+
+class Recorder(Interceptor):
+    """Appends (name, hook, method) of every hook run to a shared log"""
+
+    def __init__(self, name: str, log: list):
+        self.name = name
+        self.log = log
+
+    def on_request(self, call: Call):
+        self.log.append((self.name, 'request', call.method))
+        return None
+
+    def on_response(self, call: Call, response: dict) -> dict:
+        self.log.append((self.name, 'response', call.method))
+        return response
+
+    def on_error(self, call: Call, response: dict) -> dict:
+        self.log.append((self.name, 'error', call.method))
+        return response
+
+
+class Answer(Interceptor):
+    """Answers calls of method itself, node never sees them"""
+
+    def __init__(self, method: str, result):
+        self.method = method
+        self.result = result
+
+    def on_request(self, call: Call):
+        if call.method == self.method:
+            return {"result": self.result, "errors": None}
+        return None
+
+
+class Rename(Interceptor):
+    """getblockcount becomes getdifficulty on the way in, results are wrapped on the way out"""
+
+    def on_request(self, call: Call):
+        if call.method == 'getblockcount':
+            call.method = 'getdifficulty'
+            call.context["renamed"] = True
+        return None
+
+    def on_response(self, call: Call, response: dict) -> dict:
+        if call.context.get("renamed"):
+            return {**response, "result": {"difficulty": response["result"]}}
+        return response
+
+
+def test_request_hooks_in_order_response_hooks_reversed(fake):
+    log = []
+    with node_for(fake, interceptors=[Recorder('outer', log), Recorder('inner', log)]) as node:
+        assert node.getblockcount()['result'] == TIP_HEIGHT
+        node.raw_call('unknown_method')
+    assert log == [
+        ('outer', 'request', 'getblockcount'), ('inner', 'request', 'getblockcount'),
+        ('inner', 'response', 'getblockcount'), ('outer', 'response', 'getblockcount'),
+        ('outer', 'request', 'unknown_method'), ('inner', 'request', 'unknown_method'),
+        ('inner', 'error', 'unknown_method'), ('outer', 'error', 'unknown_method'),
+    ]
+
+
+def test_answering_hook_skips_node_and_later_interceptors(fake):
+    log = []
+    interceptors = [Recorder('outer', log), Answer('getblockcount', 42), Recorder('inner', log)]
+    with node_for(fake, interceptors=interceptors) as node:
+        assert node.getblockcount()['result'] == 42
+    assert fake.requests_count == 0
+    assert log == [('outer', 'request', 'getblockcount'), ('outer', 'response', 'getblockcount')]
+
+
+def test_hooks_rewrite_method_and_result(fake):
+    with node_for(fake, interceptors=[Rename()]) as node:
+        answer = node.raw_call('getblockcount')
+        node.interceptors.clear()
+        assert node.raw_call('getblockcount')['result'] == TIP_HEIGHT
+    assert answer['result'] == {"difficulty": fake.results['getdifficulty']}
+
+
+def test_no_interceptors_skip_the_chain(fake, monkeypatch):
+    def fail(*args):
+        raise AssertionError("chain ran without interceptors")
+
+    monkeypatch.setattr(rpc, 'intercept', fail)
+    monkeypatch.setattr(rpc, 'intercept_batch', fail)
+    with node_for(fake) as node:
+        assert node.getblockcount()['result'] == TIP_HEIGHT
+        with node.batch() as batch:
+            count = batch.getblockcount()
+        assert count.result['result'] == TIP_HEIGHT
+
+
+def test_batch_calls_get_their_own_hooks(fake):
+    log = []
+    with node_for(fake, interceptors=[Recorder('log', log), Answer('getdifficulty', 1.5), Rename()]) as node:
+        with node.batch() as batch:
+            blockhash = batch.getblockhash(TIP_HEIGHT)
+            difficulty = batch.getdifficulty()
+            count = batch.getblockcount()  # Renamed to getdifficulty, then answered by node
+    assert fake.requests_count == 1
+    assert blockhash.result['result'] == fake_hash('block', TIP_HEIGHT)
+    assert difficulty.result == {"result": 1.5, "errors": False}
+    assert count.result['result'] == {"difficulty": fake.results['getdifficulty']}
+    assert [entry for entry in log if entry[1] == 'request'] == [
+        ('log', 'request', 'getblockhash'), ('log', 'request', 'getdifficulty'), ('log', 'request', 'getblockcount'),
+    ]
+    assert len(log) == 6
+
+
+def test_async_node_awaits_coroutine_hooks(fake, monkeypatch):
+    class Delayed(Interceptor):
+        async def on_request(self, call: Call):
+            await asyncio.sleep(0)
+            return {"result": 7, "errors": None} if call.method == 'getdifficulty' else None
+
+        async def on_response(self, call: Call, response: dict) -> dict:
+            await asyncio.sleep(0)
+            return {**response, "result": [response["result"]]}
+
+    async def calls():
+        async with node_for(fake, AsyncNode, interceptors=[Delayed()]) as node:
+            count = await node.getblockcount()
+            difficulty = await node.getdifficulty()
+            batch = node.batch()
+            blockhash = batch.getblockhash(TIP_HEIGHT)
+            await batch.execute()
+            return count, difficulty, blockhash.result
+
+    count, difficulty, blockhash = asyncio.run(calls())
+    assert count['result'] == [TIP_HEIGHT]
+    assert difficulty['result'] == [7]
+    assert blockhash['result'] == [fake_hash('block', TIP_HEIGHT)]
+
+    def fail(*args):
+        raise AssertionError("chain ran without interceptors")
+
+    async def plain():
+        async with node_for(fake, AsyncNode) as node:
+            return await node.getblockcount()
+
+    monkeypatch.setattr(aio, 'intercept_async', fail)
+    assert asyncio.run(plain())['result'] == TIP_HEIGHT
+
+
+def test_pool_interceptors_run_once_before_routing(fake):
+    log = []
+    with NodePool([node_for(fake)], interceptors=[Recorder('pool', log)]) as pool:
+        assert pool.getblockcount()['result'] == TIP_HEIGHT
+    assert log == [('pool', 'request', 'getblockcount'), ('pool', 'response', 'getblockcount')]
@@ -0,0 +1,143 @@
+"""
+    Per method metrics against FakeNode: counters, histograms, merged pool snapshots and Prometheus exposition
+"""
+import asyncio
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from boli_orbital_api import AsyncNode, Metrics, Node, NodePool, TtlCache
+from boli_orbital_api.metrics import merge_snapshots, prometheus_text, serve_metrics
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode
+from tests.conftest import node_for
+
+
+def test_histogram_buckets_and_quantiles():
+    metrics = Metrics(buckets=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.001, 0.005, 0.005, 0.05, 3.0):  # A bound belongs to its own bucket
+        metrics.observe('getblock', seconds)
+    stats = metrics.snapshot()['getblock']
+    assert stats["histogram"] == {'0.001': 2, '0.01': 4, '0.1': 5, '+Inf': 6}
+    assert stats["latency_sum"] == pytest.approx(3.0615)
+    assert stats["p50_ms"] == 10.0
+    assert stats["p99_ms"] == 100.0  # In +Inf: last finite bound
+
+    assert Metrics().snapshot() == {}
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_node_counts_calls_errors_bytes_and_cache_hits(fake):
+    with node_for(fake, metrics=True, ttl_cache=TtlCache(), retry_policy=None) as node:
+        for _ in range(3):
+            node.getblockcount()  # Then answered by ttl cache
+        node.raw_call('unknown_method')
+        node.masternode_count()
+        node.getdifficulty()
+        snapshot = node.metrics.snapshot()
+
+    assert list(snapshot) == sorted(snapshot)
+    assert {'getblockcount', 'getdifficulty', 'masternode count', 'unknown_method'} <= set(snapshot)
+    count = snapshot['getblockcount']
+    assert (count["calls"], count["errors"], count["cache_hits"]) == (1, 0, 2)
+    assert count["bytes_out"] > 0 and count["bytes_in"] > 0
+    assert count["histogram"]['+Inf'] == 1 and count["p50_ms"] is not None
+    assert snapshot['getdifficulty']["calls"] == 1 and snapshot['masternode count']["errors"] == 0
+    assert snapshot['unknown_method']["errors"] == 1
+
+
+def test_transport_errors_are_counted():
+    with FakeNode() as gone:
+        port = gone.port
+    with Node('user', 'password', rpc_port=port, connect_timeout=1, retry_policy=None, metrics=True) as node:
+        node.getblockcount()
+        stats = node.metrics.snapshot()['getblockcount']
+    assert (stats["calls"], stats["errors"], stats["bytes_in"]) == (1, 1, 0)
+
+
+def test_batch_calls_share_latency_and_bytes(fake):
+    with node_for(fake, metrics=True) as node:
+        with node.batch() as batch:
+            batch.getblockcount()
+            batch.getblockhash(TIP_HEIGHT)
+            batch.raw_call('unknown_method')
+        snapshot = node.metrics.snapshot()
+    assert {method: stats["calls"] for method, stats in snapshot.items()} == {
+        'getblockcount': 1, 'getblockhash': 1, 'unknown_method': 1
+    }
+    assert snapshot['unknown_method']["errors"] == 1 and snapshot['getblockcount']["errors"] == 0
+    assert snapshot['getblockcount']["bytes_out"] == snapshot['getblockhash']["bytes_out"] > 0
+    assert snapshot['getblockcount']["latency_sum"] == snapshot['getblockhash']["latency_sum"]
+
+
+def test_async_node_metrics(fake):
+    async def calls():
+        async with node_for(fake, AsyncNode, metrics=True) as node:
+            await node.getblockcount()
+            await node.getblockcount()
+            return node.metrics.snapshot()
+
+    assert asyncio.run(calls())['getblockcount']["calls"] == 2
+
+
+def test_disabled_by_default(fake):
+    with node_for(fake) as node:
+        node.getblockcount()
+        assert node.metrics is None
+
+
+def test_pool_merges_node_snapshots():
+    with FakeNode() as first, FakeNode() as second:
+        nodes = [node_for(first, name='first', metrics=True), node_for(second, name='second', metrics=True)]
+        with NodePool(nodes) as pool:
+            for _ in range(10):
+                pool.getblockcount()
+            merged = pool.metrics_snapshot()
+            text = pool.prometheus_metrics()
+    assert merged['getblockcount']["calls"] == 10
+    assert merged['getblockcount']["histogram"]['+Inf'] == 10
+    assert merged == merge_snapshots(node.metrics.snapshot() for node in nodes)
+    assert 'node="first"' in text
+
+
+def test_prometheus_exposition_format():
+    metrics = Metrics(buckets=(0.01, 0.1))
+    metrics.observe('getblock', 0.05, bytes_out=80, bytes_in=4000)
+    metrics.observe('getblock', 0.2, bytes_out=80, bytes_in=4000, error=True)
+    metrics.cache_hit('masternode count')
+    lines = prometheus_text({'main "1"': metrics.snapshot()}, prefix='test').splitlines()
+
+    labels = 'node="main \\"1\\"",method="getblock"'
+    for family in ('calls', 'errors', 'cache_hits', 'sent_bytes', 'received_bytes'):
+        assert f'# TYPE test_{family}_total counter' in lines
+    assert f'test_calls_total{{{labels}}} 2' in lines
+    assert f'test_errors_total{{{labels}}} 1' in lines
+    assert f'test_sent_bytes_total{{{labels}}} 160' in lines
+    assert f'test_received_bytes_total{{{labels}}} 8000' in lines
+    assert 'test_cache_hits_total{node="main \\"1\\"",method="masternode count"} 1' in lines
+    assert '# TYPE test_latency_seconds histogram' in lines
+    assert [line for line in lines if line.startswith(f'test_latency_seconds_bucket{{{labels}')] == [
+        f'test_latency_seconds_bucket{{{labels},le="0.01"}} 0',
+        f'test_latency_seconds_bucket{{{labels},le="0.1"}} 1',
+        f'test_latency_seconds_bucket{{{labels},le="+Inf"}} 2',
+    ]
+    assert f'test_latency_seconds_count{{{labels}}} 2' in lines
+    assert metrics.prometheus(node='main').startswith('# HELP orbital_rpc_calls_total ')
+
+
+def test_serve_metrics():
+    metrics = Metrics()
+    metrics.observe('getblockcount', 0.002)
+    server = serve_metrics(lambda: metrics.prometheus(node='main'), port=0)
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}'
+        with urlopen(f'{url}/metrics', timeout=5) as answer:
+            assert answer.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+            assert 'orbital_rpc_calls_total{node="main",method="getblockcount"} 1' in answer.read().decode()
+        with pytest.raises(HTTPError) as missing:
+            urlopen(f'{url}/other', timeout=5)
+        assert missing.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,110 @@
+"""
+    NotifyListener on a temporary UNIX datagram socket, caches of attached nodes against FakeNode
+"""
+import threading
+import time
+
+import pytest
+
+from boli_orbital_api import Node, TtlCache
+from boli_orbital_api.notify import (
+    AlertEvent,
+    BlockEvent,
+    InstantSendEvent,
+    NotifyListener,
+    WalletEvent,
+    main,
+    send_notification,
+)
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode, fake_hash
+from tests.conftest import node_for
+
+
+def until(condition, timeout: float = 5.0):
+    """Wait for a datagram to be handled by listener thread (wait_for() only sees events arriving later)"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'notification not handled'
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def listener(tmp_path):
+    with NotifyListener(str(tmp_path / 'notify.sock')) as listener:
+        yield listener
+
+
+def test_events_reach_callbacks_by_type(listener):
+    blocks, everything = [], []
+    listener.on(BlockEvent, blocks.append)
+    listener.on(None, everything.append)
+
+    send_notification(listener.path, 'wallet', 'a' * 64)
+    until(lambda: listener.last(WalletEvent) is not None)
+    send_notification(listener.path, 'block', fake_hash('block', TIP_HEIGHT))
+    until(lambda: listener.last(BlockEvent) is not None)
+
+    assert [event.blockhash for event in blocks] == [fake_hash('block', TIP_HEIGHT)]
+    assert [type(event) for event in everything] == [WalletEvent, BlockEvent]
+    assert listener.last(BlockEvent) is blocks[0]
+
+
+def test_invalid_datagrams_and_failing_callbacks_do_not_stop_listener(listener):
+    def broken(event):
+        raise RuntimeError('callback bug')
+
+    listener.on(AlertEvent, broken)
+    assert listener.dispatch(b'nonsense') is None
+    assert listener.dispatch(b'block') is None
+    assert isinstance(listener.dispatch(b'alert disk space low'), AlertEvent)
+
+    send_notification(listener.path, 'instantsend', 'b' * 64)
+    until(lambda: listener.last(InstantSendEvent) is not None)
+    assert listener.last(InstantSendEvent).txid == 'b' * 64
+    stats = listener.stats()
+    assert (stats["invalid"], stats["callback_errors"], stats["received"]) == (2, 1, 2)
+
+
+def test_wait_for_returns_next_event_or_times_out(listener):
+    assert listener.wait_for(BlockEvent, timeout=0.1) is None
+    timer = threading.Timer(0.05, send_notification, (listener.path, 'block', 'e' * 64))
+    timer.start()
+    assert listener.wait_for(BlockEvent, timeout=5).blockhash == 'e' * 64
+    timer.join()
+
+
+def test_first_block_notification_invalidates_attached_cache(listener):
+    tip = {'height': TIP_HEIGHT}
+    with FakeNode(results={'getblockcount': lambda params: tip['height']}) as fake:
+        cache = TtlCache(tip_check_interval=1.0)
+        with node_for(fake, ttl_cache=cache) as node:
+            listener.attach(node)
+            assert cache.tip_check_interval is None
+            assert node.getblockcount()['result'] == TIP_HEIGHT
+
+            tip['height'] = TIP_HEIGHT + 1
+            assert node.getblockcount()['result'] == TIP_HEIGHT  # Cached until a block is notified
+
+            send_notification(listener.path, 'block', fake_hash('block', TIP_HEIGHT + 1))
+            until(lambda: listener.last(BlockEvent) is not None)
+            assert node.getblockcount()['result'] == TIP_HEIGHT + 1
+
+            listener.detach(node)
+            assert cache.tip_check_interval == 1.0
+
+
+def test_wallet_notification_invalidates_attached_cache(listener):
+    cache = TtlCache(tip_check_interval=None)
+    cache.store('getinfo', [], {"result": {"blocks": TIP_HEIGHT, "balance": 1.0}, "errors": None})
+    with Node(ttl_cache=cache) as node:
+        listener.attach(node)
+        listener.dispatch(b'wallet ' + b'c' * 64)
+    assert cache.stats()["entries"] == 0
+
+
+def test_cli_sender(listener, tmp_path):
+    assert main([listener.path, 'block', 'd' * 64]) == 0
+    until(lambda: listener.last(BlockEvent) is not None)
+    assert listener.last(BlockEvent).blockhash == 'd' * 64
+    assert main([str(tmp_path / 'missing.sock'), 'block', 'd' * 64]) == 1
+    assert main([listener.path, 'unknown', 'x']) == 2
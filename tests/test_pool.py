@@ -0,0 +1,128 @@
+"""
+    NodePool routing: chain reads over replicas with failover and ejection, everything else on primary
+"""
+import time
+
+import pytest
+
+from boli_orbital_api import Node, NodePool
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode, fake_hash
+
+
+@pytest.fixture
+def fakes():
+    with FakeNode() as primary, FakeNode() as replica:
+        yield primary, replica
+
+
+@pytest.fixture
+def dead_port():
+    with FakeNode() as fake:
+        port = fake.port
+    return port
+
+
+def member(port: int, name: str) -> Node:
+    return Node(
+        rpc_user='user', rpc_password='password', rpc_port=port, name=name,
+        connect_timeout=1, retry_policy=None, circuit_breaker=False,
+    )
+
+
+def requests_per_fake(fakes) -> list[int]:
+    return [fake.requests_count for fake in fakes]
+
+
+def test_reads_spread_writes_pinned_to_primary(fakes):
+    primary, replica = fakes
+    with NodePool([member(primary.port, 'primary'), member(replica.port, 'replica')]) as pool:
+        for _ in range(20):
+            assert pool.getblockcount()['result'] == TIP_HEIGHT
+        assert all(count > 0 for count in requests_per_fake(fakes))
+
+        before = requests_per_fake(fakes)
+        for _ in range(5):
+            pool.getbalance()
+        assert requests_per_fake(fakes) == [before[0] + 5, before[1]]
+        assert sum(stats["calls"] for stats in pool.stats()) == 25
+
+
+def test_tracker_and_backfill_reads_fail_over(fakes, dead_port):
+    _, replica = fakes
+    replica.results['getbestblockhash'] = fake_hash('block', TIP_HEIGHT)
+    replica.results['getrawmempool'] = [fake_hash('mempool', 0)]
+    pool = NodePool([member(dead_port, 'primary'), member(replica.port, 'replica')], max_failures=100)
+    for _ in range(3):  # ChainTipTracker, WalletIndex and ZmqSubscriber calls
+        blockhash = pool.raw_call('getbestblockhash')['result']
+        assert pool.raw_call('getblockheader', [blockhash])['result']['height'] == TIP_HEIGHT
+        assert pool.raw_call('getrawmempool')['result'] == [fake_hash('mempool', 0)]
+    pool.close()
+
+
+def test_failed_reads_go_to_next_replica_and_eject(fakes, dead_port):
+    primary, _ = fakes
+    pool = NodePool([member(primary.port, 'primary'), member(dead_port, 'dead')], max_failures=2, readmit_after=0.3)
+    for _ in range(10):
+        assert pool.getblockhash(TIP_HEIGHT)['result'] == fake_hash('block', TIP_HEIGHT)
+
+    dead = pool.stats()[1]
+    assert dead["admitted"] is False and dead["errors"] == 2
+    time.sleep(0.4)
+    assert pool.stats()[1]["admitted"] is True  # Tried again after readmit_after
+    pool.close()
+
+
+def test_writes_are_not_retried_elsewhere(fakes, dead_port):
+    _, replica = fakes
+    pool = NodePool([member(dead_port, 'primary'), member(replica.port, 'replica')])
+    assert isinstance(pool.getbalance()['errors'], str)
+    assert replica.requests_count == 0
+    pool.close()
+
+
+def test_read_batches_fail_over(fakes, dead_port):
+    primary, _ = fakes
+    pool = NodePool([member(dead_port, 'dead'), member(primary.port, 'alive')], max_failures=100)
+    for _ in range(5):
+        with pool.batch() as batch:
+            count, blockhash = batch.getblockcount(), batch.getblockhash(TIP_HEIGHT)
+        assert count.result == {'result': TIP_HEIGHT, 'errors': False}
+        assert blockhash.result['result'] == fake_hash('block', TIP_HEIGHT)
+
+    with pool.batch() as batch:
+        balance = batch.getbalance()  # Not a chain read: primary only
+        count = batch.getblockcount()
+    assert isinstance(balance.result['errors'], str) and isinstance(count.result['errors'], str)
+    pool.close()
+
+
+def test_stream_routed_with_failover(fakes, dead_port):
+    primary, replica = fakes
+    pool = NodePool([member(dead_port, 'dead'), member(replica.port, 'replica')], max_failures=100)
+    for _ in range(3):
+        stream = pool.stream('masternodelist', ['status'])
+        assert len(dict(stream)) == 1000 and stream.errors is None
+
+    stream = pool.stream('listtransactions', ['*', 10])  # Wallet: primary only
+    assert list(stream) == [] and isinstance(stream.errors, str)
+    pool.close()
+
+
+def test_probe_readmits_nodes_that_answer(fakes):
+    primary, replica = fakes
+    pool = NodePool([member(primary.port, 'primary'), member(replica.port, 'replica')], readmit_after=60)
+    pool._members[1].ejected_until = time.monotonic() + 60
+    assert pool.stats()[1]["admitted"] is False
+    assert pool.probe() is True
+    assert pool.stats()[1]["admitted"] is True
+    pool.close()
+
+
+def test_passthrough_and_deadline_through_pool(fakes):
+    primary, replica = fakes
+    with NodePool([member(primary.port, 'primary'), member(replica.port, 'replica')]) as pool:
+        with pool.passthrough():
+            count = pool.getblockcount()
+        assert bytes(count['result']) == str(TIP_HEIGHT).encode()
+        with pool.deadline(5):
+            assert pool.getblockcount()['result'] == TIP_HEIGHT
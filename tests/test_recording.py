@@ -0,0 +1,98 @@
+"""
+    RecordingTransport and ReplayTransport: record traffic against FakeNode, replay it without a node
+"""
+import gzip
+import struct
+
+import pytest
+from orjson import loads
+
+from boli_orbital_api import Node, RecordingTransport, ReplayTransport, read_recording
+from boli_orbital_api.transport import RequestsTransport, TransportError
+from benchmarks.fake_node import TIP_HEIGHT, fake_hash
+
+
+@pytest.fixture
+def recording(fake, tmp_path) -> str:
+    """Path of a recording of a few single calls, a batch and an RPC error"""
+    path = str(tmp_path / 'traffic.rec')
+    transport = RecordingTransport(RequestsTransport(f'http://{fake.host}:{fake.port}/', ('user', 'password')), path)
+    with Node(transport=transport, retry_policy=None) as node:
+        node.getblockcount()
+        node.getblockhash(TIP_HEIGHT)
+        node.getblockhash(TIP_HEIGHT - 1)
+        fake.results['getblockcount'] = TIP_HEIGHT + 1
+        node.getblockcount()
+        with node.batch() as batch:
+            batch.getdifficulty()
+            batch.getblockhash(TIP_HEIGHT - 2)
+        node.raw_call('unknown_method')
+        assert transport.records == 7
+    return path
+
+
+def test_file_framing(recording):
+    with gzip.open(recording, 'rb') as file:
+        assert file.read(8) == b'ORBREC1\n'
+        header = struct.Struct('<dfIII')
+        records = []
+        while chunk := file.read(header.size):
+            offset, latency, status, request_length, response_length = header.unpack(chunk)
+            request, response = loads(file.read(request_length)), loads(file.read(response_length))
+            records.append((status, request, response))
+            assert offset >= 0 and latency >= 0
+            assert set(response) == {"result", "error"}  # No id
+    assert records[0] == (200, ['getblockcount', []], {"result": TIP_HEIGHT, "error": None})
+    assert records[-1][0] == 404 and records[-1][1][0] == 'unknown_method'
+
+
+def test_read_recording(recording, tmp_path):
+    records = list(read_recording(recording))
+    assert [record.method for record in records] == [
+        'getblockcount', 'getblockhash', 'getblockhash', 'getblockcount', 'getdifficulty', 'getblockhash',
+        'unknown_method',
+    ]
+    assert records[1].params == [TIP_HEIGHT]
+    assert [record.offset for record in records] == sorted(record.offset for record in records)
+    assert loads(records[3].response)["result"] == TIP_HEIGHT + 1
+
+    other = tmp_path / 'other.gz'
+    with gzip.open(other, 'wb') as file:
+        file.write(b'not a recording')
+    with pytest.raises(ValueError):
+        list(read_recording(str(other)))
+
+
+def test_replay_round_trip(recording):
+    replay = ReplayTransport(recording)
+    assert replay.methods() == {'getblockcount': 2, 'getblockhash': 3, 'getdifficulty': 1, 'unknown_method': 1}
+    with Node(transport=replay, retry_policy=None) as node:
+        assert node.getblockhash(TIP_HEIGHT)['result'] == fake_hash('block', TIP_HEIGHT)
+        # Answers of a call recorded many times come back in turn
+        assert [node.getblockcount()['result'] for _ in range(3)] == [TIP_HEIGHT, TIP_HEIGHT + 1, TIP_HEIGHT]
+        # Recorded in a batch, replayed alone, and the other way round
+        assert node.getblockhash(TIP_HEIGHT - 2)['result'] == fake_hash('block', TIP_HEIGHT - 2)
+        with node.batch() as batch:
+            first, difficulty = batch.getblockhash(TIP_HEIGHT - 1), batch.getdifficulty()
+        assert first.result['result'] == fake_hash('block', TIP_HEIGHT - 1)
+        assert difficulty.result['errors'] is False
+        assert node.raw_call('unknown_method')['errors']['code'] == -32601  # Recorded error replayed
+    assert replay.misses == 0
+
+
+def test_replay_unknown_request(recording):
+    replay = ReplayTransport(recording)
+    with Node(transport=replay, retry_policy=None) as node:
+        answer = node.getblockhash(1)
+        with node.batch() as batch:
+            known, unknown = batch.getblockcount(), batch.getblockhash(2)
+    assert answer['result'] is None and answer['errors']['code'] == -32603
+    assert 'Not in recording: getblockhash [1]' in answer['errors']['message']
+    assert known.result['result'] == TIP_HEIGHT and unknown.result['errors']['code'] == -32603
+    assert replay.misses == 2
+
+
+def test_replay_speed_and_timeout(recording):
+    replay = ReplayTransport(recording, speed=1e-9)  # Recorded latencies become far longer than any timeout
+    with pytest.raises(TransportError):
+        replay.request(b'{"jsonrpc":"2.0","id":1,"method":"getblockcount","params":[]}', timeout=0.01)
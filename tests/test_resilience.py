@@ -0,0 +1,196 @@
+"""
+    Retries, circuit breaker and deadlines of Node and AsyncNode
+"""
+import asyncio
+import time
+
+import pytest
+
+from boli_orbital_api.aio import AsyncNode
+from boli_orbital_api.resilience import CircuitBreaker, RetryPolicy, current_deadline, deadline
+from boli_orbital_api.rpc import Node
+from boli_orbital_api.transport import Transport
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode
+from tests.conftest import node_for
+
+
+class FlakyNode(FakeNode):
+    """Answers the first `failures` calls with 503 (or RPC_IN_WARMUP when warmup is set)"""
+
+    def __init__(self, failures: int = 0, warmup: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.warmup = warmup
+
+    def _answer_one(self, request: dict) -> tuple[int, dict]:
+        if self.failures <= 0:
+            return super()._answer_one(request)
+        self.failures -= 1
+        if self.warmup:
+            error = {'code': -28, 'message': 'Loading block index...'}
+            return 500, {'result': None, 'error': error, 'id': request.get('id')}
+        return 503, {'result': None, 'error': None, 'id': request.get('id')}
+
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+
+
+def resilient_node(fake: FakeNode, cls=Node, **kwargs):
+    """node_for with fast retries and no breaker, unless given"""
+    return node_for(fake, cls, **{'retry_policy': FAST_RETRIES, 'circuit_breaker': False, **kwargs})
+
+
+def test_every_node_gets_its_own_retry_policy():
+    first, second = Node(transport='socket'), Node(transport='socket')
+    assert isinstance(first.retry_policy, RetryPolicy)
+    first.retry_policy.max_attempts = 10
+    assert second.retry_policy.max_attempts == 3
+    assert AsyncNode().retry_policy is not AsyncNode().retry_policy
+    assert Node(transport='socket', retry_policy=None).retry_policy is None
+    assert AsyncNode(retry_policy=None).retry_policy is None
+
+
+def test_retry_delays_are_bounded():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+    assert all(0 <= policy.delay(attempt) <= min(0.3, 0.1 * 2 ** attempt) for attempt in range(8) for _ in range(20))
+
+
+# ┏━┓┏━╸╺┳╸┏━┓╻┏━╸┏━┓
+# ┣┳┛┣╸  ┃ ┣┳┛┃┣╸ ┗━┓
+# ╹┗╸┗━╸ ╹ ╹┗╸╹┗━╸┗━┛
+@pytest.mark.parametrize('warmup', [False, True])
+def test_transient_failures_of_idempotent_calls_are_retried(warmup):
+    with FlakyNode(failures=2, warmup=warmup) as fake, resilient_node(fake) as node:
+        assert node.getblockcount() == {'result': TIP_HEIGHT, 'errors': False}
+        assert node.retries == 2
+        assert fake.requests_count == 3
+
+
+def test_retries_give_up_after_max_attempts():
+    with FlakyNode(failures=5) as fake, resilient_node(fake) as node:
+        answer = node.getblockcount()
+        assert answer['result'] is None and answer['errors'].startswith('HTTP 503')
+        assert fake.requests_count == 3
+
+
+def test_calls_that_send_are_never_retried():
+    with FlakyNode(failures=1) as fake, resilient_node(fake) as node:
+        answer = node.raw_call('sendrawtransaction', ['0100'])
+        assert answer['errors'].startswith('HTTP 503')
+        assert fake.requests_count == 1 and node.retries == 0
+
+
+def test_rpc_errors_are_not_retried():
+    with FakeNode() as fake, resilient_node(fake) as node:
+        assert node.raw_call('unknown_method')['errors']['code'] == -32601
+        assert fake.requests_count == 1
+
+
+def test_async_node_retries():
+    async def run(fake):
+        async with resilient_node(fake, AsyncNode) as node:
+            return await node.getblockcount(), node.retries
+
+    with FlakyNode(failures=2) as fake:
+        answer, retries = asyncio.run(run(fake))
+    assert answer == {'result': TIP_HEIGHT, 'errors': False} and retries == 2
+
+
+# ┏┓ ┏━┓┏━╸┏━┓╻┏ ┏━╸┏━┓
+# ┣┻┓┣┳┛┣╸ ┣━┫┣┻┓┣╸ ┣┳┛
+# ┗━┛╹┗╸┗━╸╹ ╹╹ ╹┗━╸╹┗╸
+def test_breaker_opens_fails_fast_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.2)
+    with FlakyNode(failures=3) as fake, resilient_node(fake, retry_policy=None, circuit_breaker=breaker) as node:
+        for _ in range(3):
+            node.getblockcount()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        answer = node.getblockcount()
+        assert answer['errors'].startswith('Circuit breaker open')
+        assert fake.requests_count == 3  # Failed fast
+
+        time.sleep(0.25)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert node.getblockcount()['result'] == TIP_HEIGHT  # Trial call
+        assert breaker.stats() == {
+            "state": "closed", "consecutive_failures": 0, "successes": 1, "failures": 3, "rejected": 1, "opened": 1
+        }
+
+
+def test_breaker_ignores_rpc_errors():
+    breaker = CircuitBreaker(failure_threshold=2)
+    with FakeNode() as fake, resilient_node(fake, circuit_breaker=breaker) as node:
+        for _ in range(5):
+            node.raw_call('unknown_method')
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_opens_breaker_again():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record(False)
+    time.sleep(0.06)
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # One trial at a time
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_unexpected_transport_exceptions_are_errors_and_breaker_failures():
+    class BrokenTransport(Transport):  # e.g. malformed Content-Length, a bug in a custom transport
+        def request(self, body, timeout=None):
+            raise ValueError("invalid literal for int() with base 10: 'x'")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    node = Node(transport=BrokenTransport(), retry_policy=None, circuit_breaker=breaker)
+    answer = node.getblockcount()
+    assert answer['result'] is None and 'ValueError' in answer['errors']
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert 'ValueError' in node.getblockcount()['errors']  # Failed trial opens breaker again
+    time.sleep(0.06)
+    assert breaker.allow() is True  # Not locked out by a trial left in flight
+
+    streaming = Node(transport=BrokenTransport(), circuit_breaker=False)
+    assert streaming.stream('masternodelist').errors.startswith('ValueError')
+
+
+# ╺┳┓┏━╸┏━┓╺┳┓╻  ╻┏┓╻┏━╸┏━┓
+#  ┃┃┣╸ ┣━┫ ┃┃┃  ┃┃┗┫┣╸ ┗━┓
+# ╺┻┛┗━╸╹ ╹╺┻┛┗━╸╹╹ ╹┗━╸┗━┛
+def test_nested_deadlines_keep_earliest():
+    assert current_deadline() is None
+    with deadline(10) as outer:
+        with deadline(60) as inner:
+            assert inner == outer == current_deadline()
+        with deadline(1) as inner:
+            assert inner < outer
+    assert current_deadline() is None
+
+
+def test_deadline_bounds_call_and_retries():
+    with FakeNode(latency=0.3) as fake, resilient_node(fake) as node:
+        started = time.monotonic()
+        with node.deadline(0.1):
+            answer = node.getblockcount()
+        assert answer['result'] is None and isinstance(answer['errors'], str)
+        assert time.monotonic() - started < 0.3
+
+        with node.deadline(0.1):
+            time.sleep(0.15)
+            assert node.getblockcount()['errors'].startswith('Deadline exceeded')
+
+
+def test_method_budgets_and_call_timeout():
+    with FakeNode(latency=0.2) as fake, resilient_node(fake, budgets={'getdifficulty': 0.05}) as node:
+        assert isinstance(node.getdifficulty()['errors'], str)
+        assert isinstance(node.raw_call('getblockcount', timeout=0.05)['errors'], str)
+        assert node.getblockcount()['result'] == TIP_HEIGHT
+
+
+def test_deadline_follows_map_workers():
+    with FakeNode(latency=0.2) as fake, resilient_node(fake) as node:
+        with node.deadline(0.05):
+            answers = node.map('getblockhash', [1, 2, 3])
+        assert all(isinstance(answer['errors'], str) for answer in answers)
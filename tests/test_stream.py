@@ -0,0 +1,141 @@
+"""
+    node.stream() (results decoded while body downloads) and passthrough mode (results as raw JSON bytes)
+"""
+import asyncio
+
+import pytest
+from orjson import dumps, loads
+
+from boli_orbital_api import AsyncNode, Node, TtlCache
+from boli_orbital_api.stream import ResultScanner
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode
+from tests.conftest import node_for
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"masternodes": 300, "wallet_txs": 500}
+
+
+def scan(body: bytes, chunk_size: int) -> tuple[list, ResultScanner]:
+    scanner = ResultScanner()
+    items = []
+    for start in range(0, len(body), chunk_size):
+        items += scanner.feed(body[start:start + chunk_size])
+    return items, scanner
+
+
+# ┏━┓┏━╸┏━┓┏┓╻┏┓╻┏━╸┏━┓
+# ┗━┓┃  ┣━┫┃┗┫┃┗┫┣╸ ┣┳┛
+# ┗━┛┗━╸╹ ╹╹ ╹╹ ╹┗━╸╹┗╸
+RESULTS = [
+    [1, "two", {"three": [3, {"}": "]"}]}, [], None, -4.5e10],
+    {"a\\\"]": {"b": [1, 2]}, "c": "x,y:{z}", "": []},
+    [],
+    {},
+    "scalar, with [brackets]",
+    12345,
+    None,
+]
+
+
+@pytest.mark.parametrize('result', RESULTS)
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 20])
+def test_scanner_splits_any_result(result, chunk_size):
+    body = dumps({"result": result, "error": None, "id": 7})
+    items, scanner = scan(body, chunk_size)
+    assert scanner.done
+    assert scanner.members["error"] is None and scanner.members["id"] == 7
+    if isinstance(result, list):
+        assert scanner.kind == b'[' and items == result
+    elif isinstance(result, dict):
+        assert scanner.kind == b'{' and dict(items) == result
+    else:
+        assert scanner.kind is None and items == [] and scanner.members["result"] == result
+
+
+def test_scanner_keeps_error_member():
+    body = b'{"result": null, "error": {"code": -5, "message": "No such mempool transaction"}, "id": 1}'
+    items, scanner = scan(body, 3)
+    assert items == [] and scanner.members["error"]["code"] == -5
+
+
+# ┏━┓╺┳╸┏━┓┏━╸┏━┓┏┳┓
+# ┗━┓ ┃ ┣┳┛┣╸ ┣━┫┃┃┃
+# ┗━┛ ╹ ╹┗╸┗━╸╹ ╹╹ ╹
+@pytest.mark.parametrize('transport', ['requests', 'socket'])
+def test_stream_matches_raw_call(fake, transport):
+    with node_for(fake, transport=transport) as node:
+        stream = node.stream('masternodelist', ['full'], chunk_size=4096)
+        assert dict(stream) == node.raw_call('masternodelist', ['full'])['result']
+        assert stream.errors is None
+
+        stream = node.stream('listtransactions', ['*', 500])
+        assert list(stream) == node.raw_call('listtransactions', ['*', 500])['result']
+
+        assert list(node.stream('getblockcount')) == [TIP_HEIGHT]
+
+
+@pytest.mark.parametrize('transport', ['requests', 'socket'])
+def test_stream_errors(fake, transport):
+    with node_for(fake, transport=transport) as node:
+        stream = node.stream('unknown_method')
+        assert list(stream) == [] and stream.errors['code'] == -32601
+        assert node.getblockcount()['result'] == TIP_HEIGHT  # Connection still usable
+
+
+def test_stream_closed_early_releases_connection(fake):
+    with node_for(fake, transport='socket', pool_size=1) as node:
+        for _ in range(3):
+            stream = node.stream('masternodelist', ['full'], chunk_size=1024)
+            next(iter(stream))
+            stream.close()
+        assert node.getblockcount()['result'] == TIP_HEIGHT
+
+
+def test_stream_unreachable_node():
+    with FakeNode() as gone:
+        port = gone.port
+    node = Node('user', 'password', rpc_port=port, connect_timeout=1, circuit_breaker=False)
+    stream = node.stream('masternodelist')
+    assert list(stream) == [] and isinstance(stream.errors, str)
+    assert node._valid_node is False
+
+
+# ┏━┓┏━┓┏━┓┏━┓╺┳╸╻ ╻┏━┓┏━┓╻ ╻┏━╸╻ ╻
+# ┣━┛┣━┫┗━┓┗━┓ ┃ ┣━┫┣┳┛┃ ┃┃ ┃┃╺┓┣━┫
+# ╹  ╹ ╹┗━┛┗━┛ ╹ ╹ ╹╹┗╸┗━┛┗━┛┗━┛╹ ╹
+def test_passthrough_returns_raw_result(fake):
+    with node_for(fake) as node:
+        blockhash = node.getbestblockhash()['result']
+        decoded = node.getblock(blockhash)['result']
+        with node.passthrough():
+            raw = node.getblock(blockhash)
+            missing = node.raw_call('unknown_method')
+        assert isinstance(raw['result'], memoryview)
+        assert loads(bytes(raw['result'])) == decoded
+        assert missing == {"result": None, 'errors': {'code': -32601, 'message': 'Method not found'}}
+
+        assert isinstance(node.getblockcount()['result'], int)  # Mode ends with the block
+        assert loads(node.raw_call('getblockcount', passthrough=True)['result']) == TIP_HEIGHT
+
+
+def test_passthrough_skips_caches(fake):
+    cache = TtlCache(tip_check_interval=None)
+    with node_for(fake, ttl_cache=cache) as node:
+        node.getdifficulty()
+        requests = fake.requests_count
+        with node.passthrough():
+            node.getdifficulty()
+        assert fake.requests_count == requests + 1
+    assert cache.stats()["methods"]["getdifficulty"] == {"hits": 0, "misses": 1, "expired": 0}
+
+
+def test_async_passthrough(fake):
+    async def run():
+        async with node_for(fake, AsyncNode) as node:
+            with node.passthrough():
+                return await node.getblockcount()
+
+    answer = asyncio.run(run())
+    assert bytes(answer['result']) == str(TIP_HEIGHT).encode()
@@ -0,0 +1,150 @@
+"""
+    ChainTipTracker against FakeNode serving a chain the tests extend and reorganize
+"""
+import threading
+
+import pytest
+
+from boli_orbital_api import ChainTipTracker
+from benchmarks.fake_node import fake_hash
+from tests.conftest import node_for
+
+
+class Chain:
+    """Best chain as a list of hashes (index is height), old branches stay known to getblockheader"""
+
+    def __init__(self, height: int):
+        self.hashes = [fake_hash('block', 'main', h) for h in range(height + 1)]
+        self.headers = {}
+        self._index(self.hashes)
+
+    def _index(self, hashes: list[str]):
+        for height, blockhash in enumerate(hashes):
+            self.headers.setdefault(blockhash, {
+                "hash": blockhash, "height": height, "previousblockhash": hashes[height - 1] if height else None,
+            })
+
+    def extend(self, count: int, branch: str = 'main'):
+        start = len(self.hashes)
+        self.hashes += [fake_hash('block', branch, h) for h in range(start, start + count)]
+        self._index(self.hashes)
+
+    def reorg(self, depth: int, count: int, branch: str = 'fork'):
+        """Replace the last depth blocks with count blocks of another branch"""
+        del self.hashes[len(self.hashes) - depth:]
+        self.extend(count, branch)
+
+    def results(self) -> dict:
+        def header(params):
+            header = self.headers[params[0]]
+            on_best_chain = self.hashes[header["height"]:header["height"] + 1] == [params[0]]
+            return {**header, "confirmations": len(self.hashes) - header["height"] if on_best_chain else -1}
+
+        return {
+            'getbestblockhash': lambda params: self.hashes[-1],
+            'getblockhash': lambda params: self.hashes[params[0]],
+            'getblockheader': header,
+        }
+
+
+@pytest.fixture
+def chain():
+    return Chain(100)
+
+
+@pytest.fixture
+def fake_options(chain) -> dict:
+    return {"results": chain.results()}
+
+
+@pytest.fixture
+def node(fake):
+    with node_for(fake) as node:
+        yield node
+
+
+def heights(events) -> list[int]:
+    return [event.height for event in events]
+
+
+def test_new_blocks_in_order(chain, node):
+    tracker = ChainTipTracker(node, depth=20)
+    assert heights(tracker.poll()) == [100]
+    assert tracker.poll() == []
+
+    chain.extend(3)
+    events = tracker.poll()
+    assert heights(events) == [101, 102, 103]
+    assert [event.blockhash for event in events] == chain.hashes[101:104]
+    assert [event.previousblockhash for event in events] == chain.hashes[100:103]
+    assert not any(event.reorg for event in events)
+
+
+def test_gap_longer_than_depth_is_not_a_reorg(chain, node):
+    tracker = ChainTipTracker(node, depth=20)
+    tracker.poll()
+    chain.extend(10)
+    tracker.poll()
+
+    chain.extend(27)
+    events = tracker.poll()
+    assert heights(events) == list(range(111, 138))
+    assert [event.blockhash for event in events] == chain.hashes[111:138]
+    assert [event.previousblockhash for event in events] == chain.hashes[110:137]
+    assert not any(event.reorg or event.disconnected or event.skipped for event in events)
+    assert tracker.stats()["reorgs"] == 0
+
+
+def test_shallow_reorg(chain, node):
+    tracker = ChainTipTracker(node, depth=20)
+    tracker.poll()
+    chain.extend(5)
+    tracker.poll()
+    stale = chain.hashes[103:106]
+
+    chain.reorg(3, 4)
+    events = tracker.poll()
+    assert heights(events) == [103, 104, 105, 106]
+    assert events[0].reorg and events[0].disconnected == tuple(reversed(stale))
+    assert events[0].previousblockhash == chain.hashes[102]
+    assert not any(event.reorg for event in events[1:])
+    assert tracker.stats()["reorgs"] == 1
+
+
+def test_reorg_deeper_than_depth(chain, node):
+    tracker = ChainTipTracker(node, depth=5)
+    tracker.poll()
+    chain.extend(10)
+    tracker.poll()
+    known = chain.hashes[106:111]
+
+    chain.reorg(8, 12)  # Fork at 102, below the 5 known blocks (106-110)
+    events = tracker.poll()
+    assert events[0].reorg and events[0].disconnected == tuple(reversed(known))
+    assert heights(events) == list(range(106, 115))
+    assert [event.blockhash for event in events] == chain.hashes[106:115]
+    assert tracker.tip.blockhash == chain.hashes[-1]
+
+
+def test_backfill_is_bounded(chain, node):
+    tracker = ChainTipTracker(node, depth=5, max_backfill=10)
+    tracker.poll()
+    chain.extend(30)
+    events = tracker.poll()
+    assert events[0].skipped == 15  # 30 new, 5 walked back, 10 backfilled
+    assert heights(events) == list(range(116, 131))
+
+
+def test_consumers_share_one_poller(chain, node):
+    tracker = ChainTipTracker(node, min_interval=0.01, max_interval=0.05)
+    seen = [[], []]
+    tracker.on_block(lambda event: seen[0].append(event.height))
+    tracker.on_block(lambda event: seen[1].append(event.height))
+    with tracker:
+        assert tracker.wait_for_new_block(timeout=5).height == 100
+        timer = threading.Timer(0.1, lambda: (chain.extend(2), tracker.poke()))
+        timer.start()
+        assert tracker.wait_for_new_block(timeout=5).height == 102
+        timer.join()
+    assert seen[0] == seen[1] == [100, 101, 102]
+    assert tracker.stats()["consumers"] == 2
@@ -0,0 +1,112 @@
+"""
+    node.iter_transactions(): wallet transactions newest first over adaptive listtransactions pages
+"""
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_node import FakeNode, fake_hash
+from tests.conftest import node_for
+
+WALLET_TXS = 500
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"wallet_txs": WALLET_TXS}
+
+
+def recorded_pages(fake: FakeNode) -> list[list]:
+    """Params of every listtransactions call"""
+    pages = []
+    listtransactions = fake.results['listtransactions']
+    fake.results['listtransactions'] = lambda params: pages.append(params) or listtransactions(params)
+    return pages
+
+
+def test_walks_whole_wallet_newest_first(fake):
+    pages = recorded_pages(fake)
+    with node_for(fake) as node:
+        txids = [tx['result']['txid'] for tx in node.iter_transactions(page_size=20)]
+    assert txids == [fake_hash('wallet', n) for n in range(WALLET_TXS)]
+    sizes = [params[1] for params in pages]
+    assert sizes[0] == 20 and max(sizes) > 20  # Fast pages grow
+    assert all(params[0] == '*' and params[3] is False for params in pages)
+
+
+def test_page_size_limits(fake, caplog):
+    pages = recorded_pages(fake)
+    with node_for(fake) as node:
+        assert len(list(node.iter_transactions(page_size=10, max_page_size=30))) == WALLET_TXS
+        assert max(params[1] for params in pages) == 30
+        pages.clear()
+        assert len(list(node.iter_transactions(page_size=10, max_page_bytes=1))) == WALLET_TXS
+        assert {params[1] for params in pages} == {10, 1}  # Heavy pages shrink to one entry
+    assert 'no overlap' not in caplog.text
+
+
+def test_stop_at_known_txid(fake):
+    with node_for(fake) as node:
+        txids = [tx['result']['txid'] for tx in node.iter_transactions(stop_at=fake_hash('wallet', 42), page_size=10)]
+    assert txids == [fake_hash('wallet', n) for n in range(42)]
+
+
+def test_new_transactions_while_walking_are_not_repeated(fake):
+    listtransactions = fake.results['listtransactions']
+    arrived = []
+
+    def shifting(params):  # A new transaction arrives before every page after the first
+        count, skip = params[1], params[2] + len(arrived)
+        page = listtransactions([params[0], count, skip])
+        arrived.append(1)
+        return page
+
+    fake.results['listtransactions'] = shifting
+    with node_for(fake) as node:
+        txids = [tx['result']['txid'] for tx in node.iter_transactions(page_size=16, overlap=8)]
+    assert txids == [fake_hash('wallet', n) for n in range(WALLET_TXS)]
+
+
+def test_failed_page_yields_error_and_ends(fake):
+    del fake.results['listtransactions']
+    with node_for(fake, retry_policy=None) as node:
+        answers = list(node.iter_transactions())
+    assert len(answers) == 1 and answers[0]['result'] is None and answers[0]['errors']['code'] == -32601
+
+
+def test_stopped_early_cancels_prefetched_page():
+    with FakeNode(wallet_txs=WALLET_TXS) as fake:
+        pages = recorded_pages(fake)
+        node = node_for(fake, pool_size=1)
+        executor = node._get_executor()
+        # One worker: first page waits behind a sleeper, a second sleeper queued meanwhile holds the prefetch
+        sleepers = [executor.submit(time.sleep, 0.2)]
+        threading.Timer(0.1, lambda: sleepers.append(executor.submit(time.sleep, 0.2))).start()
+
+        transactions = node.iter_transactions(page_size=10)
+        assert next(transactions)['result']['txid'] == fake_hash('wallet', 0)
+        transactions.close()
+        node.close()
+    assert len(sleepers) == 2 and len(pages) == 1
+
+
+def test_moves_on_several_pages_are_all_yielded(fake):
+    listtransactions = fake.results['listtransactions']
+
+    def with_moves(params):  # Every third entry is a distinct "move" between accounts
+        skip = params[2]
+        page = listtransactions(params)
+        for index, n in enumerate(reversed(range(skip, skip + len(page)))):
+            if n % 3 == 0:
+                page[index] = {
+                    "account": "savings", "otheraccount": "", "category": "move", "amount": -1.0 - n,
+                    "time": 1500000000 + n, "comment": "",
+                }
+        return page
+
+    fake.results['listtransactions'] = with_moves
+    with node_for(fake) as node:
+        entries = [tx['result'] for tx in node.iter_transactions(page_size=8, overlap=2)]
+    assert len(entries) == WALLET_TXS
+    assert len([entry for entry in entries if entry['category'] == 'move']) == len(range(0, WALLET_TXS, 3))
@@ -0,0 +1,165 @@
+"""
+    Transports against FakeNode: keep-alive reuse, pipelining, streaming and connections closed by node
+"""
+import socket
+import threading
+import time
+
+import pytest
+from orjson import dumps, loads
+
+from boli_orbital_api import Node
+from boli_orbital_api.transport import RequestsTransport, SocketTransport, Transport, TransportError
+from benchmarks.fake_node import TIP_HEIGHT, FakeNode
+
+
+def body(method: str, params=None, id_: int = 1) -> bytes:
+    return dumps({"jsonrpc": "2.0", "id": id_, "method": method, "params": params or []})
+
+
+@pytest.fixture
+def idle_closing():
+    with FakeNode(idle_timeout=0.1) as fake:  # Like bolivarcoind after rpcservertimeout
+        yield fake
+
+
+def transport_for(fake: FakeNode, **kwargs) -> SocketTransport:
+    return SocketTransport(fake.host, fake.port, 'user', 'password', **kwargs)
+
+
+def serve_once(response: bytes) -> int:
+    """Port of a server answering one request with raw response bytes, then closing"""
+    listener = socket.create_server(('127.0.0.1', 0))
+
+    def answer():
+        connection, _ = listener.accept()
+        with connection, listener:
+            connection.recv(65536)
+            connection.sendall(response)
+
+    threading.Thread(target=answer, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+@pytest.mark.parametrize('make', [
+    lambda fake: transport_for(fake),
+    lambda fake: RequestsTransport(f'http://{fake.host}:{fake.port}/', ('user', 'password')),
+])
+def test_request_and_stream(fake, make):
+    with make(fake) as transport:
+        status, content = transport.request(body('getblockcount'))
+        assert status == 200 and loads(content) == {'result': TIP_HEIGHT, 'error': None, 'id': 1}
+
+        status, content = transport.request(body('unknown_method', id_=2))
+        assert status == 404 and loads(content)['error']['code'] == -32601
+
+        status, chunks, close = transport.stream(body('masternodelist', ['full']), chunk_size=4096)
+        content = b''.join(chunks)
+        close()
+        assert status == 200 and len(loads(content)['result']) == 1000
+
+
+def test_keep_alive_reuses_one_connection(fake):
+    transport = transport_for(fake, pool_size=2)
+    for _ in range(5):
+        transport.request(body('getblockcount'))
+    assert len(transport._idle) == 1
+    transport.close()
+    assert transport._idle == []
+
+    transport = transport_for(fake, keep_alive=False)
+    for _ in range(3):
+        assert transport.request(body('getblockcount'))[0] == 200
+    assert transport._idle == []
+
+
+def test_pipelined_answers_in_order(fake):
+    transport = transport_for(fake)
+    before = fake.requests_count
+    answers = transport.request_many([body('getblockhash', [height], height) for height in range(10)])
+    assert [loads(content)['id'] for _, content in answers] == list(range(10))
+    assert fake.requests_count == before + 10
+    assert len(transport._idle) == 1
+    transport.close()
+
+
+def test_chunked_and_until_close_bodies():
+    chunked = (
+        b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+        b'5\r\n{"res\r\n20\r\nult": 7, "error": null, "id": 1}\r\n0\r\n\r\n'
+    )
+    transport = SocketTransport(port=serve_once(chunked))
+    assert transport.request(body('getblockcount')) == (200, b'{"result": 7, "error": null, "id": 1}')
+    assert len(transport._idle) == 1
+
+    until_close = b'HTTP/1.0 200 OK\r\n\r\n{"result": 8, "error": null, "id": 1}'
+    transport = SocketTransport(port=serve_once(until_close))
+    assert transport.request(body('getblockcount')) == (200, b'{"result": 8, "error": null, "id": 1}')
+    assert transport._idle == []
+
+
+def test_failures_raise_transport_error():
+    with FakeNode(latency=0.5) as slow:
+        with pytest.raises(TransportError):
+            transport_for(slow).request(body('getblockcount'), timeout=0.1)
+        with pytest.raises(TransportError):
+            RequestsTransport(f'http://{slow.host}:{slow.port}/').request(body('getblockcount'), timeout=0.1)
+        port = slow.port
+    with pytest.raises(TransportError):
+        SocketTransport(port=port, connect_timeout=1).request(body('getblockcount'))
+    with pytest.raises(TransportError):
+        SocketTransport(port=serve_once(b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{}')).request(b'{}')
+
+
+class CountingTransport(Transport):
+    """Custom transport: counts requests, delegates to another one"""
+
+    def __init__(self, transport: Transport):
+        self.transport = transport
+        self.requests = 0
+
+    def request(self, body: bytes, timeout: float | None = None) -> tuple[int, bytes]:
+        self.requests += 1
+        return self.transport.request(body, timeout)
+
+
+def test_node_uses_given_transport(fake):
+    transport = CountingTransport(transport_for(fake))
+    with Node(transport=transport) as node:
+        assert node.getblockcount()['result'] == TIP_HEIGHT
+        assert list(node.stream('getblockcount')) == [TIP_HEIGHT]  # Default stream() over request()
+    assert transport.requests == 2
+    assert isinstance(Node(transport='socket').transport, SocketTransport)
+    with pytest.raises(ValueError):
+        Node(scheme='https', transport='socket')
+
+
+def test_stale_connection_is_replaced(idle_closing):
+    transport = transport_for(idle_closing)
+    assert loads(transport.request(body('getblockcount'))[1])['result'] == TIP_HEIGHT
+    time.sleep(0.3)  # Node closes the idle connection
+    assert loads(transport.request(body('getblockcount'))[1])['result'] == TIP_HEIGHT
+    transport.close()
+
+
+def test_stream_replaces_stale_connection(idle_closing):
+    transport = transport_for(idle_closing)
+    transport.request(body('getblockcount'))
+    time.sleep(0.3)
+
+    status, chunks, close = transport.stream(body('listtransactions', ['*', 100]), chunk_size=1024)
+    content = b''.join(chunks)
+    close()
+    assert status == 200
+    assert len(loads(content)['result']) == 100
+    assert len(transport._idle) == 1  # Read to the end, connection kept for reuse
+    transport.close()
+
+
+def test_stream_connection_failure_leaks_nothing():
+    with FakeNode() as fake:
+        host, port = fake.host, fake.port
+    transport = SocketTransport(host, port, 'user', 'password', connect_timeout=1)
+    with pytest.raises(TransportError):
+        transport.stream(body('getblockcount'))
+    assert transport._idle == []
@@ -0,0 +1,120 @@
+"""
+    ZmqSubscriber against a local ZMQ publisher stand-in and FakeNode (skipped without pyzmq)
+"""
+import struct
+import time
+
+import pytest
+
+zmq = pytest.importorskip("zmq")
+
+from boli_orbital_api.zmqsub import ZmqSubscriber  # noqa: E402
+from benchmarks.fake_node import TIP_HEIGHT, fake_hash  # noqa: E402
+from tests.conftest import node_for  # noqa: E402
+
+
+class Publisher:
+    """bolivarcoind zmqpub* stand-in: [topic, body, sequence (uint32 LE)] per message"""
+
+    def __init__(self):
+        self.socket = zmq.Context.instance().socket(zmq.PUB)
+        port = self.socket.bind_to_random_port('tcp://127.0.0.1')
+        self.endpoint = f'tcp://127.0.0.1:{port}'
+
+    def publish(self, topic: str, body: bytes, sequence: int):
+        self.socket.send_multipart([topic.encode(), body, struct.pack('<I', sequence)])
+
+    def close(self):
+        self.socket.close(linger=0)
+
+
+def block(height: int) -> bytes:
+    return bytes.fromhex(fake_hash('block', height))
+
+
+def events(subscriber: ZmqSubscriber, count: int, timeout: float = 5.0) -> list:
+    received = []
+    deadline = time.monotonic() + timeout
+    while len(received) < count and time.monotonic() < deadline:
+        event = subscriber.get(0.1)
+        if event is not None:
+            received.append(event)
+    return received
+
+
+@pytest.fixture
+def fake_options() -> dict:
+    return {"results": {'getblockcount': TIP_HEIGHT - 10, 'getrawmempool': []}}
+
+
+@pytest.fixture
+def node(fake):
+    with node_for(fake) as node:
+        yield node
+
+
+@pytest.fixture
+def publisher():
+    publisher = Publisher()
+    yield publisher
+    publisher.close()
+
+
+def subscribed(publisher: Publisher, subscriber: ZmqSubscriber):
+    """Wait until SUB socket receives (ZMQ drops messages published before subscription propagates)"""
+    deadline = time.monotonic() + 5.0
+    while time.monotonic() < deadline:
+        publisher.publish('hashtxlock', b'\x00' * 32, 0)
+        if subscriber.get(0.05) is not None:
+            subscriber._sequences.clear()
+            return
+    raise TimeoutError('subscription did not propagate')
+
+
+def test_in_order_messages(node, publisher):
+    with ZmqSubscriber(publisher.endpoint, topics=('hashblock', 'hashtxlock'), node=node) as subscriber:
+        subscribed(publisher, subscriber)
+        for sequence, height in enumerate(range(TIP_HEIGHT - 9, TIP_HEIGHT - 6)):
+            publisher.publish('hashblock', block(height), sequence)
+        received = events(subscriber, 3)
+
+    assert [event.hash for event in received] == [fake_hash('block', h) for h in range(TIP_HEIGHT - 9, TIP_HEIGHT - 6)]
+    assert not any(event.backfilled for event in received)
+    assert subscriber.stats()["gaps"] == 0
+
+
+def test_block_gap_is_backfilled_in_order(node, publisher):
+    with ZmqSubscriber(publisher.endpoint, topics=('hashblock', 'hashtxlock'), node=node) as subscriber:
+        subscribed(publisher, subscriber)
+        publisher.publish('hashblock', block(TIP_HEIGHT - 9), 0)
+        publisher.publish('hashblock', block(TIP_HEIGHT - 5), 4)  # 3 blocks lost
+        received = events(subscriber, 5)
+
+    assert [event.hash for event in received] == [fake_hash('block', h) for h in range(TIP_HEIGHT - 9, TIP_HEIGHT - 4)]
+    assert [event.backfilled for event in received] == [False, True, True, True, False]
+    stats = subscriber.stats()
+    assert (stats["gaps"], stats["missed"], stats["backfilled"]) == (1, 3, 3)
+
+
+def test_txlock_gap_is_counted(node, publisher):
+    with ZmqSubscriber(publisher.endpoint, topics=('hashtxlock',), node=node) as subscriber:
+        subscribed(publisher, subscriber)
+        publisher.publish('hashtxlock', b'\x01' * 32, 10)
+        publisher.publish('hashtxlock', b'\x02' * 32, 13)
+        received = events(subscriber, 2)
+
+    assert [event.sequence for event in received] == [10, 13]
+    assert subscriber.stats()["unrecovered"] == 2
+
+
+def test_bounded_queue_backpressure(publisher):
+    with ZmqSubscriber(publisher.endpoint, topics=('hashtxlock',), max_queue=2) as subscriber:
+        subscribed(publisher, subscriber)
+        for sequence in range(1, 6):
+            publisher.publish('hashtxlock', bytes([sequence]) * 32, sequence)
+        time.sleep(0.5)
+        assert subscriber.stats()["queued"] == 2
+        received = events(subscriber, 5)
+
+    assert [event.sequence for event in received] == [1, 2, 3, 4, 5]
+    assert subscriber.stats()["queue_full_waits"] > 0
@@ -0,0 +1,200 @@
+"""
+    ZmqSubscriber.handle(): sequence gaps and RPC backfill with a stub node, no socket (runs without pyzmq)
+"""
+import hashlib
+
+from boli_orbital_api.zmqsub import ZmqSubscriber
+
+TIP = 1000
+
+
+def block_hash(height: int, branch: bytes = b'block') -> str:
+    return hashlib.sha256(b'%s %d' % (branch, height)).hexdigest()
+
+
+def raw_block(height: int) -> str:
+    """Serialized block stand-in: version, previous block hash (internal byte order), height"""
+    return '01000000' + bytes.fromhex(block_hash(height - 1))[::-1].hex() + '%08x' % height
+
+
+class StubNode:
+    """Answers the few RPCs ZmqSubscriber backfills with, records them"""
+
+    def __init__(self, mempool=()):
+        self.best = {height: block_hash(height) for height in range(TIP + 100)}
+        self.heights = {blockhash: height for height, blockhash in self.best.items()}
+        self.mempool = list(mempool)
+        self.calls = []
+
+    def reorg(self, height: int) -> list[str]:
+        """Best chain switches to a "fork" branch from height, returns hashes of the new branch"""
+        for fork_height in range(height, TIP + 100):
+            self.best[fork_height] = block_hash(fork_height, b'fork')
+            self.heights[self.best[fork_height]] = fork_height
+        return [self.best[fork_height] for fork_height in range(height, TIP + 100)]
+
+    def getblockcount(self):
+        return {"result": TIP, "errors": False}
+
+    def getblockhash(self, height):
+        self.calls.append(('getblockhash', height))
+        return {"result": self.best[height], "errors": False}
+
+    def getblock(self, blockhash, verbose=True):
+        self.calls.append(('getblock', blockhash, verbose))
+        height = self.heights.get(blockhash)
+        if height is None:
+            return {"result": None, "errors": {"code": -5, "message": "Block not found"}}
+        return {"result": {"hash": blockhash, "height": height} if verbose else raw_block(height), "errors": False}
+
+    def raw_call(self, method, params=None):
+        self.calls.append((method, *(params or [])))
+        if method == 'getrawmempool':
+            return {"result": self.mempool, "errors": None}
+        if method == 'getblockheader':
+            height = self.heights.get(params[0])
+            if height is None:
+                return {"result": None, "errors": {"code": -5, "message": "Block not found"}}
+            return {"result": {"hash": params[0], "height": height}, "errors": None}
+        return {"result": 'ab' * 60 + params[0][:8], "errors": None}  # getrawtransaction
+
+
+def subscriber_for(node=None, topics=('hashblock', 'rawblock', 'hashtx', 'rawtx', 'hashtxlock'), **kwargs):
+    subscriber = ZmqSubscriber('tcp://127.0.0.1:28332', topics=topics, node=node, **kwargs)
+    if node is not None:  # What start() learns before connecting
+        subscriber._heights = {'hashblock': TIP, 'rawblock': TIP}
+    return subscriber
+
+
+def drain(subscriber: ZmqSubscriber) -> list:
+    events = []
+    while (event := subscriber.get(0)) is not None:
+        events.append(event)
+    return events
+
+
+def test_in_order_messages_are_queued_as_they_come():
+    node = StubNode()
+    subscriber = subscriber_for(node)
+    for sequence, height in enumerate(range(TIP + 1, TIP + 4)):
+        subscriber.handle('hashblock', bytes.fromhex(block_hash(height)), sequence)
+    subscriber.handle('hashtxlock', b'\x01' * 32, 7)
+
+    events = drain(subscriber)
+    assert [event.hash for event in events[:3]] == [block_hash(height) for height in range(TIP + 1, TIP + 4)]
+    assert [event.sequence for event in events] == [0, 1, 2, 7]
+    assert not any(event.backfilled for event in events)
+    assert node.calls == []
+    assert subscriber.stats()["sequences"] == {'hashblock': 2, 'hashtxlock': 7}
+
+
+def test_hashblock_gap_backfilled_in_order():
+    node = StubNode()
+    subscriber = subscriber_for(node)
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 1)), 10)
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 5)), 14)  # 3 lost
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 6)), 15)
+
+    events = drain(subscriber)
+    assert [event.hash for event in events] == [block_hash(height) for height in range(TIP + 1, TIP + 7)]
+    assert [event.backfilled for event in events] == [False, True, True, True, False, False]
+    assert [event.sequence for event in events] == [10, None, None, None, 14, 15]
+    stats = subscriber.stats()
+    assert (stats["gaps"], stats["missed"], stats["backfilled"], stats["unrecovered"]) == (1, 3, 3, 0)
+
+
+def test_rawblock_gap_finds_height_from_previous_hash():
+    node = StubNode()
+    subscriber = subscriber_for(node, topics=('rawblock',))
+    subscriber.handle('rawblock', bytes.fromhex(raw_block(TIP + 1)), 0)
+    subscriber.handle('rawblock', bytes.fromhex(raw_block(TIP + 4)), 3)
+
+    events = drain(subscriber)
+    assert [event.body.hex() for event in events] == [raw_block(height) for height in range(TIP + 1, TIP + 5)]
+    assert [event.backfilled for event in events] == [False, True, True, False]
+    assert ('getblockheader', block_hash(TIP + 3)) in node.calls  # Height of the block just received
+
+
+def test_heights_follow_headers_across_reorgs():
+    node = StubNode()
+    subscriber = subscriber_for(node, topics=('hashblock',))
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 1)), 0)
+    fork = node.reorg(TIP + 1)  # Tip replaced: TIP + 1 published again, on the new branch
+    subscriber.handle('hashblock', bytes.fromhex(fork[0]), 1)
+    subscriber.handle('hashblock', bytes.fromhex(fork[1]), 2)
+    subscriber.handle('hashblock', bytes.fromhex(fork[4]), 5)  # 2 lost: TIP + 3 and TIP + 4
+
+    events = drain(subscriber)
+    assert [event.hash for event in events] == [block_hash(TIP + 1), *fork[:5]]
+    assert [event.backfilled for event in events] == [False, False, False, True, True, False]
+
+
+def test_backfill_is_bounded():
+    node = StubNode()
+    subscriber = subscriber_for(node, max_backfill=5)
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 1)), 1)
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 50)), 50)
+
+    events = drain(subscriber)
+    assert [event.hash for event in events] == [block_hash(TIP + 1)] + [
+        block_hash(height) for height in range(TIP + 45, TIP + 51)
+    ]
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(TIP + 51)), 51)  # Heights back in step
+    assert drain(subscriber)[0].hash == block_hash(TIP + 51)
+
+
+def test_mempool_gap_backfills_unseen_transactions():
+    seen, lost = 'aa' * 32, ['bb' * 32, 'cc' * 32]
+    node = StubNode(mempool=[seen, *lost])
+    subscriber = subscriber_for(node)
+    subscriber.handle('hashtx', bytes.fromhex(seen), 1)
+    subscriber.handle('hashtx', bytes.fromhex('dd' * 32), 4)
+
+    events = drain(subscriber)
+    assert [event.hash for event in events] == [seen, *lost, 'dd' * 32]
+    assert [event.backfilled for event in events] == [False, True, True, False]
+
+    subscriber.handle('hashtx', b'\xee' * 32, 6)  # Txids seen on any tx topic are not fetched twice
+    assert [event.hash for event in drain(subscriber) if event.backfilled] == []
+
+
+def test_rawtx_gap_fetches_raw_transactions():
+    node = StubNode(mempool=['bb' * 32, 'cc' * 32])
+    subscriber = subscriber_for(node, topics=('rawtx',))
+    subscriber.handle('rawtx', b'\x01', 1)
+    subscriber.handle('rawtx', b'\x02', 3)
+
+    events = [event for event in drain(subscriber) if event.backfilled]
+    assert [event.body.hex() for event in events] == ['ab' * 60 + 'bbbbbbbb', 'ab' * 60 + 'cccccccc']
+    assert ('getrawtransaction', 'bb' * 32) in node.calls
+
+
+def test_unrecoverable_gaps_are_counted():
+    subscriber = subscriber_for(StubNode())
+    subscriber.handle('hashtxlock', b'\x01' * 32, 10)
+    subscriber.handle('hashtxlock', b'\x02' * 32, 13)
+    assert subscriber.stats()["unrecovered"] == 2
+
+    subscriber = subscriber_for(None)  # No node: nothing is fetched
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(1)), 1)
+    subscriber.handle('hashblock', bytes.fromhex(block_hash(5)), 5)
+    assert subscriber.stats()["unrecovered"] == 3
+    assert len(drain(subscriber)) == 2
+
+
+def test_full_queue_without_receiving_thread_drops_events():
+    subscriber = subscriber_for(StubNode(), max_queue=2)
+    for sequence in range(4):  # Would wait forever for room: nothing drains the queue
+        subscriber.handle('hashtxlock', bytes([sequence]) * 32, sequence)
+    assert len(drain(subscriber)) == 2
+    stats = subscriber.stats()
+    assert stats["dropped"] == 2 and stats["received"] == 4
+
+
+def test_sequence_wraps_around():
+    subscriber = subscriber_for(StubNode())
+    subscriber.handle('hashtxlock', b'\x01' * 32, 0xFFFFFFFF)
+    subscriber.handle('hashtxlock', b'\x02' * 32, 0)
+    subscriber.handle('hashtxlock', b'\x03' * 32, None)  # Old publishers send no sequence
+    assert subscriber.stats()["gaps"] == 0
+    assert len(drain(subscriber)) == 3